@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 from app.db.auth import crud, models
 from app.core.security import decode_token
+from app.core.principal import Principal, principal_cache
 
 # Dependency to get a database session
 async def get_db():
@@ -14,20 +15,25 @@ async def get_db():
 # Dependency to get the current user
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/fpl-login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Principal:
     try:
         payload = decode_token(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        user_id = int(user_id)
+    except (JWTError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired or invalid")
+    # most requests come from a token seen in the last few seconds; see PrincipalCache
+    async def load() -> Principal:
         user = await db.get(models.User, user_id)
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-        return user
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired or invalid")
+        return Principal.from_user(user)
+
+    return await principal_cache.fetch(user_id, token, load)
 
-async def get_current_active_fpl_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+async def get_current_active_fpl_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Ensures the user is logged in AND has linked their FPL account."""
     if not current_user.fpl_session_cookie or not current_user.fpl_manager_id:
         # 403 Forbidden is often better than 401 Unauthorized here
@@ -1,9 +1,30 @@
 from app.services.fpl_adapter import FPLAdapter
+from app.services.live import StandingsHub
+from app.services.analytics import LeagueAnalyticsCache
+from app.services.startup import StartupReport
 
 # these are created in app.main on startup
 _fpl_adapter: FPLAdapter | None = None
+_standings_hub: StandingsHub | None = None
+_league_analytics: LeagueAnalyticsCache | None = None
+_startup_report: StartupReport | None = None
 
 def get_fpl_adapter() -> FPLAdapter:
     if _fpl_adapter is None:
         raise RuntimeError("FPL adapter not initialized; ensure startup event created it")
-    return _fpl_adapter
\ No newline at end of file
+    return _fpl_adapter
+
+def get_standings_hub() -> StandingsHub:
+    if _standings_hub is None:
+        raise RuntimeError("Standings hub not initialized; ensure startup event created it")
+    return _standings_hub
+
+def get_league_analytics() -> LeagueAnalyticsCache:
+    if _league_analytics is None:
+        raise RuntimeError("League analytics cache not initialized; ensure startup event created it")
+    return _league_analytics
+
+def get_startup_report() -> StartupReport:
+    if _startup_report is None:
+        raise RuntimeError("Startup report not initialized; ensure startup event created it")
+    return _startup_report
@@ -0,0 +1,46 @@
+# app/api/routes/admin/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app.api.deps import get_db
+from app.core.rbac import require_role
+from app.db.admin.enums import Role, JobStatus
+from app.db.jobs import crud as jobs_crud
+from app.db.jobs.schemas import JobResponse
+
+router = APIRouter(prefix="/admin/jobs", tags=["admin:jobs"])
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    status: JobStatus | None = Query(default=None),
+    kind: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    _ = Depends(require_role(Role.admin, Role.super_admin))
+):
+    return await jobs_crud.list_jobs(db, status=status, kind=kind, limit=limit)
+
+@router.get("/summary")
+async def jobs_summary(db: AsyncSession = Depends(get_db), _ = Depends(require_role(Role.admin, Role.super_admin))):
+    return await jobs_crud.count_by_status(db)
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db), _ = Depends(require_role(Role.admin, Role.super_admin))):
+    job = await jobs_crud.get_job(db, job_id)
+    if not job: raise HTTPException(404, "Job not found")
+    return job
+
+@router.post("/{job_id}/retry", response_model=JobResponse, status_code=202)
+async def retry_job(job_id: int, db: AsyncSession = Depends(get_db), _ = Depends(require_role(Role.admin, Role.super_admin))):
+    job = await jobs_crud.get_job(db, job_id)
+    if not job: raise HTTPException(404, "Job not found")
+    if job.status != JobStatus.failed: raise HTTPException(409, "Only failed jobs can be retried")
+    if job.dedup_key and await jobs_crud.get_active_job(db, job.dedup_key):
+        raise HTTPException(409, "The same job is already queued")
+    try:
+        await jobs_crud.retry_job(db, job)
+    except IntegrityError:
+        # the same work was queued between the check above and our update
+        raise HTTPException(409, "The same job is already queued")
+    await db.commit(); await db.refresh(job)
+    return job
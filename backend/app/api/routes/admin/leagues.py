@@ -1,14 +1,16 @@
 # app/api/routes/admin/leagues.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db
 from app.core.rbac import require_role
 from app.db.admin.enums import Role, LeagueStatus
 from app.db.leagues.models import League
 from app.db.admin.schemas import AdminLeagueBase, AdminLeagueCreate, AdminLeagueUpdate, AdminPayoutRequest
-from app.db.auth.schemas import UserResponse
-from app.db.payments.service import PaymentsService
+from app.db.jobs.schemas import JobResponse
+from app.api.deps_fpl import get_fpl_adapter
+from app.services.fpl_adapter import FPLAdapter
+from app.services.jobs import enqueue_job
 
 router = APIRouter(prefix="/admin/leagues", tags=["admin:leagues"])
 
@@ -53,15 +55,50 @@ async def update_league(league_id: int, payload: AdminLeagueUpdate, db: AsyncSes
     await db.commit(); await db.refresh(updated_league)
     return updated_league
 
-@router.post("/{league_id}/recalculate")
-async def recalc(league_id: int, db: AsyncSession = Depends(get_db), _ = Depends(require_role(Role.admin, Role.super_admin))):
-    # trigger background job to recompute ranks/points (stub)
-    return {"ok": True}
+async def _resolve_event(adapter: FPLAdapter, event_id: int | None) -> int:
+    if event_id is not None:
+        return event_id
+    current = await adapter.current_event_id()
+    if current is None:
+        raise HTTPException(400, "No current gameweek; pass event_id")
+    return current
+
+@router.post("/recalculate", response_model=JobResponse, status_code=202)
+async def recalc_all(
+    event_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+    adapter: FPLAdapter = Depends(get_fpl_adapter),
+    _ = Depends(require_role(Role.admin, Role.super_admin))
+):
+    event_id = await _resolve_event(adapter, event_id)
+    job, _created = await enqueue_job(db, "recalculate", {"event_id": event_id}, dedup_key=f"recalculate:all:{event_id}")
+    return job
 
-@router.post("/{league_id}/payouts")
-async def trigger_payouts(league_id: int, _: AdminPayoutRequest, db: AsyncSession = Depends(get_db), user: UserResponse = Depends(get_current_user) ,_r = Depends(require_role(Role.admin, Role.super_admin))):
-    result = await PaymentsService.payout_winner(db, league_id, user.id)
-    return result
+@router.post("/{league_id}/recalculate", response_model=JobResponse, status_code=202)
+async def recalc(
+    league_id: int,
+    event_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+    adapter: FPLAdapter = Depends(get_fpl_adapter),
+    _ = Depends(require_role(Role.admin, Role.super_admin))
+):
+    if not await db.get(League, league_id): raise HTTPException(404, "League not found")
+    event_id = await _resolve_event(adapter, event_id)
+    job, _created = await enqueue_job(
+        db, "recalculate", {"event_id": event_id, "league_ids": [league_id]},
+        dedup_key=f"recalculate:{league_id}:{event_id}",
+    )
+    return job
+
+@router.post("/{league_id}/payouts", response_model=JobResponse, status_code=202)
+async def trigger_payouts(league_id: int, payload: AdminPayoutRequest, db: AsyncSession = Depends(get_db), _r = Depends(require_role(Role.admin, Role.super_admin))):
+    if not await db.get(League, league_id): raise HTTPException(404, "League not found")
+    winner = payload.winner_user_id
+    # the payout empties the pot in the same transaction, so a retry or a repeat job fails instead of paying twice
+    job, _created = await enqueue_job(
+        db, "payout", {"league_id": league_id, "winner_user_id": winner}, dedup_key=f"payout:{league_id}",
+    )
+    return job
 
 @router.post("/{league_id}/close")
 async def close_league(league_id: int, db: AsyncSession = Depends(get_db), _ = Depends(require_role(Role.admin, Role.super_admin))):
@@ -1,7 +1,14 @@
 # app/api/routes/admin/system.py
 from fastapi import APIRouter, Depends
+from app.core.principal import principal_cache
 from app.core.rbac import require_role
+from app.db.database import engine, pool_monitor, slow_query_log
 from app.db.admin.enums import Role
+from app.api.deps_fpl import get_fpl_adapter, get_standings_hub, get_league_analytics, get_startup_report
+from app.services.analytics import LeagueAnalyticsCache
+from app.services.fpl_adapter import FPLAdapter
+from app.services.live import StandingsHub
+from app.services.startup import StartupReport
 
 router = APIRouter(prefix="/admin", tags=["admin:system"])
 
@@ -12,3 +19,20 @@ async def health(_=Depends(require_role(Role.admin, Role.super_admin))):
 @router.get("/audit-logs")
 async def audit_logs(_=Depends(require_role(Role.admin, Role.super_admin))):
     return []
+
+@router.get("/metrics")
+async def metrics(
+    adapter: FPLAdapter = Depends(get_fpl_adapter),
+    hub: StandingsHub = Depends(get_standings_hub),
+    analytics: LeagueAnalyticsCache = Depends(get_league_analytics),
+    startup: StartupReport = Depends(get_startup_report),
+    _=Depends(require_role(Role.admin, Role.super_admin))
+):
+    return {
+        "fpl": adapter.metrics(),
+        "live": hub.stats(),
+        "league_analytics": analytics.stats(),
+        "startup": startup.stats(),
+        "auth": principal_cache.stats(),
+        "db": {"pool": pool_monitor.stats(engine.pool), "slow_queries": slow_query_log.stats()},
+    }
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.api.deps import get_db
+from app.core.principal import principal_cache
 from app.core.rbac import require_role
 from app.db.admin.enums import Role, UserStatus
 from app.db.auth.models import User
@@ -53,6 +54,7 @@ async def update_user(
     for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(u, k, v)
     await db.commit(); await db.refresh(u)
+    await principal_cache.invalidate(user_id)
     return u
 
 @router.patch("/{user_id}/role")
@@ -65,6 +67,7 @@ async def change_role(
     if not u: raise HTTPException(404, "User not found")
     u.role = payload.role
     await db.commit()
+    await principal_cache.invalidate(user_id)
     return {"ok": True}
 
 @router.patch("/{user_id}/balance")
@@ -91,4 +94,5 @@ async def suspend_user(
     if not u: raise HTTPException(404, "User not found")
     u.status = UserStatus.suspended if suspend else UserStatus.active
     await db.commit()
+    await principal_cache.invalidate(user_id)
     return {"ok": True}
@@ -4,10 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core import security
+from app.core.principal import principal_cache
 from app.api.deps import get_db
 from app.db.auth import crud
 from app.api.deps_fpl import get_fpl_adapter
 from app.services.fpl_adapter import FPLAdapter
+from app.services.login import LoginPoolExhausted
 
 router = APIRouter()
 
@@ -48,6 +50,13 @@ async def login_with_fpl(
     try:
         # This function returns { "manager_id": 123, "cookie": "..." }
         fpl_data = await adapter.login_and_get_details(credentials.email, credentials.password)
+    except LoginPoolExhausted:
+        # every pooled login session is busy: the credentials were never checked
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, try again shortly.",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         # If FPL rejects the password, we reject the login
         raise HTTPException(
@@ -91,6 +100,8 @@ async def login_with_fpl(
         
         await db.commit()
         await db.refresh(db_user)
+        # tokens issued earlier are still cached with the old cookie
+        await principal_cache.invalidate(db_user.id)
 
     # 3. Issue YOUR JWT (Session Management)
     # The frontend will use this token for future requests, not the FPL password
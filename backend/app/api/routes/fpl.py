@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Body, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
 from app.api.deps_fpl import get_fpl_adapter
-from app.api.deps import get_current_active_fpl_user
+from app.api.deps import get_db, get_current_active_fpl_user
 from app.services.fpl_adapter import FPLAdapter
-from app.db.auth import models
+from app.services.prefetch import get_picks
+from app.services.records import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.principal import Principal
 import logging
 
 router = APIRouter()
@@ -11,18 +16,152 @@ logger = logging.getLogger(__name__)
 # --- PUBLIC / CACHED ENDPOINTS ---
 
 @router.get("/bootstrap", summary="Get all static data (players, teams, elements)")
-async def get_bootstrap_data(adapter: FPLAdapter = Depends(get_fpl_adapter)):
+async def get_bootstrap_data(request: Request, adapter: FPLAdapter = Depends(get_fpl_adapter)):
     """
     Fetches global, cached FPL data. No authentication required.
+    Served from bytes encoded once per snapshot; clients revalidating with
+    If-None-Match get a 304 without any serialization work.
+    If FPL is unreachable we keep serving the last good snapshot, flagged stale.
     """
     try:
-        data = await adapter.bootstrap_static()
-        return data
+        payload = await adapter.bootstrap_encoded()
     except Exception as e:
         logger.error(f"Failed to fetch bootstrap data: {e}")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, 
                             detail="FPL service currently unavailable.")
 
+    headers = {"ETag": payload.etag, "Vary": "Accept-Encoding", "Cache-Control": "public, no-cache"}
+    if adapter.is_stale("bootstrap:static"):
+        headers["X-FPL-Stale"] = "true"
+        headers["Warning"] = '110 - "Response is Stale"'
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body, encoding = payload.negotiate(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/players", summary="Filter and sort players from the current bootstrap snapshot.")
+async def list_players(
+    position: str | None = Query(default=None, description="GKP/DEF/MID/FWD or element_type id"),
+    team: int | None = Query(default=None),
+    min_price: float | None = Query(default=None, description="£m, e.g. 4.5"),
+    max_price: float | None = Query(default=None, description="£m, e.g. 8.0"),
+    min_minutes: int | None = Query(default=None, ge=0),
+    sort: str = Query(default="total_points"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    adapter: FPLAdapter = Depends(get_fpl_adapter)
+):
+    store = await _player_store(adapter)
+    try:
+        return store.query(
+            position=position, team=team, min_price=min_price, max_price=max_price,
+            min_minutes=min_minutes, sort=sort, desc=order == "desc", limit=limit, offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/players/top", summary="Top-N players by a metric (form, total_points, ...).")
+async def top_players(
+    metric: str = Query(default="total_points"),
+    n: int = Query(default=10, ge=1, le=100),
+    position: str | None = Query(default=None),
+    adapter: FPLAdapter = Depends(get_fpl_adapter)
+):
+    store = await _player_store(adapter)
+    try:
+        return store.top(metric, n, position)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/players/{element_id}", summary="Single player by element id.")
+async def get_player(element_id: int, adapter: FPLAdapter = Depends(get_fpl_adapter)):
+    player = (await _player_store(adapter)).get(element_id)
+    if player is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found.")
+    return player
+
+async def _player_store(adapter: FPLAdapter):
+    try:
+        return await adapter.player_store()
+    except Exception as e:
+        logger.error(f"Failed to build player store: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="FPL service currently unavailable.")
+
+@router.get("/projections", summary="Expected points over the next gameweeks, best first.")
+async def list_projections(
+    gameweeks: int | None = Query(default=None, ge=1, description="How many upcoming gameweeks to sum (default: all projected)"),
+    position: str | None = Query(default=None, description="GKP/DEF/MID/FWD or element_type id"),
+    team: int | None = Query(default=None),
+    max_price: float | None = Query(default=None, description="£m, e.g. 8.0"),
+    sort: str = Query(default="total", description="total (over `gameweeks`) or next (next gameweek only)"),
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    adapter: FPLAdapter = Depends(get_fpl_adapter)
+):
+    table = await _projections(adapter)
+    try:
+        players = table.query(
+            gameweeks=gameweeks, position=position, team=team, max_price=max_price,
+            sort=sort, limit=limit, offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"events": table.events[:gameweeks], "players": players}
+
+@router.get("/projections/captains", summary="Captain picks: highest expected points next gameweek.")
+async def captain_picks(n: int = Query(default=5, ge=1, le=50), adapter: FPLAdapter = Depends(get_fpl_adapter)):
+    table = await _projections(adapter)
+    return {"events": table.events[:1], "players": table.captains(n)}
+
+@router.get("/projections/{element_id}", summary="One player's expected points per upcoming gameweek.")
+async def get_projection(element_id: int, adapter: FPLAdapter = Depends(get_fpl_adapter)):
+    player = (await _projections(adapter)).get(element_id)
+    if player is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player not found.")
+    return player
+
+async def _projections(adapter: FPLAdapter):
+    try:
+        return await adapter.projections()
+    except Exception as e:
+        logger.error(f"Failed to build projections: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="FPL service currently unavailable.")
+
+@router.get("/entries", summary="Public profile summaries for many FPL managers in one round trip.")
+async def get_public_entries(
+    ids: str = Query(..., description="Comma-separated FPL manager ids"),
+    stream: bool = Query(default=False, description="Stream NDJSON lines as entries arrive"),
+    adapter: FPLAdapter = Depends(get_fpl_adapter)
+):
+    """
+    Cache hits are returned immediately; misses are fetched concurrently with
+    a bounded number of upstream calls. Per-entry failures are reported
+    alongside the successes rather than failing the whole request.
+    """
+    try:
+        entry_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be comma-separated integers.")
+    if not entry_ids or len(entry_ids) > settings.FPL_BULK_MAX_IDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Provide between 1 and {settings.FPL_BULK_MAX_IDS} ids.")
+
+    if not stream:
+        return Response(content=to_json(await adapter.get_entries(entry_ids)), media_type="application/json")
+
+    async def lines():
+        async for entry_id, data, error in adapter.iter_entries(entry_ids):
+            item = {"id": entry_id, "entry": data} if error is None else {"id": entry_id, "error": error}
+            yield to_json(item) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/entry/{entry_id}", summary="Get public profile summary for any FPL manager.")
 async def get_public_entry_details(
     entry_id: int, 
@@ -33,17 +172,26 @@ async def get_public_entry_details(
     """
     try:
         data = await adapter.get_entry(entry_id) 
-        return data
     except Exception as e:
         logger.error(f"Entry data fetch failed for ID {entry_id}: {e}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="FPL Manager not found.")
+    return Response(content=to_json(data), media_type="application/json")
+
+@router.get("/entry/{entry_id}/history", summary="A manager's season so far, past seasons and chips played.")
+async def get_public_entry_history(entry_id: int, adapter: FPLAdapter = Depends(get_fpl_adapter)):
+    try:
+        data = await adapter.get_entry_history(entry_id)
+    except Exception as e:
+        logger.error(f"Entry history fetch failed for ID {entry_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="FPL Manager not found.")
+    return Response(content=to_json(data), media_type="application/json")
 
 # --- PROTECTED USER ENDPOINTS ---
 
 @router.get("/my-team", summary="Get the current user's team, transfers, and bank.")
 async def get_current_users_team(
     adapter: FPLAdapter = Depends(get_fpl_adapter),
-    user: models.User = Depends(get_current_active_fpl_user) 
+    user: Principal = Depends(get_current_active_fpl_user) 
 ):
     """
     Fetches protected /my-team/ endpoint data using the stored FPL cookie.
@@ -65,15 +213,17 @@ async def get_current_users_team(
 @router.get("/my-picks/{event_id}", summary="Get the user's weekly picks (squad + captain).")
 async def get_current_users_picks(
     event_id: int,
+    db: AsyncSession = Depends(get_db),
     adapter: FPLAdapter = Depends(get_fpl_adapter),
-    user: models.User = Depends(get_current_active_fpl_user)
+    user: Principal = Depends(get_current_active_fpl_user)
 ):
     """
     Fetches the team selection for a specific Gameweek (event_id).
+    Past gameweeks are served from stored picks without calling FPL.
     """
     try:
-        data = await adapter.get_entry_picks(user.fpl_manager_id, event_id, user.fpl_session_cookie)
-        return data
+        data = await get_picks(db, adapter, user.fpl_manager_id, event_id, user.fpl_session_cookie)
     except Exception as e:
         logger.error(f"Picks fetch failed for user {user.id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching picks data.")
+    return Response(content=to_json(data), media_type="application/json")
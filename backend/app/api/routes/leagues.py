@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
 from typing import List
 from app.db.leagues import schemas, crud
 from app.api.deps import get_db
+from app.api.deps_fpl import get_fpl_adapter, get_standings_hub, get_league_analytics
+from app.core.config import settings
+from app.services.analytics import LeagueAnalyticsCache, league_analytics
+from app.services.fpl_adapter import FPLAdapter
+from app.services.live import StandingsHub, publish_league
 from app.api.deps import get_current_user  # assumes JWT auth
 
 router = APIRouter()
@@ -36,3 +42,96 @@ async def get_league(
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
     return league
+
+def _standing_row(s, username=None) -> dict:
+    return {"user_id": s.user_id, "username": username, "event_points": s.event_points,
+            "total_points": s.total_points, "rank": s.rank}
+
+@router.get("/{league_id}/standings", response_model=schemas.StandingsResponse)
+async def get_standings(
+    league_id: int,
+    gameweek: int | None = Query(default=None, ge=1),
+    after: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    key = None
+    if after is not None:
+        try:
+            gameweek, *key = crud.decode_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif gameweek is None:
+        gameweek = await crud.latest_standings_gameweek(db, league_id)
+    if gameweek is None:
+        return {"league_id": league_id, "gameweek": None}
+
+    rows = await crud.get_standings(db, league_id, gameweek, after=tuple(key) if key else None, limit=limit + 1)
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = crud.encode_cursor(gameweek, last.total_points, last.user_id)
+    me = await crud.get_standing(db, league_id, current_user.id, gameweek)
+    return {
+        "league_id": league_id,
+        "gameweek": gameweek,
+        "standings": [_standing_row(s, username) for s, username in page],
+        "next_cursor": next_cursor,
+        "me": _standing_row(me, current_user.username) if me else None,
+    }
+
+@router.get("/{league_id}/standings/stream")
+async def stream_standings(
+    league_id: int,
+    db: AsyncSession = Depends(get_db),
+    hub: StandingsHub = Depends(get_standings_hub),
+    current_user=Depends(get_current_user)
+):
+    """
+    Server-Sent Events: a `snapshot` event with the full table, then a `diff`
+    event (changed rows and removed user ids) whenever the standings move.
+    Diffs are computed and encoded once per league and shared by every
+    subscriber; `id` is the version, so a gap means reload the snapshot.
+    """
+    if not await crud.get_league(db, league_id):
+        raise HTTPException(status_code=404, detail="League not found")
+    if not hub.channel(league_id).version:
+        await publish_league(hub, db, league_id)
+
+    async def events():
+        # subscribed once streaming starts, so a client gone before then never holds a subscription
+        sub = hub.subscribe(league_id)
+        try:
+            async for message in sub.messages(heartbeat=settings.LIVE_HEARTBEAT_SECONDS):
+                yield message
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/{league_id}/analytics")
+async def get_league_analytics_view(
+    league_id: int,
+    gameweek: int | None = Query(default=None, ge=1),
+    db: AsyncSession = Depends(get_db),
+    adapter: FPLAdapter = Depends(get_fpl_adapter),
+    cache: LeagueAnalyticsCache = Depends(get_league_analytics),
+    current_user=Depends(get_current_user)
+):
+    """
+    Ownership and effective ownership (captaincy included) of every player
+    picked in the league, and each member's differential exposure: `gain`
+    (how much more than the league they hold of their own players) and
+    `risk` (the league's ownership they do not cover). Defaults to the
+    current gameweek.
+    """
+    if not await crud.get_league(db, league_id):
+        raise HTTPException(status_code=404, detail="League not found")
+    if gameweek is None:
+        gameweek = await adapter.current_event_id()
+        if gameweek is None:
+            raise HTTPException(status_code=400, detail="No current gameweek; pass gameweek")
+    return await league_analytics(db, adapter, cache, league_id, gameweek)
@@ -3,12 +3,13 @@ from typing import Annotated
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
 from app.core.security import get_body
 from app.core.config import settings
-import stripe
+from app.db.payments.providers.stripe_provider import stripe_sdk
 
 router = APIRouter(prefix="/stripe", tags=["stripe, payments"])
 
 @router.get("/create-payment-intent")
 async def create_payment_intent(amount: int, user_id: str):
+    stripe = stripe_sdk()
     try:
         # Amount must be in the smallest currency unit (e.g., cents for USD)
         intent = stripe.PaymentIntent.create(
@@ -27,6 +28,7 @@ async def create_payment_intent(amount: int, user_id: str):
 # Withdrawals
 @router.post("/onboard-user")
 async def onboard_user(user_id: str):
+    stripe = stripe_sdk()
     # 1. Create a Connected Account for the user
     account = stripe.Account.create(
         type='express',  # Use 'custom' or 'express'
@@ -53,6 +55,7 @@ async def onboard_user(user_id: str):
 @router.post("/withdraw")
 async def initiate_withdrawal(stripe_account_id: str, amount: int):
     # Ensure the user has enough balance in their in-app wallet before calling this.
+    stripe = stripe_sdk()
     try:
         # Payouts transfer from your platform balance to the connected account's bank.
         payout = stripe.Payout.create(
@@ -76,6 +79,7 @@ async def stripe_webhook(
     body: bytes = Depends(get_body),
 ):
     WEBHOOK_SECRET = settings.STRIPE_WEBHOOK_SECRET
+    stripe = stripe_sdk()
     
     try:
         event = stripe.Webhook.construct_event(
@@ -4,11 +4,27 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     DATABASE_URL: str
     SYNC_DATABASE_URL: str
+    # async engine pool (ignored for SQLite); recycle (s) drops connections before the server or a proxy does
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    # asyncpg prepared statements cached per connection; 0 when going through pgbouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # log statements slower than this (ms), a sampled share of them, values redacted; 0 disables
+    DB_SLOW_QUERY_MS: float = 0
+    DB_SLOW_QUERY_SAMPLE_RATE: float = 1.0
     JWT_SECRET_KEY: str
     ALGORITHM: str
     FPL_API_BASE_URL: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    # authenticated principals cached per (user, token) for this many seconds; 0 disables. Admin
+    # changes apply at once on every worker when FPL_CACHE_BACKEND is redis or sqlite (a per-user
+    # version is shared there), otherwise at once on the worker that made them and within this TTL
+    AUTH_PRINCIPAL_TTL: float = 5.0
+    AUTH_PRINCIPAL_CACHE_ENTRIES: int = 10000
     MPESA_CONSUMER_KEY: str
     MPESA_CONSUMER_SECRET: str
     INITIATOR_NAME: str
@@ -45,6 +61,64 @@ class Settings(BaseSettings):
     FPL_PWD: str
     FPL_LOGIN_URL: str
     FPL_TEAM_URL: str
+    # /auth/fpl-login: pooled login sessions (max concurrent logins) and how long (s) a login waits for one
+    FPL_LOGIN_POOL_SIZE: int = 8
+    FPL_LOGIN_POOL_TIMEOUT: float = 10.0
+    # FPL cache: "memory" (per-worker only), "redis" or "sqlite" (shared between workers)
+    FPL_CACHE_BACKEND: str = "memory"
+    FPL_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    FPL_CACHE_SQLITE_PATH: str = "fpl_cache.sqlite3"
+    FPL_CACHE_MAX_ENTRIES: int = 5000
+    FPL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    FPL_CACHE_DEFAULT_TTL: int = 60
+    FPL_CACHE_TTLS: dict[str, int] = {"bootstrap": 300, "entry": 3600, "history": 3600, "picks": 600, "live": 60}
+    # calendar-driven TTLs (seconds) per phase, applied before FPL_CACHE_TTLS; see app.services.ttl
+    FPL_TTL_PHASES: dict[str, dict[str, int]] = {
+        "quiet": {"bootstrap": 1800, "entry": 21600, "history": 21600, "picks": 3600, "live": 600, "fixtures": 3600},
+        "deadline": {"bootstrap": 60, "entry": 600, "history": 600, "picks": 300, "live": 60, "fixtures": 300},
+        "live": {"bootstrap": 120, "entry": 300, "history": 300, "picks": 120, "live": 30, "fixtures": 60},
+    }
+    FPL_TTL_DEADLINE_WINDOW: float = 7200
+    FPL_TTL_FINAL: int = 7 * 86400
+    FPL_PRICE_CHANGE_HOUR_UTC: int | None = 1
+    # on-disk store for finished-gameweek data (never expires); empty disables it
+    FPL_ARCHIVE_PATH: str = "fpl_archive.sqlite3"
+    # background refresher: tick interval (s) and fraction of TTL after which hot keys are refetched
+    FPL_REFRESH_INTERVAL: float = 5.0
+    FPL_REFRESH_AHEAD: float = 0.8
+    # max concurrent upstream fetches for one bulk request (/fpl/entries)
+    FPL_BULK_CONCURRENCY: int = 8
+    FPL_BULK_MAX_IDS: int = 500
+    # expected-points projections: how many upcoming gameweeks to project
+    FPL_PROJECTION_HORIZON: int = 6
+    # post-deadline picks prefetch: how often the recurring job checks for a new deadline (and
+    # retries managers still missing), and its upstream pool size
+    FPL_PREFETCH_INTERVAL: float = 60.0
+    FPL_PREFETCH_CONCURRENCY: int = 8
+    # outbound FPL protection: token bucket (per worker) and circuit breaker
+    FPL_RATE_LIMIT_PER_SEC: float = 10.0
+    FPL_RATE_LIMIT_BURST: int = 20
+    FPL_RATE_LIMIT_MAX_WAIT: float = 5.0
+    FPL_BREAKER_FAILURES: int = 5
+    FPL_BREAKER_RESET_SECONDS: float = 30.0
+    # live standings push (SSE): rescore interval for watched leagues, keep-alive, per-connection buffer cap
+    LIVE_PUSH_INTERVAL: float = 15.0
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+    LIVE_MAX_BUFFER_BYTES: int = 256 * 1024
+    # per-(league, gameweek) ownership analytics kept in memory (LRU)
+    LEAGUE_ANALYTICS_CACHE_ENTRIES: int = 256
+    # background jobs (recalculations, payouts): workers per process, queue poll, retry backoff (s)
+    JOB_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE: float = 5.0
+    JOB_BACKOFF_MAX: float = 600.0
+    # a job running longer than this is assumed orphaned by a dead worker and requeued
+    JOB_STALE_AFTER: float = 900.0
+    # startup warm-up (FPL snapshot, projections, first DB connection): "eager" waits for it before
+    # serving, "background" serves at once and warms alongside, "lazy" skips it; see app.services.startup
+    STARTUP_MODE: str = "background"
+    STARTUP_WARMUP_TIMEOUT: float = 20.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
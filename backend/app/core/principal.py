@@ -0,0 +1,126 @@
+# app/core/principal.py
+from __future__ import annotations
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+from app.core.config import settings
+from app.db.admin.enums import Role, UserStatus
+
+if TYPE_CHECKING:
+    from app.services.cache import RedisCache, SQLiteCache
+
+
+@dataclass(slots=True, frozen=True)
+class Principal:
+    """
+    The authenticated user as request handlers see it: the User row's scalar
+    columns, copied out of the session that loaded them so one instance can
+    safely serve many requests.
+    """
+    id: int
+    username: str
+    email: str
+    role: Role
+    status: UserStatus
+    is_locked: bool
+    fpl_manager_id: Optional[int]
+    fpl_session_cookie: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(**{f: getattr(user, f) for f in cls.__match_args__})
+
+
+class PrincipalCache:
+    """
+    (user id, token) -> Principal for `ttl` seconds, LRU-bounded, so
+    get_current_user (and require_role on top of it) skips the users lookup
+    for repeat requests. Admin changes to a user's role, status or lock call
+    invalidate(), which drops this worker's entries and, when a shared cache
+    tier (`versions`, Redis or SQLite) is wired in, publishes a new version of
+    the user there. Every lookup reads that version and only serves an entry
+    cached under it, so the change applies on all workers on their next
+    request. Without a shared tier other workers catch up when their entry
+    expires, so `ttl` is the most a change can lag. A ttl of 0 disables the cache.
+    """
+
+    VERSION_TTL = 24 * 3600  # outlives any entry cached under an older version
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 10_000, versions: RedisCache | SQLiteCache | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.versions = versions
+        self._entries: "OrderedDict[tuple[int, str], tuple[float, Any, Principal]]" = OrderedDict()
+        self.hits = self.misses = self.invalidations = self.stale = 0
+
+    async def version(self, user_id: int) -> Any:
+        """The user's version in the shared tier; None when there is none (or no shared tier)."""
+        if self.versions is None:
+            return None
+        return await self.versions.get(f"principal:{user_id}")
+
+    async def get(self, user_id: int, token: str, version: Any = None) -> Optional[Principal]:
+        entry = self._entries.get((user_id, token))
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[(user_id, token)]
+            entry = None
+        if entry is not None and entry[1] != version:
+            # invalidated on another worker since this entry was cached
+            del self._entries[(user_id, token)]
+            self.stale += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((user_id, token))
+        self.hits += 1
+        return entry[2]
+
+    def put(self, user_id: int, token: str, principal: Principal, version: Any = None):
+        """Cache `principal` as loaded under `version`, read before the load."""
+        if self.ttl <= 0:
+            return
+        self._entries[(user_id, token)] = (time.monotonic() + self.ttl, version, principal)
+        self._entries.move_to_end((user_id, token))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def fetch(self, user_id: int, token: str, load: Callable[[], Awaitable[Principal]]) -> Principal:
+        """The cached principal for this token, else `load()`'s, which is then cached."""
+        if self.ttl <= 0:
+            return await load()
+        version = await self.version(user_id)
+        principal = await self.get(user_id, token, version)
+        if principal is None:
+            principal = await load()
+            self.put(user_id, token, principal, version)
+        return principal
+
+    async def invalidate(self, user_id: int):
+        """Drop every cached token of this user, here and (through `versions`) on every other worker."""
+        for key in [k for k in self._entries if k[0] == user_id]:
+            del self._entries[key]
+            self.invalidations += 1
+        if self.versions is not None:
+            await self.versions.set(f"principal:{user_id}", uuid.uuid4().hex, ttl_seconds=self.VERSION_TTL)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stale": self.stale,
+            "shared_versions": self.versions is not None,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+principal_cache = PrincipalCache(ttl=settings.AUTH_PRINCIPAL_TTL, max_entries=settings.AUTH_PRINCIPAL_CACHE_ENTRIES)
@@ -1,19 +1,22 @@
 from fastapi import Request
-from passlib.context import CryptContext
+from functools import cache
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from app.core.config import settings
-import base64, httpx, stripe, time
+import base64, httpx, time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-stripe.api_key = settings.STRIPE_SECRET_KEY
+@cache
+def pwd_context():
+    # passlib (and its bcrypt backend) load on the first hash, not at app import
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 def create_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
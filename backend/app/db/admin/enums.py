@@ -15,3 +15,9 @@ class LeagueStatus(str, enum.Enum):
     open = "open"
     ongoing = "ongoing"
     completed = "completed"
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
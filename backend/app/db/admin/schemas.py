@@ -53,6 +53,8 @@ class AdminLeagueUpdate(BaseModel):
 
 class AdminPayoutRequest(BaseModel):
     league_id: int
+    # defaults to the member ranked first in the latest standings
+    winner_user_id: int | None = None
 
 # Content
 class ContentIn(BaseModel):
@@ -1,9 +1,38 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.dialects import postgresql, sqlite
 from app.core.config import settings
+from app.db.instrumentation import PoolMonitor, SlowQueryLog
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+pool_monitor = PoolMonitor()
+slow_query_log = SlowQueryLog(settings.DB_SLOW_QUERY_MS, settings.DB_SLOW_QUERY_SAMPLE_RATE)
+
+
+def engine_options(url: str) -> dict:
+    """create_async_engine keyword arguments for `url`, from settings."""
+    backend = make_url(url)
+    options = {"future": True, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if backend.get_backend_name() == "sqlite":
+        # SQLite keeps its dialect's default pool (StaticPool for :memory:); sizing does not apply
+        return options
+    options.update(
+        poolclass=pool_monitor.pool_class(AsyncAdaptedQueuePool),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if backend.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+pool_monitor.attach(engine.sync_engine)
+slow_query_log.attach(engine.sync_engine)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -11,5 +40,9 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+def dialect_insert(db: AsyncSession):
+    """insert() of the session's backend, for on_conflict_do_nothing / on_conflict_do_update."""
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
 # Base class for models
 Base = declarative_base()
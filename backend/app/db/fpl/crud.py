@@ -0,0 +1,33 @@
+from typing import Dict, Iterable, Mapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.db.database import dialect_insert
+from app.db.fpl import models
+
+async def get_stored_picks(db: AsyncSession, entry_ids: Iterable[int], event_id: int) -> Dict[int, dict]:
+    ids = list(entry_ids)
+    if not ids:
+        return {}
+    rows = await db.execute(
+        select(models.FPLPicks.entry_id, models.FPLPicks.data)
+        .where(models.FPLPicks.event_id == event_id, models.FPLPicks.entry_id.in_(ids))
+    )
+    return dict(rows.all())
+
+async def stored_entry_ids(db: AsyncSession, event_id: int) -> set[int]:
+    rows = await db.execute(select(models.FPLPicks.entry_id).where(models.FPLPicks.event_id == event_id))
+    return set(rows.scalars().all())
+
+async def store_picks(db: AsyncSession, event_id: int, picks: Mapping[int, dict]) -> int:
+    """
+    Insert picks we don't have yet; existing rows are left alone, including
+    ones another writer inserts concurrently. Returns how many rows this call
+    inserted. Caller commits.
+    """
+    if not picks:
+        return 0
+    stmt = dialect_insert(db)(models.FPLPicks).values(
+        [{"entry_id": e, "event_id": event_id, "data": d} for e, d in picks.items()]
+    ).on_conflict_do_nothing(index_elements=[models.FPLPicks.entry_id, models.FPLPicks.event_id])
+    result = await db.execute(stmt)
+    return result.rowcount
@@ -0,0 +1,15 @@
+from sqlalchemy import Integer, JSON, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.database import Base
+
+class FPLPicks(Base):
+    """
+    A manager's picks for one gameweek, kept permanently once its deadline
+    has passed (they can no longer change). Written by app.services.prefetch.
+    """
+    __tablename__ = "fpl_picks"
+
+    entry_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,137 @@
+# app/db/instrumentation.py
+from __future__ import annotations
+import logging
+import random
+import time
+from typing import Any, Type
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+logger = logging.getLogger("app.db.slow_queries")
+
+
+def redact(parameters: Any, executemany: bool = False) -> Any:
+    """Bound parameters with every value replaced by its type name, safe to log."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        return f"{len(parameters)} rows of {redact(parameters[0]) if parameters else '()'}"
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return tuple(type(v).__name__ for v in parameters)
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """
+    Logs statements that take at least `threshold_ms`, a `sample_rate`
+    share of them, with parameter values redacted to their types. Replaces
+    engine echo, which logged every statement (and its values) inline with
+    the request. Timing hangs off the cursor events, so every statement pays
+    two perf_counter calls; a threshold of 0 or less leaves the engine alone.
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float = 1.0):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.slow = self.logged = 0
+        self.max_ms = 0.0
+
+    def attach(self, engine: Engine):
+        if self.threshold_ms <= 0:
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._failed)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _failed(self, context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+        self.slow += 1
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if random.random() < self.sample_rate:
+            self.logged += 1
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms): {' '.join(statement.split())} "
+                f"params={redact(parameters, executemany)}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "sample_rate": self.sample_rate,
+            "slow": self.slow,
+            "logged": self.logged,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PoolMonitor:
+    """
+    Saturation numbers for one engine's connection pool: connections checked
+    out now and at peak, and for queue pools how long checkouts waited for a
+    free connection and how many gave up after pool_timeout. Waits are timed
+    in the pool class from `pool_class()`; the counts come from pool events.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checked_out = self.peak_checked_out = 0
+        self.waits = self.timeouts = 0
+        self.wait_total = self.wait_max = 0.0
+
+    def pool_class(self, base: Type[QueuePool]) -> Type[QueuePool]:
+        """A subclass of `base` whose connection gets report their wait to this monitor."""
+        monitor = self
+
+        class InstrumentedPool(base):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    return super()._do_get()
+                except exc.TimeoutError:
+                    monitor.timeouts += 1
+                    raise
+                finally:
+                    monitor._waited(time.perf_counter() - started)
+
+        return InstrumentedPool
+
+    def _waited(self, seconds: float):
+        self.waits += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def attach(self, pool: Pool | Type[Pool] | Engine):
+        event.listen(pool, "checkout", self._checkout)
+        event.listen(pool, "checkin", self._checkin)
+
+    def _checkout(self, dbapi_connection, record, proxy):
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _checkin(self, dbapi_connection, record):
+        self.checked_out = max(0, self.checked_out - 1)
+
+    def stats(self, pool: Pool | None = None) -> dict:
+        out = {
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else None,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+        if isinstance(pool, QueuePool):
+            out.update(size=pool.size(), overflow=pool.overflow(), idle=pool.checkedin())
+        return out
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+from sqlalchemy import func, update
+from app.db.admin.enums import JobStatus
+from app.db.jobs.models import ACTIVE_STATUSES, Job
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+async def get_active_job(db: AsyncSession, dedup_key: str) -> Job | None:
+    rows = await db.execute(select(Job).where(Job.dedup_key == dedup_key, Job.status.in_(ACTIVE_STATUSES)))
+    return rows.scalars().first()
+
+async def enqueue(
+    db: AsyncSession, kind: str, payload: dict, *, dedup_key: str | None = None, max_attempts: int = 5, delay: float = 0
+) -> tuple[Job, bool]:
+    """
+    Queue a job and return (job, created). When a queued or running job already
+    holds `dedup_key`, that job is returned instead and nothing is inserted.
+    Caller commits.
+    """
+    if dedup_key is not None:
+        existing = await get_active_job(db, dedup_key)
+        if existing is not None:
+            return existing, False
+    job = Job(
+        kind=kind, payload=payload, dedup_key=dedup_key, max_attempts=max_attempts,
+        status=JobStatus.queued, attempts=0, run_after=_now() + timedelta(seconds=delay),
+    )
+    try:
+        async with db.begin_nested():
+            db.add(job)
+    except IntegrityError:
+        # another request queued the same work between our check and insert
+        existing = await get_active_job(db, dedup_key)
+        if existing is None:
+            raise
+        return existing, False
+    return job, True
+
+async def latest_job(db: AsyncSession, dedup_key: str) -> Job | None:
+    """The most recently queued job for `dedup_key`, whatever its status."""
+    rows = await db.execute(select(Job).where(Job.dedup_key == dedup_key).order_by(Job.id.desc()).limit(1))
+    return rows.scalars().first()
+
+async def get_job(db: AsyncSession, job_id: int) -> Job | None:
+    return await db.get(Job, job_id)
+
+async def list_jobs(db: AsyncSession, status: JobStatus | None = None, kind: str | None = None, limit: int = 50) -> list[Job]:
+    q = select(Job).order_by(Job.id.desc()).limit(limit)
+    if status is not None:
+        q = q.where(Job.status == status)
+    if kind is not None:
+        q = q.where(Job.kind == kind)
+    return list((await db.execute(q)).scalars().all())
+
+async def count_by_status(db: AsyncSession) -> dict[str, int]:
+    rows = await db.execute(select(Job.status, func.count()).group_by(Job.status))
+    return {status.value: n for status, n in rows.all()}
+
+async def claim_next(db: AsyncSession, worker_id: str, kinds: Iterable[str]) -> Job | None:
+    """
+    Take the oldest due job of one of `kinds`. The status check in the UPDATE
+    makes the claim safe with several workers (and processes) polling: only
+    one of them sees a row count of 1. Commits.
+    """
+    now = _now()
+    candidates = (await db.execute(
+        select(Job.id)
+        .where(Job.status == JobStatus.queued, Job.run_after <= now, Job.kind.in_(list(kinds)))
+        .order_by(Job.run_after, Job.id)
+        .limit(5)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    for job_id in candidates:
+        claimed = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.queued)
+            .values(status=JobStatus.running, attempts=Job.attempts + 1, started_at=now, locked_by=worker_id)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount == 1:
+            await db.commit()
+            return await db.get(Job, job_id, populate_existing=True)
+    await db.commit()
+    return None
+
+async def mark_succeeded(db: AsyncSession, job_id: int, result: dict | None) -> None:
+    await db.execute(
+        update(Job).where(Job.id == job_id)
+        .values(status=JobStatus.succeeded, result=result, last_error=None, finished_at=_now(), locked_by=None)
+    )
+    await db.commit()
+
+async def mark_failed(db: AsyncSession, job_id: int, error: str, retry_at: datetime | None) -> JobStatus:
+    """Requeue for `retry_at` while attempts remain, else fail for good. Commits."""
+    job = await db.get(Job, job_id, populate_existing=True)
+    job.last_error = error
+    job.locked_by = None
+    if retry_at is not None and job.attempts < job.max_attempts:
+        job.status = JobStatus.queued
+        job.run_after = retry_at
+    else:
+        job.status = JobStatus.failed
+        job.finished_at = _now()
+    await db.commit()
+    return job.status
+
+async def requeue_stale(db: AsyncSession, older_than: float) -> int:
+    """Jobs left running by a worker that died (or was stopped mid-job) go back to the queue. Commits."""
+    now = _now()
+    stale = (Job.status == JobStatus.running, Job.started_at < now - timedelta(seconds=older_than))
+    await db.execute(
+        update(Job).where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.failed, finished_at=now, locked_by=None, last_error="worker lost")
+    )
+    rows = await db.execute(
+        update(Job).where(*stale)
+        .values(status=JobStatus.queued, run_after=now, locked_by=None, last_error="worker lost")
+    )
+    await db.commit()
+    return rows.rowcount
+
+async def retry_job(db: AsyncSession, job: Job) -> Job:
+    """
+    Put a failed job back in the queue with a fresh set of attempts. Raises
+    IntegrityError, with the savepoint rolled back, when another job already
+    holds the same dedup key. Caller commits.
+    """
+    async with db.begin_nested():
+        job.status = JobStatus.queued
+        job.attempts = 0
+        job.run_after = _now()
+        job.finished_at = None
+    return job
@@ -0,0 +1,36 @@
+from sqlalchemy import Integer, String, Text, JSON, DateTime, Enum, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.database import Base
+from app.db.admin.enums import JobStatus
+
+ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+class Job(Base):
+    """
+    One unit of background work (a league recalculation, a payout). Rows are
+    inserted by the API and claimed by app.services.jobs.JobRunner; finished
+    rows are kept as the job's status record.
+    """
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # identical work shares a key; only one queued/running job may hold it
+    dedup_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.queued, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
+    run_after: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+_active = text("status IN ('queued', 'running')")
+
+# workers poll for queued jobs whose run_after has passed
+Index("ix_jobs_claim", Job.status, Job.run_after)
+Index("ix_jobs_active_dedup", Job.dedup_key, unique=True, postgresql_where=_active, sqlite_where=_active)
@@ -0,0 +1,18 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from app.db.admin.enums import JobStatus
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    payload: dict
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    result: dict | None = None
+    last_error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
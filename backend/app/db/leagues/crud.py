@@ -1,6 +1,8 @@
+import base64
 import secrets
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import and_, func, or_
 from app.db.leagues import models, schemas
 from app.db.auth import models as auth_models
 
@@ -36,3 +38,43 @@ async def join_league(db: AsyncSession, user_id: int, code: str):
 
 async def get_league(db: AsyncSession, league_id: int):
     return await db.get(models.League, league_id)
+
+
+def encode_cursor(gameweek: int, total_points: int, user_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{gameweek}:{total_points}:{user_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[int, int, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        gameweek, total_points, user_id = (int(part) for part in raw.split(":"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    return gameweek, total_points, user_id
+
+async def latest_standings_gameweek(db: AsyncSession, league_id: int) -> int | None:
+    return (await db.execute(
+        select(func.max(models.LeagueStanding.gameweek)).where(models.LeagueStanding.league_id == league_id)
+    )).scalar()
+
+async def get_standings(db: AsyncSession, league_id: int, gameweek: int, after: tuple[int, int] | None = None, limit: int = 50):
+    """
+    One page of the leaderboard, walking the (league_id, gameweek, total_points
+    desc, user_id) index from the (total_points, user_id) key in `after`, so
+    deep pages cost the same as the first one.
+    """
+    S = models.LeagueStanding
+    q = (
+        select(S, auth_models.User.username)
+        .join(auth_models.User, auth_models.User.id == S.user_id)
+        .where(S.league_id == league_id, S.gameweek == gameweek)
+        .order_by(S.total_points.desc(), S.user_id)
+        .limit(limit)
+    )
+    if after is not None:
+        total_points, user_id = after
+        q = q.where(or_(S.total_points < total_points, and_(S.total_points == total_points, S.user_id > user_id)))
+    return (await db.execute(q)).all()
+
+async def get_standing(db: AsyncSession, league_id: int, user_id: int, gameweek: int):
+    """A single member's row (rank is precomputed), via the primary key."""
+    return await db.get(models.LeagueStanding, (league_id, user_id, gameweek))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Boolean, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Boolean, JSON, DateTime, Index, func
 from app.db.admin.enums import LeagueStatus
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.database import Base
@@ -26,3 +26,21 @@ class League(Base):
 
     created_by = relationship("User", back_populates="leagues_created")
     members = relationship("User", secondary=league_members, lazy="selectin", back_populates="leagues_joined")
+
+class LeagueStanding(Base):
+    """Materialized per-gameweek standings, written by app.services.scoring.update_standings."""
+    __tablename__ = "league_standings"
+
+    league_id: Mapped[int] = mapped_column(ForeignKey("leagues.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    gameweek: Mapped[int] = mapped_column(Integer, primary_key=True)
+    event_points: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_points: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+# leaderboard order; serves keyset pages and the latest-gameweek lookup
+Index(
+    "ix_league_standings_leaderboard",
+    LeagueStanding.league_id, LeagueStanding.gameweek, LeagueStanding.total_points.desc(), LeagueStanding.user_id,
+)
@@ -17,3 +17,18 @@ class LeagueResponse(LeagueBase):
     created_by_id: int
     members: List[UserResponse] = []
     model_config = ConfigDict(from_attributes=True)
+
+class StandingRow(BaseModel):
+    user_id: int
+    username: str | None = None
+    event_points: int
+    total_points: int
+    rank: int
+    model_config = ConfigDict(from_attributes=True)
+
+class StandingsResponse(BaseModel):
+    league_id: int
+    gameweek: int | None
+    standings: List[StandingRow] = []
+    next_cursor: str | None = None
+    me: StandingRow | None = None
@@ -1,9 +1,22 @@
 # app/db/payments/providers/stripe_provider.py
 from __future__ import annotations
+from functools import cache
 from typing import Optional, Dict, Any
-import stripe
 from app.core.config import settings
 
+
+@cache
+def stripe_sdk():
+    """
+    The stripe module, keyed with our secret. Imported on first use rather
+    than at app import: the SDK loads every API resource up front and is the
+    single slowest import in the app.
+    """
+    import stripe
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
+
 class StripeProvider:
     """
     Implements:
@@ -12,7 +25,6 @@ class StripeProvider:
       async def payout(...)
     """
     def __init__(self):
-        stripe.api_key = settings.STRIPE_SECRET_KEY
         self.connect_mode = settings.STRIPE_CONNECT == "true"
 
     async def create_deposit(
@@ -35,7 +47,7 @@ class StripeProvider:
 
         # Stripe recommends idempotency keys for POSTs
         # Use the header `Idempotency-Key` to guard against double-charges
-        pi = stripe.PaymentIntent.create(
+        pi = stripe_sdk().PaymentIntent.create(
             amount=amount_cents,
             currency=currency,
             metadata=metadata,
@@ -55,7 +67,7 @@ class StripeProvider:
         For flows where you created a PaymentIntent with capture_method='manual'
         and want to capture later (e.g., hold funds).
         """
-        pi = stripe.PaymentIntent.capture(provider_ref)
+        pi = stripe_sdk().PaymentIntent.capture(provider_ref)
         return {
             "provider_ref": pi["id"],
             "status": pi["status"],  # should be 'succeeded' after capture
@@ -84,7 +96,7 @@ class StripeProvider:
 
         # Example: make a transfer to a connected account
         # (Your platform must have balance in same currency.)
-        transfer = stripe.Transfer.create(
+        transfer = stripe_sdk().Transfer.create(
             amount=amount_cents,
             currency="kes",
             destination=destination,   # acct_...
@@ -1,31 +1,104 @@
+import time
+_IMPORTS_STARTED = time.perf_counter()
 from fastapi import FastAPI
 from app.api.routes import auth, leagues, payments, mpesa, stripe, pesapal, fpl
-from app.api.routes.admin import users as admin_users, leagues as admin_leagues, transactions as admin_tx, content as admin_content, settings as admin_settings, system as admin_system
+from app.api.routes.admin import users as admin_users, leagues as admin_leagues, transactions as admin_tx, content as admin_content, settings as admin_settings, system as admin_system, jobs as admin_jobs
 from contextlib import asynccontextmanager
-from app.db.database import Base, engine
+from app.db.database import Base, engine, AsyncSessionLocal
 from app.services.fpl_adapter import FPLAdapter
+from app.services.archive import build_archive
+from app.services.refresher import BackgroundRefresher
+from app.services.live import StandingsHub, StandingsPublisher
+from app.services.prefetch import PREFETCH_JOB, PicksPrefetcher
+from app.services.jobs import JobRunner, league_job_handlers
+from app.services.analytics import LeagueAnalyticsCache
+from app.services.startup import StartupReport
+from app.core.config import settings
+from app.core.principal import principal_cache
 import app.api.deps_fpl as deps_fpl_module
+from sqlalchemy import text
 import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
+_IMPORTS_SECONDS = time.perf_counter() - _IMPORTS_STARTED
+
+async def _open_db_connection():
+    # the pool's first connection (DNS, TCP, auth) is paid here rather than by the first request
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    session = aiohttp.ClientSession()
-    adapter = FPLAdapter(session)
+    report = StartupReport(settings.STARTUP_MODE, imports_s=_IMPORTS_SECONDS)
+    deps_fpl_module._startup_report = report
+    wiring_started = time.perf_counter()
+    # lazy: nothing goes upstream until a request asks for it (or a loop's first interval passes)
+    lazy = settings.STARTUP_MODE == "lazy"
+    # shared session never stores cookies; per-user credentials go in per-request headers
+    session = aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar())
+    adapter = FPLAdapter(session, archive=build_archive())
     deps_fpl_module._fpl_adapter = adapter   # wire into dependency module
-    # optionally warm cache or do one-time tasks
-    try:
-        await adapter.bootstrap_static(ttl=600)
-    except Exception:
-        # don't crash entire app if FPL is momentarily unreachable
-        pass
+    # admin changes to a user reach every worker through the shared cache tier (if one is configured)
+    principal_cache.versions = adapter._cache.shared
+    # keep hot keys (bootstrap-static) refreshed ahead of expiry
+    refresher = BackgroundRefresher(
+        adapter,
+        interval=settings.FPL_REFRESH_INTERVAL,
+        refresh_ahead=settings.FPL_REFRESH_AHEAD,
+        fill_empty=not lazy,
+    )
+    refresher.start()
+    # live standings: one hub per worker, rescoring only leagues someone is watching
+    hub = StandingsHub(max_buffer_bytes=settings.LIVE_MAX_BUFFER_BYTES)
+    deps_fpl_module._standings_hub = hub
+    publisher = StandingsPublisher(
+        hub, adapter, AsyncSessionLocal, interval=settings.LIVE_PUSH_INTERVAL, delay_first=lazy,
+    )
+    publisher.start()
+    deps_fpl_module._league_analytics = LeagueAnalyticsCache(max_entries=settings.LEAGUE_ANALYTICS_CACHE_ENTRIES)
+    # store every linked manager's picks once each deadline passes; a recurring job, so the
+    # deployment checks once per interval rather than every worker polling
+    prefetcher = PicksPrefetcher(adapter, concurrency=settings.FPL_PREFETCH_CONCURRENCY)
+    # admin recalculations, payouts and the picks prefetch run here, off the request path
+    job_runner = JobRunner(
+        AsyncSessionLocal, {**league_job_handlers(adapter, hub), PREFETCH_JOB: prefetcher.handle},
+        concurrency=settings.JOB_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        backoff_base=settings.JOB_BACKOFF_BASE,
+        backoff_max=settings.JOB_BACKOFF_MAX,
+        stale_after=settings.JOB_STALE_AFTER,
+        recurring={PREFETCH_JOB: settings.FPL_PREFETCH_INTERVAL},
+        delay_first=lazy,
+    )
+    job_runner.start()
+    report.phases["wiring"] = time.perf_counter() - wiring_started
+    # warm-up runs concurrently; a failed step only means that cache fills on first use
+    await report.start(
+        {"bootstrap": adapter.player_store, "projections": adapter.projections, "database": _open_db_connection},
+        timeout=settings.STARTUP_WARMUP_TIMEOUT,
+    )
+    logger.info(f"Startup ({report.mode}) ready: {report.stats()['phases_ms']}")
     yield
     # shutdown
+    await report.stop()
+    await job_runner.stop()
+    await publisher.stop()
+    await refresher.stop()
+    principal_cache.versions = None
     try:
         await adapter._session.close()
+        await adapter._cache.close()
+        await adapter._logins.close()
+        if adapter._archive is not None:
+            await adapter._archive.close()
     except Exception:
         pass
     deps_fpl_module._fpl_adapter = None
+    deps_fpl_module._standings_hub = None
+    deps_fpl_module._league_analytics = None
+    deps_fpl_module._startup_report = None
 
 app = FastAPI(title="Fantasy Fusion", lifespan=lifespan)
 
@@ -42,3 +115,4 @@ app.include_router(admin_tx.router)
 app.include_router(admin_content.router)
 app.include_router(admin_settings.router)
 app.include_router(admin_system.router)
+app.include_router(admin_jobs.router)
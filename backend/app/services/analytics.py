@@ -0,0 +1,135 @@
+# app/services/analytics.py
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from typing import Hashable, Mapping, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.fpl_adapter import FPLAdapter
+from app.services.prefetch import load_picks
+from app.services.scoring import PicksMatrix, load_memberships
+
+# a started player owned by at most this share of the league counts as a differential
+DIFFERENTIAL_SHARE = 0.2
+
+
+def league_ownership(members: Mapping[int, int], picks: Mapping[int, dict]) -> dict:
+    """
+    Ownership, effective ownership (captain counts twice, triple captain three
+    times, bench zero) and each member's differential exposure for one league.
+
+    Works on the members x squad-slot PicksMatrix and per-element bincounts
+    rather than a dense members x elements matrix: a member's `gain` is the
+    sum over their slots of max(multiplier - EO, 0) (what they win relative
+    to the league per point those players score) and `risk` the total EO of
+    everything they do not cover, sum(EO) - sum(min(multiplier, EO)). EO is a
+    fraction here (1.5 = 150%).
+    """
+    users = [u for u, m in members.items() if m in picks]
+    matrix = PicksMatrix({members[u]: picks[members[u]] for u in users})
+    n = len(users)
+    elements, mult = matrix.elements, matrix.multipliers.astype(np.float32)
+    size = int(elements.max(initial=0)) + 1
+    owned = np.bincount(elements.ravel(), minlength=size).astype(np.float32)
+    eo = np.bincount(elements.ravel(), weights=mult.ravel(), minlength=size).astype(np.float32)
+    captained = np.bincount(elements[mult >= 2], minlength=size)
+    owned[0] = eo[0] = captained[0] = 0                   # empty slots
+    if n:
+        owned /= n
+        eo /= n
+
+    slot_eo = eo[elements]
+    gain = np.clip(mult - slot_eo, 0, None).sum(axis=1)
+    risk = eo.sum() - np.minimum(mult, slot_eo).sum(axis=1)
+    differential = (mult > 0) & (owned[elements] <= DIFFERENTIAL_SHARE) & (elements > 0)
+
+    ids = np.flatnonzero(owned)
+    ids = ids[np.lexsort((ids, -eo[ids]))]
+    scored = set(users)
+    return {
+        "members": n,
+        "missing": [u for u in members if u not in scored],
+        "elements": [
+            {
+                "element": int(e),
+                "ownership": round(float(owned[e]) * 100, 1),
+                "effective_ownership": round(float(eo[e]) * 100, 1),
+                "captained": int(captained[e]),
+            }
+            for e in ids
+        ],
+        "exposure": sorted(
+            (
+                {
+                    "user_id": u,
+                    "gain": round(float(gain[row]), 3),
+                    "risk": round(float(risk[row]), 3),
+                    "differentials": elements[row][differential[row]].tolist(),
+                }
+                for row, u in enumerate(users)
+            ),
+            key=lambda r: (-r["gain"], r["user_id"]),
+        ),
+    }
+
+
+class LeagueAnalyticsCache:
+    """
+    Per-(league, gameweek) ownership results, LRU-bounded. Each entry
+    remembers the membership it was built from; a lookup with a different
+    membership drops it, so joins and leaves (from any worker) invalidate
+    it and nothing else does. Only complete results for gameweeks whose
+    deadline has passed are stored, since those picks can no longer change.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[int, int], tuple[Hashable, dict]]" = OrderedDict()
+        self.hits = self.misses = self.invalidations = 0
+
+    def get(self, league_id: int, gameweek: int, membership: Hashable) -> Optional[dict]:
+        entry = self._entries.get((league_id, gameweek))
+        if entry is not None and entry[0] != membership:
+            del self._entries[(league_id, gameweek)]
+            self.invalidations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((league_id, gameweek))
+        self.hits += 1
+        return entry[1]
+
+    def put(self, league_id: int, gameweek: int, membership: Hashable, result: dict):
+        self._entries[(league_id, gameweek)] = (membership, result)
+        self._entries.move_to_end((league_id, gameweek))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+async def league_analytics(
+    db: AsyncSession, adapter: FPLAdapter, cache: LeagueAnalyticsCache, league_id: int, gameweek: int
+) -> dict:
+    """Ownership analytics for a league's gameweek, from the cache or built from stored/cached picks."""
+    members = (await load_memberships(db, [league_id])).get(league_id, {})
+    membership = frozenset(members.items())
+    cached = cache.get(league_id, gameweek, membership)
+    if cached is not None:
+        return cached
+    started = time.perf_counter()
+    picks = await load_picks(db, adapter, members.values(), gameweek)
+    result = {"league_id": league_id, "gameweek": gameweek, **league_ownership(members, picks)}
+    result["build_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    if not result["missing"] and await adapter.deadline_passed(gameweek):
+        cache.put(league_id, gameweek, membership, result)
+    return result
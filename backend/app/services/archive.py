@@ -0,0 +1,63 @@
+# app/services/archive.py
+from __future__ import annotations
+import asyncio
+import sqlite3
+import threading
+import zlib
+from typing import Any, Optional
+from app.services.cache import CacheStats, decode_value, encode_value, namespace_of
+
+
+class ImmutableStore:
+    """
+    Disk-backed store for FPL data that can never change again (live stats of
+    a finished gameweek, its final fixture results). Values are written once,
+    as zlib-compressed compact JSON in a single SQLite file, and have no
+    expiry, so they survive restarts and deploys. The adapter consults it
+    before going upstream.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS archive (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self._db_lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def _get_sync(self, key: str) -> Optional[bytes]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT value FROM archive WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _put_sync(self, key: str, blob: bytes):
+        with self._db_lock:
+            self._conn.execute("INSERT OR IGNORE INTO archive (key, value) VALUES (?, ?)", (key, blob))
+
+    async def get(self, key: str) -> Any | None:
+        blob = await asyncio.to_thread(self._get_sync, key)
+        if blob is None:
+            self._stats.incr(namespace_of(key), "misses")
+            return None
+        self._stats.incr(namespace_of(key), "hits")
+        return decode_value(zlib.decompress(blob))
+
+    async def put(self, key: str, data: Any):
+        blob = zlib.compress(encode_value(data), 6)
+        await asyncio.to_thread(self._put_sync, key, blob)
+        self._stats.incr(namespace_of(key), "writes")
+        self._stats.incr(namespace_of(key), "bytes_written", len(blob))
+
+    async def close(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        return {"path": self.path, "namespaces": self._stats.snapshot()}
+
+
+def build_archive(config=None) -> Optional[ImmutableStore]:
+    """The store at FPL_ARCHIVE_PATH, or None when that setting is empty."""
+    if config is None:
+        from app.core.config import settings as config
+    return ImmutableStore(config.FPL_ARCHIVE_PATH) if config.FPL_ARCHIVE_PATH else None
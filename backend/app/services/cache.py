@@ -0,0 +1,459 @@
+# app/services/cache.py
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from typing import Any, Callable, Optional, Protocol
+from app.services.records import json_default, revive
+
+logger = logging.getLogger(__name__)
+
+
+def namespace_of(key: str) -> str:
+    """Keys are `<namespace>:<id>` (e.g. `entry:123`); the namespace drives TTLs and stats."""
+    return key.split(":", 1)[0]
+
+
+def encode_value(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+def decode_value(raw: bytes | str) -> Any:
+    return json.loads(raw)
+
+
+_SIZE_SAMPLE = 8  # items per container that approx_size() looks at
+_SIZE_DEPTH = 4   # nesting levels it descends before assuming a flat cost
+_SCALARS = frozenset({int, float, bool, type(None)})
+
+
+def approx_size(data: Any, depth: int = 0) -> int:
+    """
+    Rough encoded size of `data` in bytes, for the L1 byte budget. Containers
+    are measured from a sample of at most _SIZE_SAMPLE items, scaled to their
+    length, so the cost is bounded however large the value (bootstrap-static
+    is ~1.5 MB) instead of a full JSON encode on every write.
+    """
+    kind = type(data)
+    if kind is str or kind is bytes:
+        return len(data) + 2
+    if kind in _SCALARS:
+        return 8
+    if depth >= _SIZE_DEPTH:
+        return 64
+    if kind is dict:
+        total = seen = 0
+        for key, value in data.items():
+            if seen == _SIZE_SAMPLE:
+                break
+            seen += 1
+            vkind = type(value)
+            total += (len(key) if type(key) is str else 8) + 4 + (
+                len(value) if vkind is str else 8 if vkind in _SCALARS else approx_size(value, depth + 1)
+            )
+        return total * len(data) // seen + 2 if seen else 2
+    if kind is list or kind is tuple:
+        if not data:
+            return 2
+        sample = data[::len(data) // _SIZE_SAMPLE or 1][:_SIZE_SAMPLE]
+        total = 0
+        for value in sample:
+            total += approx_size(value, depth + 1) + 1
+        return total * len(data) // len(sample) + 2
+    fields = getattr(data, "__dataclass_fields__", None)  # records, EncodedPayload
+    if fields is not None:
+        return sum(len(f) + 4 + approx_size(getattr(data, f), depth + 1) for f in fields) + 2
+    return 64
+
+
+class CacheStats:
+    """Per-namespace counters (hits, misses, sets, evictions, expirations)."""
+
+    def __init__(self):
+        self._counters: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def incr(self, namespace: str, counter: str, n: int = 1):
+        self._counters[namespace][counter] += n
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {ns: dict(c) for ns, c in self._counters.items()}
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Any | None:
+        """Return the cached value or None on miss/expiry."""
+    async def set(self, key: str, data: Any, ttl_seconds: Optional[int] = None) -> None:
+        """Store a value; ttl_seconds=None uses the namespace default."""
+    async def delete(self, key: str) -> None:
+        """Drop a key from every tier."""
+    async def close(self) -> None:
+        """Release connections held by shared tiers."""
+    def ttl_for(self, key: str, ttl_seconds: Optional[int] = None) -> float:
+        """TTL that `set` would apply to this key."""
+    def stats(self) -> dict:
+        """Counters for the admin metrics endpoint."""
+
+
+class TTLPolicy:
+    """Resolves the TTL for a key from its namespace, falling back to `default`."""
+
+    def __init__(self, ttls: dict[str, int] | None = None, default: int = 60):
+        self.ttls = dict(ttls or {})
+        self.default = default
+
+    def ttl_for(self, key: str, ttl_seconds: Optional[int] = None) -> int:
+        if ttl_seconds is not None:
+            return ttl_seconds
+        return self.ttls.get(namespace_of(key), self.default)
+
+
+class ShardedLocks:
+    """
+    A fixed pool of asyncio locks indexed by key hash. Writers to the same key
+    serialize; writers to different keys almost never contend, and memory
+    stays constant no matter how many keys we see.
+    """
+
+    def __init__(self, shards: int = 64):
+        self._locks = [asyncio.Lock() for _ in range(shards)]
+
+    def lock_for(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+# ------------------------
+# In-process tier
+# ------------------------
+class MemoryLRUCache:
+    """
+    In-process LRU bounded by entry count *and* approximate payload bytes
+    (the encoded length when a caller already has the bytes, else
+    approx_size()). Expired entries are dropped on read and whenever we need
+    room on write.
+    """
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 64 * 1024 * 1024, ttl_policy: TTLPolicy | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self._store: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    def ttl_for(self, key: str, ttl_seconds: Optional[int] = None) -> float:
+        return self.ttl_policy.ttl_for(key, ttl_seconds)
+
+    async def get(self, key: str):
+        # no lock: the body has no await points, so it runs atomically on the event loop
+        ns = namespace_of(key)
+        v = self._store.get(key)
+        if v is None:
+            self._stats.incr(ns, "misses")
+            return None
+        exp, _, data = v
+        if time.monotonic() > exp:
+            self._drop(key)
+            self._stats.incr(ns, "expirations")
+            self._stats.incr(ns, "misses")
+            return None
+        self._store.move_to_end(key)
+        self._stats.incr(ns, "hits")
+        return data
+
+    async def set(self, key: str, data: Any, ttl_seconds: Optional[int] = None, size: Optional[int] = None):
+        ttl = self.ttl_policy.ttl_for(key, ttl_seconds)
+        if size is None:
+            size = approx_size(data)
+        # like get(), the mutation below never awaits, so it needs no lock
+        ns = namespace_of(key)
+        if size > self.max_bytes:
+            # a single value larger than the whole budget is never cached
+            self._stats.incr(ns, "rejected")
+            return
+        if key in self._store:
+            self._drop(key)
+        self._store[key] = (time.monotonic() + ttl, size, data)
+        self._bytes += size
+        self._stats.incr(ns, "sets")
+        self._evict()
+
+    async def delete(self, key: str):
+        if key in self._store:
+            self._drop(key)
+
+    async def get_with_ttl(self, key: str) -> tuple[Any, float] | None:
+        data = await self.get(key)
+        if data is None:
+            return None
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        return data, max(0.0, entry[0] - time.monotonic())
+
+    def _drop(self, key: str):
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict(self):
+        if len(self._store) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        # purge expired entries first, then fall back to least-recently-used
+        now = time.monotonic()
+        for k in [k for k, (exp, _, _) in self._store.items() if exp < now]:
+            self._drop(k)
+            self._stats.incr(namespace_of(k), "expirations")
+        while self._store and (len(self._store) > self.max_entries or self._bytes > self.max_bytes):
+            k, (_, size, _) = self._store.popitem(last=False)
+            self._bytes -= size
+            self._stats.incr(namespace_of(k), "evictions")
+
+    async def close(self):
+        self._store.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._store)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "namespaces": self._stats.snapshot(),
+        }
+
+
+# ------------------------
+# Shared tiers (one copy for every uvicorn worker)
+# ------------------------
+class RedisCache:
+    """Shared tier on any Redis-protocol server (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url: str, ttl_policy: TTLPolicy | None = None, prefix: str = "ff:"):
+        # imported lazily so the redis client is only needed when this tier is configured
+        import redis.asyncio as aioredis
+
+        self._client = aioredis.Redis.from_url(url)
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self.prefix = prefix
+        self._stats = CacheStats()
+
+    async def get(self, key: str):
+        hit = await self.get_with_ttl(key)
+        return hit[0] if hit else None
+
+    async def get_with_ttl(self, key: str) -> tuple[Any, float] | None:
+        ns = namespace_of(key)
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                raw, pttl = await pipe.get(self.prefix + key).pttl(self.prefix + key).execute()
+        except Exception as e:
+            # the shared tier is an optimization; never fail a request because of it
+            logger.warning(f"Redis cache get failed for {key}: {e}")
+            self._stats.incr(ns, "errors")
+            return None
+        if raw is None:
+            self._stats.incr(ns, "misses")
+            return None
+        self._stats.incr(ns, "hits")
+        remaining = pttl / 1000 if pttl and pttl > 0 else 0.0
+        return decode_value(raw), remaining
+
+    async def set(self, key: str, data: Any, ttl_seconds: Optional[int] = None, raw: bytes | None = None):
+        ns = namespace_of(key)
+        ttl = self.ttl_policy.ttl_for(key, ttl_seconds)
+        try:
+            await self._client.set(self.prefix + key, raw if raw is not None else encode_value(data), ex=max(1, int(ttl)))
+            self._stats.incr(ns, "sets")
+        except Exception as e:
+            logger.warning(f"Redis cache set failed for {key}: {e}")
+            self._stats.incr(ns, "errors")
+
+    async def delete(self, key: str):
+        try:
+            await self._client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed for {key}: {e}")
+
+    async def close(self):
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "namespaces": self._stats.snapshot()}
+
+
+class SQLiteCache:
+    """
+    Shared tier backed by a single SQLite file in WAL mode, so every worker on the
+    host reads the same copy. Blocking sqlite calls run in a thread.
+    """
+
+    _PURGE_EVERY = 500  # sets between sweeps of expired rows
+
+    def __init__(self, path: str, ttl_policy: TTLPolicy | None = None):
+        self.path = path
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self._db_lock = threading.Lock()
+        self._sets = 0
+        self._stats = CacheStats()
+
+    def _get_sync(self, key: str):
+        with self._db_lock:
+            return self._conn.execute("SELECT expires_at, value FROM cache WHERE key = ?", (key,)).fetchone()
+
+    def _set_sync(self, key: str, expires_at: float, raw: bytes, purge: bool):
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)", (key, expires_at, raw)
+            )
+            if purge:
+                self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+
+    def _delete_sync(self, key: str):
+        with self._db_lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    async def get(self, key: str):
+        hit = await self.get_with_ttl(key)
+        return hit[0] if hit else None
+
+    async def get_with_ttl(self, key: str) -> tuple[Any, float] | None:
+        ns = namespace_of(key)
+        row = await asyncio.to_thread(self._get_sync, key)
+        if row is None:
+            self._stats.incr(ns, "misses")
+            return None
+        expires_at, raw = row
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            await asyncio.to_thread(self._delete_sync, key)
+            self._stats.incr(ns, "expirations")
+            self._stats.incr(ns, "misses")
+            return None
+        self._stats.incr(ns, "hits")
+        return decode_value(raw), remaining
+
+    async def set(self, key: str, data: Any, ttl_seconds: Optional[int] = None, raw: bytes | None = None):
+        ttl = self.ttl_policy.ttl_for(key, ttl_seconds)
+        self._sets += 1
+        purge = self._sets % self._PURGE_EVERY == 0
+        await asyncio.to_thread(
+            self._set_sync, key, time.time() + ttl, raw if raw is not None else encode_value(data), purge
+        )
+        self._stats.incr(namespace_of(key), "sets")
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete_sync, key)
+
+    async def close(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        return {"backend": "sqlite", "path": self.path, "namespaces": self._stats.snapshot()}
+
+
+# ------------------------
+# Composition
+# ------------------------
+class TieredCache:
+    """
+    L1 (in-process LRU) in front of an optional shared L2. L2 hits are promoted
+    into L1 with the remaining L2 lifetime so both tiers expire together.
+    `revive(key, value)` rebuilds typed values (see app.services.records)
+    from the plain JSON the shared tier returns, before they reach L1.
+    """
+
+    def __init__(
+        self,
+        local: MemoryLRUCache,
+        shared: RedisCache | SQLiteCache | None = None,
+        lock_shards: int = 64,
+        revive: Optional[Callable[[str, Any], Any]] = None,
+    ):
+        self.local = local
+        self.shared = shared
+        self.revive = revive
+        # reads are lock-free; a write awaits the shared tier between its two
+        # steps, so writers of the same key serialize to keep L1 and L2 in step
+        self._write_locks = ShardedLocks(lock_shards)
+
+    def ttl_for(self, key: str, ttl_seconds: Optional[int] = None) -> float:
+        return self.local.ttl_policy.ttl_for(key, ttl_seconds)
+
+    async def get(self, key: str):
+        data = await self.local.get(key)
+        if data is not None or self.shared is None:
+            return data
+        hit = await self.shared.get_with_ttl(key)
+        if hit is None:
+            return None
+        data, remaining = hit
+        if self.revive is not None:
+            data = self.revive(key, data)
+        if remaining > 0:
+            await self.local.set(key, data, ttl_seconds=remaining)
+        return data
+
+    async def set(self, key: str, data: Any, ttl_seconds: Optional[int] = None):
+        if self.shared is None:
+            await self.local.set(key, data, ttl_seconds=ttl_seconds)
+            return
+        # serialize once and reuse the bytes for both the L1 size and the L2 payload
+        raw = encode_value(data)
+        async with self._write_locks.lock_for(key):
+            await self.local.set(key, data, ttl_seconds=ttl_seconds, size=len(raw))
+            await self.shared.set(key, data, ttl_seconds=ttl_seconds, raw=raw)
+
+    async def delete(self, key: str):
+        if self.shared is None:
+            await self.local.delete(key)
+            return
+        async with self._write_locks.lock_for(key):
+            await self.local.delete(key)
+            await self.shared.delete(key)
+
+    async def close(self):
+        if self.shared is not None:
+            await self.shared.close()
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
+
+
+def build_cache(config=None) -> TieredCache:
+    """Build the cache stack described by settings (FPL_CACHE_*)."""
+    if config is None:
+        from app.core.config import settings as config
+
+    policy = TTLPolicy(config.FPL_CACHE_TTLS, default=config.FPL_CACHE_DEFAULT_TTL)
+    local = MemoryLRUCache(
+        max_entries=config.FPL_CACHE_MAX_ENTRIES,
+        max_bytes=config.FPL_CACHE_MAX_BYTES,
+        ttl_policy=policy,
+    )
+    backend = config.FPL_CACHE_BACKEND.lower()
+    shared = None
+    if backend == "redis":
+        shared = RedisCache(config.FPL_CACHE_REDIS_URL, ttl_policy=policy)
+    elif backend == "sqlite":
+        shared = SQLiteCache(config.FPL_CACHE_SQLITE_PATH, ttl_policy=policy)
+    elif backend != "memory":
+        raise ValueError(f"Unknown FPL_CACHE_BACKEND: {config.FPL_CACHE_BACKEND}")
+    return TieredCache(local, shared, revive=revive)
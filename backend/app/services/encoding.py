@@ -0,0 +1,60 @@
+# app/services/encoding.py
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+import brotli
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """
+    A JSON document serialized once, with its compressed variants and a strong
+    ETag. Routes serve these bytes directly instead of re-encoding the dict
+    on every request.
+    """
+    raw: bytes
+    gzip: bytes
+    br: bytes
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: Any) -> "EncodedPayload":
+        raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        return cls.from_bytes(raw)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "EncodedPayload":
+        # strong validator: it changes iff the bytes change
+        etag = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+        return cls(
+            raw=raw,
+            gzip=gzip.compress(raw, compresslevel=6, mtime=0),
+            br=brotli.compress(raw, quality=5),
+            etag=etag,
+        )
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # accept weak comparisons too (W/"..."), as proxies may weaken our tag
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return self.etag in tags
+
+    def negotiate(self, accept_encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """Pick the best variant for the client's Accept-Encoding: br, then gzip, then identity."""
+        accepted = set()
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+        if "br" in accepted:
+            return self.br, "br"
+        if "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.raw, None
@@ -1,161 +1,499 @@
 from __future__ import annotations
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Any, Dict
+import time
+from datetime import datetime, timezone
+from typing import Optional, Any, Dict, Callable, Awaitable, AsyncIterator, Iterable
 import aiohttp
-from fpl import FPL
-import asyncio
-from datetime import timedelta, datetime, timezone
+from yarl import URL
+from app.core.config import settings
+from app.services.archive import ImmutableStore
+from app.services.cache import CacheBackend, build_cache
+from app.services.singleflight import SingleFlight
+from app.services.ttl import DeadlineTTLPolicy, parse_deadline
+from app.services.players import PlayerStore
+from app.services.projections import ProjectionTable, upcoming_events
+from app.services.encoding import EncodedPayload
+from app.services.login import LoginSessionPool
+from app.services.records import Entry, History, Picks
+from app.services.resilience import CircuitBreaker, TokenBucket, UpstreamError, counts_as_failure
 
 logger = logging.getLogger(__name__)
 
-# --- Caching Logic (Unchanged) ---
-class SimpleTTLCache:
-    def __init__(self):
-        self._store: Dict[str, tuple[datetime, Any]] = {}
-        self._lock = asyncio.Lock()
+LOGIN_HEADERS = {"User-Agent": "Dalvik/2.1.0 (Linux; U; Android 5.1; PRO 5 Build/LMY47D)"}
 
-    async def get(self, key: str):
-        async with self._lock:
-            v = self._store.get(key)
-            if not v: return None
-            exp, data = v
-            if datetime.now(timezone.utc) > exp:
-                del self._store[key]
-                return None
-            return data
+class FPLAdapter:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        cache: Optional[CacheBackend] = None,
+        archive: Optional[ImmutableStore] = None,
+        base_url: Optional[str] = None,
+        login_url: Optional[str] = None,
+        login_pool: Optional[LoginSessionPool] = None,
+    ):
+        self._session = session
+        # every call is a plain GET under the API base, so pointing FPL_API_BASE_URL
+        # at the fake server (python -m fakefpl) exercises the whole adapter offline
+        self._base = (base_url or settings.FPL_API_BASE_URL).rstrip("/")
+        self._site = URL(self._base).origin()
+        self._login_url = login_url or settings.FPL_LOGIN_URL
+        # logins run on pooled sessions with their own cookie jars; see login_and_get_details()
+        self._logins = login_pool or LoginSessionPool(
+            size=settings.FPL_LOGIN_POOL_SIZE, acquire_timeout=settings.FPL_LOGIN_POOL_TIMEOUT
+        )
+        self._cache = cache if cache is not None else build_cache()
+        # finished-gameweek data lives here for good; see _archived()
+        self._archive = archive
+        # TTLs follow the gameweek calendar; fed from every bootstrap snapshot we see
+        self._ttl = DeadlineTTLPolicy(
+            settings.FPL_TTL_PHASES,
+            deadline_window=settings.FPL_TTL_DEADLINE_WINDOW,
+            final_ttl=settings.FPL_TTL_FINAL,
+            price_change_hour_utc=settings.FPL_PRICE_CHANGE_HOUR_UTC,
+        )
+        self._flights = SingleFlight()
+        # Hot keys are served stale-while-revalidate and kept warm by the
+        # BackgroundRefresher; we hold their last good value in process so
+        # readers never wait on (or fail because of) upstream.
+        self._hot: Dict[str, Callable[[], Awaitable[Any]]] = {
+            "bootstrap:static": lambda: self._get_json(self._url("bootstrap-static/")),
+        }
+        self._last_good: Dict[str, tuple[float, Any]] = {}
+        self._revalidating: set[asyncio.Task] = set()
+        # views derived from a snapshot (player store, encoded bytes), keyed by
+        # name -> (snapshot they were built from, view)
+        self._derived: Dict[str, tuple[Any, Any]] = {}
+        # every outbound FPL call goes through _upstream(): one token bucket so
+        # bursts of misses cannot get our IP throttled, one breaker so a sick
+        # upstream fails fast instead of tying up workers until timeouts fire
+        self._limiter = TokenBucket(
+            rate=settings.FPL_RATE_LIMIT_PER_SEC,
+            burst=settings.FPL_RATE_LIMIT_BURST,
+            max_wait=settings.FPL_RATE_LIMIT_MAX_WAIT,
+        )
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.FPL_BREAKER_FAILURES,
+            reset_timeout=settings.FPL_BREAKER_RESET_SECONDS,
+        )
 
-    async def set(self, key: str, data: Any, ttl_seconds: int = 60):
-        async with self._lock:
-            self._store[key] = (datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds), data)
+    def _url(self, path: str) -> str:
+        return f"{self._base}/{path}"
 
-_cache = SimpleTTLCache()
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "cache": self._cache.stats(),
+            "singleflight": self._flights.stats(),
+            "rate_limiter": self._limiter.stats(),
+            "circuit_breaker": self._breaker.stats(),
+            "hot_keys": {k: self.freshness(k) for k in self._hot},
+            "archive": self._archive.stats() if self._archive is not None else None,
+            "ttl_policy": self._ttl.stats(),
+            "login": self._logins.stats(),
+        }
 
-class FPLAdapter:
-    def __init__(self, session: aiohttp.ClientSession):
-        self._session = session
-        self._fpl = FPL(session)
+    async def _upstream(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one outbound FPL call under the circuit breaker and rate limiter."""
+        generation = self._breaker.before_call()
+        try:
+            await self._limiter.acquire()
+        except BaseException:  # rate limited or cancelled while waiting for a token
+            self._breaker.release_trial(generation)
+            raise
+        try:
+            result = await call()
+        except Exception as e:
+            if counts_as_failure(e):
+                self._breaker.record_failure(generation)
+            else:
+                self._breaker.record_success(generation)  # FPL answered, just not with what we wanted
+            raise
+        except BaseException:
+            self._breaker.release_trial(generation)  # cancelled
+            raise
+        self._breaker.record_success(generation)
+        return result
+
+    async def _cached(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None) -> Any:
+        """
+        Cache lookup + coalesced fetch. N concurrent misses on `key` share one
+        upstream call; the leader fills the cache before the flight ends so
+        requests arriving afterwards are plain hits.
+        Hot keys with a last good value never wait: they get that value and the
+        fetch continues in the background.
+        """
+        cached = await self._cache.get(key)
+        if cached is not None: return cached
+
+        last = self._last_good.get(key)
+        if last is not None:
+            self._revalidate(key, fetch, ttl)
+            return last[1]
+        return await self._flights.do(key, lambda: self._fill(key, fetch, ttl))
+
+    def _ttl_for(self, key: str, ttl: Optional[int] = None) -> int:
+        """Explicit TTL, else the calendar-driven one, else the cache's static default."""
+        if ttl is not None:
+            return ttl
+        dynamic = self._ttl.ttl_for(key)
+        return dynamic if dynamic is not None else self._cache.ttl_for(key)
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None) -> Any:
+        data = await fetch()
+        if key == "bootstrap:static":
+            self._ttl.update(data.get("events", []))
+        await self._cache.set(key, data, ttl_seconds=self._ttl_for(key, ttl))
+        if key in self._hot:
+            self._last_good[key] = (time.monotonic(), data)
+        return data
+
+    async def _archived(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], final: Callable[[], Awaitable[bool]], ttl: Optional[int] = None
+    ) -> Any:
+        """
+        _cached() for data that may become immutable: cache, then the on-disk
+        archive, then upstream. A fetched value is archived once `final()`
+        says it can no longer change.
+        """
+        if self._archive is None:
+            return await self._cached(key, fetch, ttl)
+        cached = await self._cache.get(key)
+        if cached is not None: return cached
+        archived = await self._archive.get(key)
+        if archived is not None:
+            await self._cache.set(key, archived, ttl_seconds=self._ttl_for(key, ttl))
+            return archived
+        data = await self._cached(key, fetch, ttl)
+        if await final():
+            await self._archive.put(key, data)
+        return data
+
+    def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Optional[int] = None):
+        async def run():
+            try:
+                await self._flights.do(key, lambda: self._fill(key, fetch, ttl))
+            except Exception as e:
+                logger.warning(f"Background revalidation of {key} failed, serving stale: {e}")
+
+        task = asyncio.ensure_future(run())
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidating.discard)
+
+    # ------------------------
+    # Hot keys (used by app.services.refresher)
+    # ------------------------
+    def hot_keys(self) -> list[str]:
+        return list(self._hot)
+
+    async def refresh(self, key: str) -> Any:
+        """Force an upstream fetch of a hot key, replacing cache and last good value."""
+        return await self._flights.do(key, lambda: self._fill(key, self._hot[key]))
+
+    def freshness(self, key: str) -> Optional[Dict[str, Any]]:
+        """Age of the last good value and whether it has outlived its TTL."""
+        last = self._last_good.get(key)
+        if last is None:
+            return None
+        age = time.monotonic() - last[0]
+        ttl = self._ttl_for(key)
+        return {"age": round(age, 3), "ttl": ttl, "stale": age > ttl}
+
+    def is_stale(self, key: str) -> bool:
+        f = self.freshness(key)
+        return bool(f and f["stale"])
 
     # ------------------------
     # Public / cached endpoints
     # ------------------------
-    async def bootstrap_static(self, ttl: int = 300) -> dict:
-        cached = await _cache.get("bootstrap-static")
-        if cached: return cached
-        
-        data = await self._fpl.get_bootstrap_static()
-        await _cache.set("bootstrap-static", data, ttl_seconds=ttl)
+    async def bootstrap_static(self, ttl: Optional[int] = None) -> dict:
+        data = await self._cached("bootstrap:static", self._hot["bootstrap:static"], ttl)
+        # another worker may have filled the shared tier; keep our calendar in step
+        self._ttl.update(data.get("events", []))
         return data
 
+    async def _derive(self, name: str, data: Any, build: Callable[[Any], Any]) -> Any:
+        """
+        Build (in a worker thread) and memoize a view of `data`. The view is
+        rebuilt only when the snapshot object itself changes, i.e. once per
+        upstream fetch, and concurrent first requests share one build.
+        """
+        current = self._derived.get(name)
+        if current is not None and current[0] is data:
+            return current[1]
+        view = await self._flights.do(f"derived:{name}:{id(data)}", lambda: asyncio.to_thread(build, data))
+        self._derived[name] = (data, view)
+        return view
+
+    async def player_store(self) -> PlayerStore:
+        """Indexed player/team view of the current bootstrap snapshot."""
+        return await self._derive("players", await self.bootstrap_static(), PlayerStore.from_bootstrap)
+
+    async def projections(self) -> ProjectionTable:
+        """
+        Expected points for every player over the next FPL_PROJECTION_HORIZON
+        gameweeks. Recomputed only when the bootstrap snapshot changes; the
+        fixtures it needs are fetched (through the cache) just before a rebuild.
+        """
+        data = await self.bootstrap_static()
+        current = self._derived.get("projections")
+        if current is not None and current[0] is data:
+            return current[1]
+        store = await self._derive("players", data, PlayerStore.from_bootstrap)
+        events = upcoming_events(data, settings.FPL_PROJECTION_HORIZON)
+        fixtures = dict(zip(events, await asyncio.gather(*(self.get_fixtures(e) for e in events))))
+        return await self._derive("projections", data, lambda d: ProjectionTable.build(d, store, fixtures, events))
+
+    async def bootstrap_encoded(self) -> EncodedPayload:
+        """The current bootstrap snapshot as JSON bytes (+gzip/br variants and a strong ETag)."""
+        return await self._derive("bootstrap-bytes", await self.bootstrap_static(), EncodedPayload.from_data)
+
     # ------------------------
     # Authentication Flow (UPDATED)
     # ------------------------
+    async def _login(self, session: aiohttp.ClientSession, email: str, password: str):
+        """Same form post the `fpl` library's FPL.login makes, but on the session we pass in."""
+        payload = {
+            "login": email,
+            "password": password,
+            "app": "plfpl-web",
+            "redirect_uri": str(self._site.with_path("/a/login")),
+        }
+        async with session.post(self._login_url, data=payload, headers=LOGIN_HEADERS) as resp:
+            if resp.status == 403:
+                raise UpstreamError("403 forbidden returned by FPL login.", 403)
+            if resp.url.query.get("state") == "fail":
+                raise ValueError(f"Login not successful, reason: {resp.url.query.get('reason')}")
+
     async def login_and_get_details(self, email: str, password: str) -> Dict[str, Any]:
         """
-        1. Logs into FPL using the library.
+        1. Logs into FPL on a session checked out of the login pool (its own cookie jar).
         2. Fetches the Manager ID (entry_id) from /api/me/.
         3. Returns the ID and the Session Cookie string.
+        The pool clears the session's cookies when it is returned, so
+        concurrent logins cannot see or clear each other's cookies. Each stage
+        is timed into metrics()["login"]["stages"].
         """
+        timings = self._logins.timings
         try:
-            # 1. Perform Login (Updates the aiohttp session cookie jar internally)
-            await self._fpl.login(email, password)
-            
-            # 2. Fetch User Details to get Manager ID
-            # We access the session directly because the library might not expose /api/me easily
-            async with self._session.get("https://fantasy.premierleague.com/api/me/") as resp:
-                if resp.status != 200:
-                    raise Exception("Login successful, but failed to fetch user details.")
-                me_data = await resp.json()
-                
-            # Extract Manager ID (entry)
-            player = me_data.get('player', {})
-            entry_id = player.get('entry')
-            
-            if not entry_id:
-                raise Exception("User does not have an FPL Team (Entry ID not found).")
-
-            # 3. Extract Cookies to return to Frontend
-            # We filter for 'pl_profile' which is the essential auth cookie
-            cookies = self._session.cookie_jar.filter_cookies("https://fantasy.premierleague.com")
-            pl_profile = cookies.get("pl_profile")
-            
-            if not pl_profile:
-                raise Exception("Session cookie not found after login.")
-
-            # Clear session cookies to keep adapter clean for next request
-            self._session.cookie_jar.clear()
+            with timings.time("total"):
+                async with self._logins.session() as session:
+                    # 1. Perform Login (fills this session's cookie jar only)
+                    with timings.time("login"):
+                        await self._upstream(lambda: self._login(session, email, password))
+
+                    # 2. Fetch User Details to get Manager ID
+                    async def fetch_me():
+                        async with session.get(self._url("me/")) as resp:
+                            if resp.status != 200:
+                                raise UpstreamError("Login successful, but failed to fetch user details.", resp.status)
+                            return await resp.json()
+                    with timings.time("me"):
+                        me_data = await self._upstream(fetch_me)
+
+                    # Extract Manager ID (entry)
+                    player = me_data.get('player') or {}
+                    entry_id = player.get('entry')
+
+                    if not entry_id:
+                        raise Exception("User does not have an FPL Team (Entry ID not found).")
+
+                    # 3. Extract Cookies to return to Frontend
+                    # We filter for 'pl_profile' which is the essential auth cookie
+                    with timings.time("cookie"):
+                        cookies = session.cookie_jar.filter_cookies(self._site)
+                        pl_profile = cookies.get("pl_profile")
+
+                    if not pl_profile:
+                        raise Exception("Session cookie not found after login.")
 
             return {
                 "manager_id": entry_id,
-                "cookie": pl_profile.value 
+                "cookie": pl_profile.value
             }
 
         except Exception as e:
             logger.error(f"Login failed: {str(e)}")
-            # Ensure we clean up even on failure
-            self._session.cookie_jar.clear()
             raise e
 
     # ------------------------
-    # Private endpoints (Require Cookie Injection)
+    # Private endpoints (per-request credentials)
     # ------------------------
-    async def get_entry_picks(self, entry_id: int, event_id: int, auth_cookie: str) -> dict:
+    async def _get_json(self, url: str, auth_cookie: Optional[str] = None) -> Any:
         """
-        Fetches picks.
-        IMPORTANT: This creates a temporary session context with the user's cookie.
+        GET on the shared session. Credentials travel in this request's own
+        Cookie header; the shared session has no cookie jar state to leak.
         """
-        # 1. Inject the cookie from the frontend request into the session
-        self._session.cookie_jar.update_cookies({"pl_profile": auth_cookie})
-        
-        try:
-            # 2. Call the protected endpoint
-            # Note: We use get_entry_picks (which is generally public)
-            # BUT if you need 'my-team' (which includes bank/transfers), use:
-            # await self._session.get(f"https://fantasy.premierleague.com/api/my-team/{entry_id}/")
-            
-            picks = await self._fpl.get_entry_picks(entry_id, event_id)
-            return picks
-        finally:
-            # 3. CLEAN UP: Remove cookies so we don't leak this user's session to others
-            self._session.cookie_jar.clear()
-    
-    async def get_entry(self, entry_id: int, ttl: int = 3600) -> dict:
+        headers = {"Cookie": f"pl_profile={auth_cookie}"} if auth_cookie else None
+
+        async def fetch():
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status != 200:
+                    raise UpstreamError(f"FPL request failed: {resp.status}", resp.status)
+                return await resp.json()
+
+        return await self._upstream(fetch)
+
+    async def get_entry_picks(self, entry_id: int, event_id: int, auth_cookie: Optional[str] = None) -> Picks:
+        """
+        Fetches picks (cached per entry/event). Picks are public once the
+        deadline has passed; a user's own cookie is sent when we have it.
+        """
+        url = self._url(f"entry/{entry_id}/event/{event_id}/picks/")
+
+        async def fetch():
+            return Picks.from_api(await self._get_json(url, auth_cookie))
+
+        return await self._cached(f"picks:{entry_id}:{event_id}", fetch)
+
+    async def get_picks_bulk(
+        self, entry_ids: Iterable[int], event_id: int, concurrency: Optional[int] = None
+    ) -> Dict[int, Picks]:
+        """Picks for many managers in one gameweek; failed entries are logged and left out."""
+        picks: Dict[int, Picks] = {}
+        async for entry_id, data, error in self._iter_bulk(
+            entry_ids,
+            lambda i: f"picks:{i}:{event_id}",
+            lambda i: self.get_entry_picks(i, event_id),
+            concurrency,
+        ):
+            if error is None:
+                picks[entry_id] = data
+            else:
+                logger.warning(f"Picks fetch failed for entry {entry_id}, event {event_id}: {error}")
+        return picks
+
+    async def get_event_live(self, event_id: int) -> dict:
+        """Live stats for every player in a gameweek (event/{id}/live); archived once the gameweek is final."""
+        url = self._url(f"event/{event_id}/live/")
+        return await self._archived(f"live:{event_id}", lambda: self._get_json(url), lambda: self.event_finished(event_id))
+
+    async def get_fixtures(self, event_id: int) -> list:
+        """A gameweek's fixtures with scores; archived once the gameweek is final."""
+        url = self._url(f"fixtures/?event={event_id}")
+        return await self._archived(f"fixtures:{event_id}", lambda: self._get_json(url), lambda: self.event_finished(event_id))
+
+    async def current_event_id(self) -> Optional[int]:
+        """The gameweek FPL marks as current in bootstrap-static."""
+        data = await self.bootstrap_static()
+        return next((e["id"] for e in data.get("events", []) if e.get("is_current")), None)
+
+    async def _event(self, event_id: int) -> Optional[dict]:
+        data = await self.bootstrap_static()
+        return next((e for e in data.get("events", []) if e.get("id") == event_id), None)
+
+    async def deadline_passed(self, event_id: int) -> bool:
+        """Picks for a gameweek are frozen once its deadline has passed."""
+        event = await self._event(event_id)
+        deadline = parse_deadline(event.get("deadline_time")) if event else None
+        return deadline is not None and deadline <= datetime.now(timezone.utc)
+
+    async def event_finished(self, event_id: int) -> bool:
+        """Finished and data-checked (bonus points confirmed): its live data and results are final."""
+        event = await self._event(event_id)
+        return bool(event and event.get("finished") and event.get("data_checked"))
+
+    async def last_deadline_event_id(self) -> Optional[int]:
+        """The most recent gameweek whose deadline has passed."""
+        data = await self.bootstrap_static()
+        now = datetime.now(timezone.utc)
+        passed = [e["id"] for e in data.get("events", []) if (d := parse_deadline(e.get("deadline_time"))) is not None and d <= now]
+        return max(passed, default=None)
+
+    async def get_entry(self, entry_id: int, ttl: Optional[int] = None) -> Entry:
         """
         Gets public data for a specific FPL manager ID.
         This is public data and can be cached aggressively.
         """
-        cache_key = f"entry-{entry_id}"
-        cached_data = await _cache.get(cache_key)
-
-        if cached_data:
-            return cached_data
+        async def fetch():
+            return Entry.from_api(await self._get_json(self._url(f"entry/{entry_id}/")))
 
         try:
-            # Use the underlying FPL client method
-            entry = await self._fpl.get_entry(entry_id)
-            # Convert the FPL object to a dictionary for FastAPI response and caching
-            entry_data = entry.__dict__ 
-
-            # Cache the result for 1 hour (public data)
-            await _cache.set(cache_key, entry_data, ttl_seconds=ttl) 
-            return entry_data
+            # Cached under the namespace TTL (long outside deadlines, public data)
+            return await self._cached(f"entry:{entry_id}", fetch, ttl)
         except Exception as e:
             logger.error(f"FPL API error fetching entry {entry_id}: {e}")
             # Raising a generic exception for the router to catch and re-raise as 404/500
             raise Exception(f"FPL Entry fetch failed: {e}")
 
+    async def get_entry_history(self, entry_id: int) -> History:
+        """A manager's season so far, past seasons and chips (entry/{id}/history/)."""
+        async def fetch():
+            return History.from_api(await self._get_json(self._url(f"entry/{entry_id}/history/")))
+
+        return await self._cached(f"history:{entry_id}", fetch)
+
+    async def _iter_bulk(
+        self,
+        keys: Iterable[int],
+        cache_key: Callable[[int], str],
+        fetch: Callable[[int], Awaitable[Any]],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[tuple[int, Any, Optional[str]]]:
+        """
+        Yields (key, data, error) for many ids as results become available:
+        cache hits first, then misses as they arrive, fetched concurrently
+        with at most `concurrency` upstream calls at once.
+        """
+        ids = list(dict.fromkeys(keys))  # de-duplicate, keep order
+        misses = []
+        for i in ids:
+            cached = await self._cache.get(cache_key(i))
+            if cached is not None:
+                yield i, cached, None
+            else:
+                misses.append(i)
+        if not misses:
+            return
+
+        sem = asyncio.Semaphore(concurrency or settings.FPL_BULK_CONCURRENCY)
+
+        async def fetch_one(i: int):
+            async with sem:
+                try:
+                    return i, await fetch(i), None
+                except Exception as e:
+                    return i, None, str(e)
+
+        tasks = [asyncio.ensure_future(fetch_one(i)) for i in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # the consumer went away (e.g. client disconnected mid-stream)
+            for t in tasks:
+                t.cancel()
+
+    def iter_entries(
+        self, entry_ids: Iterable[int], concurrency: Optional[int] = None
+    ) -> AsyncIterator[tuple[int, Optional[Entry], Optional[str]]]:
+        """Yields (entry_id, data, error) for many managers as results become available."""
+        return self._iter_bulk(entry_ids, lambda i: f"entry:{i}", self.get_entry, concurrency)
+
+    async def get_entries(self, entry_ids: Iterable[int], concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Bulk get_entry: {"entries": {id: data}, "errors": {id: message}}."""
+        entries: Dict[int, Any] = {}
+        errors: Dict[int, str] = {}
+        async for entry_id, data, error in self.iter_entries(entry_ids, concurrency):
+            if error is None:
+                entries[entry_id] = data
+            else:
+                errors[entry_id] = error
+        return {"entries": entries, "errors": errors}
+
     async def get_my_team(self, entry_id: int, auth_cookie: str) -> dict:
         """
         Wrapper for the /my-team/ endpoint which requires Auth.
         The fpl library doesn't strictly have a 'get_my_team' that returns the transfer info,
         so we use the session directly.
         """
-        self._session.cookie_jar.update_cookies({"pl_profile": auth_cookie})
-        
+        url = self._url(f"my-team/{entry_id}/")
+        # only callers holding the same credentials share a flight: one user's response
+        # (or 401) must never reach a request made with another user's cookie
+        credential = hashlib.sha256(auth_cookie.encode()).hexdigest()[:16]
         try:
-            url = f"https://fantasy.premierleague.com/api/my-team/{entry_id}/"
-            async with self._session.get(url) as resp:
-                if resp.status != 200:
-                    raise Exception(f"Failed to get team: {resp.status}")
-                return await resp.json()
-        finally:
-            self._session.cookie_jar.clear()
\ No newline at end of file
+            return await self._flights.do(
+                f"my-team:{entry_id}:{credential}", lambda: self._get_json(url, auth_cookie)
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get team: {e}")
@@ -0,0 +1,209 @@
+# app/services/jobs.py
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.admin.enums import JobStatus
+from app.db.jobs import crud as jobs_crud
+from app.db.jobs.models import Job
+from app.db.leagues import crud as leagues_crud
+from app.db.payments.service import PaymentsService
+from app.services.fpl_adapter import FPLAdapter
+from app.services.live import StandingsHub, publish_league
+from app.services.scoring import update_standings
+
+logger = logging.getLogger(__name__)
+
+# handler(db, payload) -> result stored on the job (JSON-able dict or None)
+JobHandler = Callable[[AsyncSession, dict], Awaitable[Optional[dict]]]
+
+
+class JobRunner:
+    """
+    Runs jobs from the `jobs` table with `concurrency` worker tasks per
+    process. Each worker claims the oldest due job, runs its handler in a
+    fresh session and records the outcome. A handler that raises is retried
+    with exponential backoff (plus jitter) until the job's max_attempts,
+    except for ValueError, which means the job can never succeed (no pot to
+    pay out, a tie for first) and fails it at once. Jobs left `running` for
+    longer than `stale_after` seconds, because their worker died or was
+    stopped mid-job, are requeued. `recurring` maps job kinds to an interval:
+    start() queues one run of each (deduplicated on the kind, so every
+    process can do it), and whichever worker finishes a run queues the next
+    `interval` seconds later, so the deployment runs it once per interval
+    without any process polling for it. With `delay_first` (STARTUP_MODE=lazy)
+    the first run also waits an interval, so starting a worker fetches
+    nothing upstream. Started and stopped by the app lifespan, like
+    BackgroundRefresher.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0,
+        stale_after: float = 900.0,
+        recurring: Optional[Dict[str, float]] = None,
+        delay_first: bool = False,
+    ):
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stale_after = stale_after
+        self.recurring = recurring or {}
+        self.delay_first = delay_first
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._next_reap = 0.0
+        self.counts: Counter = Counter()
+        self.failures = 0
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _execute(self, job: Job):
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as db:
+                result = await self.handlers[job.kind](db, job.payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            retry_at = None if isinstance(e, ValueError) else (
+                datetime.now(timezone.utc) + timedelta(seconds=self.backoff(job.attempts))
+            )
+            async with self.session_factory() as db:
+                status = await jobs_crud.mark_failed(db, job.id, error, retry_at)
+            self.counts["retried" if status == JobStatus.queued else "failed"] += 1
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed: {error}")
+            if status == JobStatus.failed:
+                await self._schedule_next(job.kind)
+            return
+        async with self.session_factory() as db:
+            await jobs_crud.mark_succeeded(db, job.id, result)
+        self.counts["succeeded"] += 1
+        logger.info(f"Job {job.id} ({job.kind}) done in {time.perf_counter() - started:.2f}s")
+        await self._schedule_next(job.kind)
+
+    async def _schedule_next(self, kind: str, delay: Optional[float] = None):
+        """Queue the next run of a recurring kind, `delay` (default: its interval) from now."""
+        if kind not in self.recurring:
+            return
+        async with self.session_factory() as db:
+            await jobs_crud.enqueue(
+                db, kind, {}, dedup_key=kind, max_attempts=settings.JOB_MAX_ATTEMPTS,
+                delay=self.recurring[kind] if delay is None else delay,
+            )
+            await db.commit()
+
+    async def schedule_recurring(self):
+        """Queue the first run of every recurring kind unless one is already queued or running."""
+        for kind in self.recurring:
+            await self._schedule_next(kind, None if self.delay_first else 0)
+
+    async def run_once(self) -> bool:
+        """Claim and run one due job; False when there was nothing to do."""
+        if time.monotonic() >= self._next_reap:
+            self._next_reap = time.monotonic() + self.stale_after / 4
+            async with self.session_factory() as db:
+                if requeued := await jobs_crud.requeue_stale(db, self.stale_after):
+                    self.counts["requeued"] += requeued
+                    logger.warning(f"Requeued {requeued} stale job(s)")
+        async with self.session_factory() as db:
+            job = await jobs_crud.claim_next(db, self.worker_id, self.handlers)
+        if job is None:
+            return False
+        await self._execute(job)
+        return True
+
+    async def _worker(self):
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Job worker error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _first_worker(self):
+        try:
+            await self.schedule_recurring()
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Scheduling recurring jobs failed: {e}")
+        await self._worker()
+
+    def start(self):
+        if not self._tasks and self.concurrency > 0:
+            self._tasks = [asyncio.create_task(self._first_worker())] + [
+                asyncio.create_task(self._worker()) for _ in range(self.concurrency - 1)
+            ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {"worker_id": self.worker_id, "workers": len(self._tasks), "failures": self.failures, **self.counts}
+
+
+async def league_leader(db: AsyncSession, league_id: int) -> int:
+    """The single member ranked first at the league's latest materialized gameweek."""
+    gameweek = await leagues_crud.latest_standings_gameweek(db, league_id)
+    if gameweek is None:
+        raise ValueError(f"League {league_id} has no standings")
+    top = await leagues_crud.get_standings(db, league_id, gameweek, limit=2)
+    if len(top) > 1 and top[1][0].rank == 1:
+        raise ValueError(f"League {league_id} is tied for first at GW{gameweek}")
+    return top[0][0].user_id
+
+
+def league_job_handlers(adapter: FPLAdapter, hub: StandingsHub) -> Dict[str, JobHandler]:
+    """Handlers for the admin league jobs, bound to this process's adapter and hub."""
+
+    async def recalculate(db: AsyncSession, payload: dict) -> dict:
+        event_id = payload["event_id"]
+        written = await update_standings(db, adapter, event_id, league_ids=payload.get("league_ids"))
+        # only this process's subscribers; other workers' publishers pick the change up on their next tick
+        for league_id in hub.active_leagues():
+            if written.get(league_id):
+                await publish_league(hub, db, league_id, event_id)
+        return {"event_id": event_id, "rows_written": {str(k): v for k, v in written.items()}}
+
+    async def payout(db: AsyncSession, payload: dict) -> dict:
+        league_id = payload["league_id"]
+        winner = payload.get("winner_user_id") or await league_leader(db, league_id)
+        tx = await PaymentsService({}).payout_winner(db, league_id=league_id, winner_user_id=winner)
+        return {"league_id": league_id, "winner_user_id": winner, "transaction_id": tx.id, "amount_cents": tx.amount_cents}
+
+    return {"recalculate": recalculate, "payout": payout}
+
+
+async def enqueue_job(db: AsyncSession, kind: str, payload: dict, dedup_key: Optional[str] = None, **kw: Any) -> tuple[Job, bool]:
+    """crud.enqueue plus the commit, with max_attempts from settings."""
+    kw.setdefault("max_attempts", settings.JOB_MAX_ATTEMPTS)
+    job, created = await jobs_crud.enqueue(db, kind, payload, dedup_key=dedup_key, **kw)
+    await db.commit()
+    await db.refresh(job)
+    return job, created
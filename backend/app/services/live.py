@@ -0,0 +1,265 @@
+# app/services/live.py
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.jobs import crud as jobs_crud
+from app.db.jobs.models import ACTIVE_STATUSES
+from app.db.leagues import crud
+from app.services.fpl_adapter import FPLAdapter
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def sse_message(event: str, version: int, data: dict) -> bytes:
+    body = json.dumps(data, separators=(",", ":"), default=str)
+    return f"id: {version}\nevent: {event}\ndata: {body}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """
+    One connected client. Holds references to messages the channel already
+    serialized (never copies them) in a queue capped at `max_bytes`. A client
+    that falls that far behind loses its backlog and gets the latest snapshot
+    instead, so a slow reader costs at most one snapshot of memory and never
+    holds up the publisher or the other subscribers.
+    """
+
+    def __init__(self, channel: "LeagueChannel", max_bytes: int):
+        self.channel = channel
+        self.max_bytes = max_bytes
+        self._queue: deque[bytes] = deque()
+        self._buffered = 0
+        self._ready = asyncio.Event()
+        self.resyncs = 0
+
+    def offer(self, message: bytes):
+        if self._queue and self._buffered + len(message) > self.max_bytes:
+            self._queue.clear()
+            self._buffered = 0
+            self.resyncs += 1
+            self.channel.hub.resyncs += 1
+            message = self.channel.snapshot_message()
+        self._queue.append(message)
+        self._buffered += len(message)
+        self._ready.set()
+
+    async def messages(self, heartbeat: float = 15.0) -> AsyncIterator[bytes]:
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    # lets proxies keep the connection open and surfaces dead clients
+                    yield HEARTBEAT
+                    continue
+            message = self._queue.popleft()
+            self._buffered -= len(message)
+            yield message
+
+
+class LeagueChannel:
+    """Last published standings for one league, and everyone watching it."""
+
+    def __init__(self, hub: "StandingsHub", league_id: int):
+        self.hub = hub
+        self.league_id = league_id
+        self.gameweek: Optional[int] = None
+        self.version = 0
+        self.rows: Dict[int, dict] = {}
+        self.subscribers: Set[Subscription] = set()
+        self._snapshot: Optional[bytes] = None
+
+    def snapshot_message(self) -> bytes:
+        # serialized at most once per version, however many clients (re)join
+        if self._snapshot is None:
+            self._snapshot = sse_message("snapshot", self.version, {
+                "league_id": self.league_id,
+                "gameweek": self.gameweek,
+                "version": self.version,
+                "standings": sorted(self.rows.values(), key=lambda r: (r["rank"], r["user_id"])),
+            })
+        return self._snapshot
+
+
+class StandingsHub:
+    """
+    Per-league fan-out for live standings. `publish` diffs the new standings
+    against the last ones once, encodes the diff once, and hands the same
+    bytes to every subscriber of that league.
+    """
+
+    def __init__(self, max_buffer_bytes: int = 256 * 1024):
+        self.max_buffer_bytes = max_buffer_bytes
+        self._channels: Dict[int, LeagueChannel] = {}
+        self.published = 0
+        self.messages_sent = 0
+        self.resyncs = 0
+
+    def channel(self, league_id: int) -> LeagueChannel:
+        ch = self._channels.get(league_id)
+        if ch is None:
+            ch = self._channels[league_id] = LeagueChannel(self, league_id)
+        return ch
+
+    def active_leagues(self) -> List[int]:
+        return [league_id for league_id, ch in self._channels.items() if ch.subscribers]
+
+    def subscribe(self, league_id: int) -> Subscription:
+        ch = self.channel(league_id)
+        sub = Subscription(ch, self.max_buffer_bytes)
+        ch.subscribers.add(sub)
+        if ch.version:
+            sub.offer(ch.snapshot_message())
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        ch = sub.channel
+        ch.subscribers.discard(sub)
+        if not ch.subscribers:
+            # nobody is watching: drop the cached rows rather than keep every league in memory
+            self._channels.pop(ch.league_id, None)
+
+    def publish(self, league_id: int, gameweek: int, standings: List[dict]) -> int:
+        """Returns the number of rows that changed (0 means nothing was sent)."""
+        ch = self.channel(league_id)
+        rows = {r["user_id"]: r for r in standings}
+        if gameweek != ch.gameweek:
+            changed, removed = list(rows.values()), []
+            event = "snapshot"
+        else:
+            changed = [r for uid, r in rows.items() if ch.rows.get(uid) != r]
+            removed = [uid for uid in ch.rows if uid not in rows]
+            event = "diff"
+        if not changed and not removed:
+            return 0
+
+        ch.gameweek, ch.rows, ch.version = gameweek, rows, ch.version + 1
+        ch._snapshot = None
+        if event == "snapshot":
+            message = ch.snapshot_message()
+        else:
+            message = sse_message("diff", ch.version, {
+                "league_id": league_id,
+                "gameweek": gameweek,
+                "version": ch.version,
+                "changed": changed,
+                "removed": removed,
+            })
+        for sub in ch.subscribers:
+            sub.offer(message)
+        self.published += 1
+        self.messages_sent += len(ch.subscribers)
+        return len(changed) + len(removed)
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(ch.subscribers) for ch in self._channels.values()),
+            "published": self.published,
+            "messages_sent": self.messages_sent,
+            "resyncs": self.resyncs,
+            "buffered_bytes": sum(s._buffered for ch in self._channels.values() for s in ch.subscribers),
+        }
+
+
+async def publish_league(hub: StandingsHub, db: AsyncSession, league_id: int, gameweek: Optional[int] = None) -> int:
+    """Read a league's materialized standings and push whatever changed."""
+    if gameweek is None:
+        gameweek = await crud.latest_standings_gameweek(db, league_id)
+        if gameweek is None:
+            return 0
+    rows = await crud.get_standings(db, league_id, gameweek, limit=None)
+    return hub.publish(league_id, gameweek, [
+        {"user_id": s.user_id, "username": username, "event_points": s.event_points,
+         "total_points": s.total_points, "rank": s.rank}
+        for s, username in rows
+    ])
+
+
+class StandingsPublisher:
+    """
+    While anyone is subscribed, push each watched league's stored standings
+    every `interval` seconds, as diffs against what this worker sent last.
+    Workers never write standings here: for each watched league they queue
+    a `recalculate` job for the current gameweek (deduplicated per league
+    with the admin single-league recalculate, and queued `interval` after
+    the previous run finished), so the JobRunner rescores and writes each
+    watched league once per live update however many workers have viewers
+    of it, and every worker reads the result. Unwatched leagues are left alone. With `delay_first`
+    (STARTUP_MODE=lazy) the first tick waits an interval. Started and stopped
+    by the app lifespan, like BackgroundRefresher.
+    """
+
+    def __init__(
+        self,
+        hub: StandingsHub,
+        adapter: FPLAdapter,
+        session_factory: Callable[[], AsyncSession],
+        interval: float = 15.0,
+        delay_first: bool = False,
+    ):
+        self.hub = hub
+        self.adapter = adapter
+        self.session_factory = session_factory
+        self.interval = interval
+        self.delay_first = delay_first
+        self._task: Optional[asyncio.Task] = None
+        self.failures = 0
+
+    async def _queue_rescore(self, db: AsyncSession, event_id: int, league_ids: Iterable[int]):
+        for league_id in league_ids:
+            # same key as the admin single-league recalculate, so either one covers the other
+            key = f"recalculate:{league_id}:{event_id}"
+            last = await jobs_crud.latest_job(db, key)
+            if last is not None and last.status in ACTIVE_STATUSES:
+                continue
+            # a failed live rescore is not retried: the next tick queues a fresh one
+            await jobs_crud.enqueue(
+                db, "recalculate", {"event_id": event_id, "league_ids": [league_id]}, dedup_key=key,
+                max_attempts=1, delay=0 if last is None else self.interval,
+            )
+        await db.commit()
+
+    async def run_once(self):
+        league_ids = self.hub.active_leagues()
+        if not league_ids:
+            return
+        event_id = await self.adapter.current_event_id()
+        if event_id is None:
+            return
+        async with self.session_factory() as db:
+            await self._queue_rescore(db, event_id, league_ids)
+            for league_id in league_ids:
+                await publish_league(self.hub, db, league_id, event_id)
+
+    async def _loop(self):
+        if self.delay_first:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Live standings update failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,122 @@
+# app/services/login.py
+from __future__ import annotations
+import asyncio
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+import aiohttp
+
+
+class LoginPoolExhausted(Exception):
+    """Every login session stayed busy for longer than the pool's acquire timeout."""
+
+
+class StageTimings:
+    """Durations of the named stages of a multi-step call, over the last `window` samples each."""
+
+    def __init__(self, window: int = 512):
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._outcomes: Dict[str, Counter] = defaultdict(Counter)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self._samples[stage].append(time.perf_counter() - started)
+            self._outcomes[stage][outcome] += 1
+
+    def stats(self) -> dict:
+        out = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+            out[stage] = {**self._outcomes[stage], "p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": pick(1.0)}
+        return out
+
+
+class LoginSessionPool:
+    """
+    Bounded pool of ClientSessions for FPL logins. Each session has its own
+    cookie jar and is checked out by exactly one login attempt at a time, so
+    concurrent logins never see each other's cookies; the jar is cleared when
+    the session comes back, and the session (with its warm keep-alive
+    connections to FPL) is reused by the next attempt. At most `size` logins
+    run at once; the rest wait up to `acquire_timeout` seconds for a session.
+    `timings` records the "acquire" stage here; callers time the stages of
+    their own work into it too. Once close() has run, sessions still checked
+    out are closed as they come back and new checkouts are refused.
+    """
+
+    def __init__(
+        self,
+        size: int = 8,
+        acquire_timeout: float = 10.0,
+        factory: Optional[Callable[[], aiohttp.ClientSession]] = None,
+    ):
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self._factory = factory or (lambda: aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar()))
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[aiohttp.ClientSession] = []
+        self._in_use = 0
+        self.closed = False
+        self._counts: Counter = Counter()
+        self.timings = StageTimings()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        if self.closed:
+            raise LoginPoolExhausted("FPL login pool is closed")
+        with self.timings.time("acquire"):
+            if not self._slots.locked():
+                await self._slots.acquire()  # a slot is free: returns without suspending
+            else:
+                self._counts["waited"] += 1
+                try:
+                    await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+                except asyncio.TimeoutError:
+                    self._counts["timeouts"] += 1
+                    raise LoginPoolExhausted(f"No FPL login session free within {self.acquire_timeout}s")
+        session = None
+        try:
+            while self._idle and session is None:
+                candidate = self._idle.pop()
+                session = None if candidate.closed else candidate
+            if session is None:
+                session = self._factory()
+                self._counts["created"] += 1
+            else:
+                self._counts["reused"] += 1
+            self._in_use += 1
+            self._counts["peak_in_use"] = max(self._counts["peak_in_use"], self._in_use)
+            try:
+                yield session
+            finally:
+                self._in_use -= 1
+                session.cookie_jar.clear()
+                if self.closed:
+                    await session.close()  # checked out when the pool shut down
+                elif not session.closed:
+                    self._idle.append(session)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        self.closed = True
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await session.close()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            **self._counts,
+            "stages": self.timings.stats(),
+        }
@@ -0,0 +1,138 @@
+# app/services/players.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+# numeric columns kept per player, with the dtype used to store them
+# (FPL sends form/ownership/ppg as strings; prices are integer tenths of £m)
+COLUMNS: Dict[str, Any] = {
+    "id": np.int32,
+    "team": np.int16,
+    "element_type": np.int8,
+    "now_cost": np.int16,
+    "total_points": np.int16,
+    "event_points": np.int16,
+    "minutes": np.int32,
+    "form": np.float32,
+    "points_per_game": np.float32,
+    "selected_by_percent": np.float32,
+}
+SORTABLE = tuple(c for c in COLUMNS if c not in ("id", "team", "element_type"))
+
+
+def _num(v: Any) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PlayerStore:
+    """
+    Columnar, indexed view of one bootstrap-static snapshot.
+
+    Built once per snapshot: numeric fields become NumPy columns, names and
+    status stay in small Python lists, and we keep hash indexes by element id
+    and by team. Lookups are O(1) and a filtered query only touches the
+    columns it filters/sorts on (a few KB for ~700 players) instead of the
+    ~1.5 MB raw document.
+    """
+
+    def __init__(self, elements: List[dict], element_types: Optional[List[dict]] = None, teams: Optional[List[dict]] = None):
+        n = len(elements)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.fromiter((_num(e.get(name)) for e in elements), dtype=dtype, count=n)
+            for name, dtype in COLUMNS.items()
+        }
+        self.web_name: List[str] = [e.get("web_name", "") for e in elements]
+        self.status: List[str] = [e.get("status", "") for e in elements]
+
+        self.positions: Dict[str, int] = {
+            t["singular_name_short"]: t["id"] for t in (element_types or []) if "singular_name_short" in t
+        }
+        self.team_names: Dict[int, str] = {t["id"]: t.get("short_name", t.get("name", "")) for t in (teams or [])}
+
+        self._row_by_id: Dict[int, int] = {int(pid): row for row, pid in enumerate(self.columns["id"])}
+        self._rows_by_team: Dict[int, np.ndarray] = {
+            int(team): np.flatnonzero(self.columns["team"] == team) for team in np.unique(self.columns["team"])
+        }
+
+    @classmethod
+    def from_bootstrap(cls, data: dict) -> "PlayerStore":
+        return cls(data.get("elements", []), data.get("element_types"), data.get("teams"))
+
+    def __len__(self) -> int:
+        return len(self.web_name)
+
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+    def _record(self, row: int) -> dict:
+        rec = {name: col[row].item() for name, col in self.columns.items()}
+        rec["web_name"] = self.web_name[row]
+        rec["status"] = self.status[row]
+        rec["team_name"] = self.team_names.get(rec["team"])
+        return rec
+
+    def position_id(self, position: str | int) -> int:
+        if isinstance(position, int) or str(position).isdigit():
+            return int(position)
+        try:
+            return self.positions[str(position).upper()]
+        except KeyError:
+            raise ValueError(f"Unknown position: {position}")
+
+    def row(self, element_id: int) -> Optional[int]:
+        return self._row_by_id.get(element_id)
+
+    def get(self, element_id: int) -> Optional[dict]:
+        row = self.row(element_id)
+        return None if row is None else self._record(row)
+
+    def by_team(self, team_id: int) -> List[dict]:
+        return [self._record(r) for r in self._rows_by_team.get(team_id, ())]
+
+    def query(
+        self,
+        *,
+        position: str | int | None = None,
+        team: int | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_minutes: int | None = None,
+        sort: str = "total_points",
+        desc: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[dict]:
+        """Filter, sort and slice. Prices are in £m (e.g. 7.5), as shown in the game."""
+        if sort not in SORTABLE:
+            raise ValueError(f"Cannot sort by {sort}; choose one of {', '.join(SORTABLE)}")
+
+        # start from the team index when we have one, so we never scan everyone
+        rows = self._rows_by_team.get(team, np.empty(0, dtype=np.intp)) if team is not None else np.arange(len(self))
+        mask = np.ones(len(rows), dtype=bool)
+        if position is not None:
+            mask &= self.columns["element_type"][rows] == self.position_id(position)
+        if min_price is not None:
+            mask &= self.columns["now_cost"][rows] >= round(min_price * 10)
+        if max_price is not None:
+            mask &= self.columns["now_cost"][rows] <= round(max_price * 10)
+        if min_minutes is not None:
+            mask &= self.columns["minutes"][rows] >= min_minutes
+        rows = rows[mask]
+
+        keys = self.columns[sort][rows]
+        if desc:
+            keys = -keys.astype(np.float64)
+        # only fully sort what we return: partition down to the top (offset+limit) first
+        k = offset + limit
+        if k < len(rows):
+            part = np.argpartition(keys, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+            order = part[np.argsort(keys[part], kind="stable")]
+        else:
+            order = np.argsort(keys, kind="stable")
+        return [self._record(r) for r in rows[order[offset:k]]]
+
+    def top(self, metric: str = "total_points", n: int = 10, position: str | int | None = None) -> List[dict]:
+        return self.query(position=position, sort=metric, desc=True, limit=n)
@@ -0,0 +1,98 @@
+# app/services/prefetch.py
+from __future__ import annotations
+import logging
+import time
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.auth.models import User
+from app.db.fpl import crud as fpl_crud
+from app.services.fpl_adapter import FPLAdapter
+from app.services.records import Picks, as_dict
+
+logger = logging.getLogger(__name__)
+
+# job kind the prefetch itself runs as; see PicksPrefetcher
+PREFETCH_JOB = "prefetch_picks"
+
+
+def _plain(picks: Dict[int, Picks | dict]) -> Dict[int, dict]:
+    """Picks records as plain dicts for the JSON column."""
+    return {entry_id: as_dict(p) for entry_id, p in picks.items()}
+
+
+async def load_picks(
+    db: AsyncSession, adapter: FPLAdapter, entry_ids: Iterable[int], event_id: int, concurrency: Optional[int] = None
+) -> Dict[int, Picks | dict]:
+    """
+    Picks for many managers: stored picks first, the rest from the adapter.
+    Fetched picks are stored permanently when the gameweek's deadline has
+    passed, so past gameweeks only ever go upstream once per manager.
+    Stored picks come back as plain dicts; PicksMatrix accepts either.
+    """
+    ids = set(entry_ids)
+    picks = await fpl_crud.get_stored_picks(db, ids, event_id)
+    missing = ids - picks.keys()
+    if missing:
+        fetched = await adapter.get_picks_bulk(missing, event_id, concurrency)
+        if fetched and await adapter.deadline_passed(event_id):
+            await fpl_crud.store_picks(db, event_id, _plain(fetched))
+            await db.commit()
+        picks.update(fetched)
+    return picks
+
+
+async def get_picks(
+    db: AsyncSession, adapter: FPLAdapter, entry_id: int, event_id: int, auth_cookie: Optional[str] = None
+) -> Picks | dict:
+    """Single-manager load_picks that can send the manager's own cookie."""
+    stored = await fpl_crud.get_stored_picks(db, [entry_id], event_id)
+    if entry_id in stored:
+        return stored[entry_id]
+    data = await adapter.get_entry_picks(entry_id, event_id, auth_cookie)
+    if await adapter.deadline_passed(event_id):
+        await fpl_crud.store_picks(db, event_id, _plain({entry_id: data}))
+        await db.commit()
+    return data
+
+
+class PicksPrefetcher:
+    """
+    Once a gameweek's deadline passes, fetch and store every linked manager's
+    picks through a bounded pool, so scoring and /fpl/my-picks read them from
+    the database. Runs as the recurring `prefetch_picks` job (see JobRunner's
+    `recurring`), so the deployment checks once per interval, wherever the
+    job is claimed, and no worker polls for it. Each run only fetches
+    managers not stored yet for the latest deadline; once nobody is missing,
+    a run costs two queries and no upstream call.
+    """
+
+    def __init__(self, adapter: FPLAdapter, concurrency: int = 8):
+        self.adapter = adapter
+        self.concurrency = concurrency
+
+    async def prefetch(self, db: AsyncSession, event_id: int) -> Dict[str, int]:
+        started = time.perf_counter()
+        linked = set((await db.execute(
+            select(User.fpl_manager_id).where(User.fpl_manager_id.is_not(None))
+        )).scalars().all())
+        missing = linked - await fpl_crud.stored_entry_ids(db, event_id)
+        stored = failed = 0
+        if missing:
+            fetched = await self.adapter.get_picks_bulk(missing, event_id, self.concurrency)
+            stored = await fpl_crud.store_picks(db, event_id, _plain(fetched))
+            await db.commit()
+            # rows another writer stored first are not failures
+            failed = len(missing) - len(fetched)
+            logger.info(
+                f"GW{event_id} picks prefetch: {stored} stored, {failed} failed "
+                f"of {len(linked)} linked in {time.perf_counter() - started:.2f}s"
+            )
+        return {"linked": len(linked), "fetched": stored, "failed": failed}
+
+    async def handle(self, db: AsyncSession, payload: dict) -> Dict[str, int | None]:
+        """JobRunner handler for PREFETCH_JOB: prefetch the latest deadline's picks."""
+        event_id = await self.adapter.last_deadline_event_id()
+        if event_id is None:
+            return {"event_id": None}
+        return {"event_id": event_id, **await self.prefetch(db, event_id)}
@@ -0,0 +1,143 @@
+# app/services/projections.py
+from __future__ import annotations
+from typing import Dict, List, Optional
+import numpy as np
+from app.services.players import PlayerStore, _num
+
+# weight of recent form (points per match over the last 30 days) against season points per game
+FORM_WEIGHT = 0.6
+# each step of fixture difficulty (1-5, 3 is neutral) scales a fixture's expected points by this much
+DIFFICULTY_STEP = 0.1
+HOME_ADVANTAGE = 0.05
+# statuses that rule a player out of the next gameweek; "d" (doubtful) uses chance_of_playing_next_round
+UNAVAILABLE = ("i", "s", "u", "n")
+SORTS = ("total", "next")
+
+
+def upcoming_events(data: dict, horizon: int) -> List[int]:
+    """Ids of the next `horizon` gameweeks in the snapshot, starting at the one marked is_next."""
+    events = sorted(e["id"] for e in data.get("events", []))
+    start = next((e["id"] for e in data.get("events", []) if e.get("is_next")), None)
+    return [] if start is None else [e for e in events if e >= start][:horizon]
+
+
+class ProjectionTable:
+    """
+    Expected points for every player over the next gameweeks, as one
+    (players x gameweeks) float32 matrix.
+
+    Per player, a points-per-appearance rate (form blended with points per
+    game) is scaled by the share of minutes played so far and by availability.
+    Per team and gameweek, each fixture contributes a multiplier from its
+    difficulty and venue; doubles add up and blanks are zero. The projection
+    is the outer product of the two, gathered by team, so a full build is a
+    handful of array operations over ~700 x 6 values. Built once per
+    bootstrap snapshot through FPLAdapter._derive.
+    """
+
+    def __init__(self, store: PlayerStore, events: List[int], points: np.ndarray):
+        self.store = store
+        self.events = events
+        self.points = points
+        self.total = points.sum(axis=1)
+
+    @classmethod
+    def build(cls, data: dict, store: PlayerStore, fixtures: Dict[int, list], events: List[int]) -> "ProjectionTable":
+        elements = data.get("elements", [])
+        n, h = len(store), len(events)
+        cols = store.columns
+
+        rate = FORM_WEIGHT * cols["form"] + (1 - FORM_WEIGHT) * cols["points_per_game"]
+        played = max(1, sum(1 for e in data.get("events", []) if e.get("finished")))
+        minutes_share = np.clip(cols["minutes"] / (90.0 * played), 0.0, 1.0)
+
+        status = np.array(store.status, dtype="U1") if n else np.empty(0, dtype="U1")
+        chance = np.fromiter(
+            (_num(e.get("chance_of_playing_next_round")) if e.get("chance_of_playing_next_round") is not None else 100.0
+             for e in elements),
+            dtype=np.float32, count=n,
+        ) / 100.0
+        available = np.where(np.isin(status, UNAVAILABLE), 0.0, np.where(status == "d", chance, 1.0))
+        # ruled-out players are assumed to get halfway back to full fitness each week after the next
+        recovery = 1.0 - 0.5 ** np.arange(h, dtype=np.float32)
+        availability = available[:, None] + (1.0 - available[:, None]) * recovery[None, :]
+
+        teams = int(cols["team"].max(initial=0)) + 1
+        multiplier = np.zeros((teams, h), dtype=np.float32)
+        for j, event_id in enumerate(events):
+            fx = [f for f in fixtures.get(event_id, []) if f.get("team_h") is not None and f.get("team_a") is not None]
+            if not fx:
+                continue
+            home = np.array([f["team_h"] for f in fx], dtype=np.intp)
+            away = np.array([f["team_a"] for f in fx], dtype=np.intp)
+            home_fdr = np.array([f.get("team_h_difficulty") or 3 for f in fx], dtype=np.float32)
+            away_fdr = np.array([f.get("team_a_difficulty") or 3 for f in fx], dtype=np.float32)
+            keep_h, keep_a = home < teams, away < teams
+            np.add.at(multiplier[:, j], home[keep_h], (1 + DIFFICULTY_STEP * (3 - home_fdr) + HOME_ADVANTAGE)[keep_h])
+            np.add.at(multiplier[:, j], away[keep_a], (1 + DIFFICULTY_STEP * (3 - away_fdr) - HOME_ADVANTAGE)[keep_a])
+
+        per_match = (rate * minutes_share).astype(np.float32)
+        points = per_match[:, None] * availability.astype(np.float32) * multiplier[cols["team"].astype(np.intp)]
+        return cls(store, events, points.astype(np.float32))
+
+    def _record(self, row: int, gameweeks: int) -> dict:
+        cols = self.store.columns
+        expected = self.points[row, :gameweeks]
+        return {
+            "id": int(cols["id"][row]),
+            "web_name": self.store.web_name[row],
+            "team": int(cols["team"][row]),
+            "team_name": self.store.team_names.get(int(cols["team"][row])),
+            "element_type": int(cols["element_type"][row]),
+            "now_cost": int(cols["now_cost"][row]),
+            "status": self.store.status[row],
+            "expected": {str(e): round(float(p), 2) for e, p in zip(self.events, expected)},
+            "total": round(float(expected.sum()), 2),
+        }
+
+    def get(self, element_id: int, gameweeks: Optional[int] = None) -> Optional[dict]:
+        row = self.store.row(element_id)
+        return None if row is None else self._record(row, gameweeks or len(self.events))
+
+    def query(
+        self,
+        *,
+        gameweeks: Optional[int] = None,
+        position: str | int | None = None,
+        team: int | None = None,
+        max_price: float | None = None,
+        sort: str = "total",
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[dict]:
+        """Players ranked by expected points over the first `gameweeks` projected (all by default)."""
+        if sort not in SORTS:
+            raise ValueError(f"Cannot sort by {sort}; choose one of {', '.join(SORTS)}")
+        h = len(self.events) if gameweeks is None else max(0, min(gameweeks, len(self.events)))
+        cols = self.store.columns
+        mask = np.ones(len(self.store), dtype=bool)
+        if position is not None:
+            mask &= cols["element_type"] == self.store.position_id(position)
+        if team is not None:
+            mask &= cols["team"] == team
+        if max_price is not None:
+            mask &= cols["now_cost"] <= round(max_price * 10)
+        rows = np.flatnonzero(mask)
+        if sort == "next":
+            keys = self.points[rows, 0] if h else np.zeros(len(rows), dtype=np.float32)
+        elif h == len(self.events):
+            keys = self.total[rows]
+        else:
+            keys = self.points[rows, :h].sum(axis=1)
+        k = offset + limit
+        neg = -keys
+        if k < len(rows):
+            part = np.argpartition(neg, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+            order = part[np.argsort(neg[part], kind="stable")]
+        else:
+            order = np.argsort(neg, kind="stable")
+        return [self._record(r, h) for r in rows[order[offset:k]]]
+
+    def captains(self, n: int = 5) -> List[dict]:
+        """Best captain picks: highest expected points in the next gameweek."""
+        return self.query(gameweeks=1, sort="next", limit=n)
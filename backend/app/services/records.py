@@ -0,0 +1,176 @@
+# app/services/records.py
+"""
+Typed, compact records for per-manager FPL data (entries, picks, history).
+
+FPL payloads are normalized into slotted, frozen dataclasses with an explicit
+schema as soon as they are fetched: only the fields we serve are kept (an
+entry drops its league and kit blobs), values live in slots instead of a
+per-object dict, and they encode straight to JSON bytes. The cache holds the
+records themselves; values that come back from a shared tier or the database
+as plain dicts are turned back into records with `revive` / `coerce`.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+import orjson
+
+R = TypeVar("R")
+
+
+def _pick(cls: type, data: dict) -> dict:
+    return {f: data.get(f) for f in cls.__match_args__}
+
+
+class Record:
+    """Shared constructors for the dataclasses below."""
+    __slots__ = ()
+
+    @classmethod
+    def from_api(cls: Type[R], data: dict) -> R:
+        return cls(**_pick(cls, data or {}))
+
+    @classmethod
+    def coerce(cls: Type[R], value: Any) -> R:
+        return value if isinstance(value, cls) else cls.from_api(value)
+
+
+@dataclass(slots=True, frozen=True)
+class Entry(Record):
+    """entry/{id}/: a manager's public profile summary."""
+    id: int
+    name: Optional[str]
+    player_first_name: Optional[str]
+    player_last_name: Optional[str]
+    player_region_name: Optional[str]
+    favourite_team: Optional[int]
+    started_event: Optional[int]
+    joined_time: Optional[str]
+    current_event: Optional[int]
+    summary_overall_points: Optional[int]
+    summary_overall_rank: Optional[int]
+    summary_event_points: Optional[int]
+    summary_event_rank: Optional[int]
+    last_deadline_bank: Optional[int]
+    last_deadline_value: Optional[int]
+    last_deadline_total_transfers: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class EventSummary(Record):
+    """One gameweek of a manager's season (picks' entry_history, a history/current row)."""
+    event: Optional[int]
+    points: Optional[int]
+    total_points: Optional[int]
+    rank: Optional[int]
+    overall_rank: Optional[int]
+    bank: Optional[int]
+    value: Optional[int]
+    event_transfers: Optional[int]
+    event_transfers_cost: Optional[int]
+    points_on_bench: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class Pick(Record):
+    element: int
+    position: int
+    multiplier: Optional[int]   # None when FPL left it out; scoring derives it
+    is_captain: bool
+    is_vice_captain: bool
+
+
+@dataclass(slots=True, frozen=True)
+class AutomaticSub(Record):
+    element_in: int
+    element_out: int
+    event: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class Picks(Record):
+    """entry/{id}/event/{gw}/picks/."""
+    active_chip: Optional[str]
+    entry_history: Optional[EventSummary]
+    automatic_subs: Tuple[AutomaticSub, ...]
+    picks: Tuple[Pick, ...]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Picks":
+        data = data or {}
+        history = data.get("entry_history")
+        return cls(
+            active_chip=data.get("active_chip"),
+            entry_history=EventSummary.from_api(history) if history else None,
+            automatic_subs=tuple(AutomaticSub.from_api(s) for s in data.get("automatic_subs") or ()),
+            picks=tuple(
+                Pick(
+                    element=p["element"],
+                    position=p.get("position", n),
+                    multiplier=p.get("multiplier"),
+                    is_captain=bool(p.get("is_captain")),
+                    is_vice_captain=bool(p.get("is_vice_captain")),
+                )
+                for n, p in enumerate(data.get("picks") or (), start=1)
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SeasonSummary(Record):
+    season_name: str
+    total_points: Optional[int]
+    rank: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class ChipPlay(Record):
+    name: str
+    time: Optional[str]
+    event: Optional[int]
+
+
+@dataclass(slots=True, frozen=True)
+class History(Record):
+    """entry/{id}/history/: this season gameweek by gameweek, past seasons, chips played."""
+    current: Tuple[EventSummary, ...]
+    past: Tuple[SeasonSummary, ...]
+    chips: Tuple[ChipPlay, ...]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "History":
+        data = data or {}
+        return cls(
+            current=tuple(EventSummary.from_api(r) for r in data.get("current") or ()),
+            past=tuple(SeasonSummary.from_api(r) for r in data.get("past") or ()),
+            chips=tuple(ChipPlay.from_api(r) for r in data.get("chips") or ()),
+        )
+
+
+# cache namespace -> record type stored under it
+NAMESPACES: Dict[str, Type[Record]] = {"entry": Entry, "picks": Picks, "history": History}
+
+
+def revive(key: str, value: Any) -> Any:
+    """Turn a plain dict read back from a shared cache tier into the record its namespace holds."""
+    cls = NAMESPACES.get(key.split(":", 1)[0])
+    if cls is None or not isinstance(value, dict):
+        return value
+    try:
+        return cls.coerce(value)
+    except (KeyError, TypeError):
+        return value  # written before this schema (or by hand); serve it as it is
+
+
+def as_dict(value: Any) -> Any:
+    """Plain JSON-able form (for JSON columns); anything that is not a record passes through."""
+    return asdict(value) if is_dataclass(value) and not isinstance(value, type) else value
+
+
+def json_default(value: Any) -> Any:
+    """`default=` hook for json.dumps: records become dicts, anything else unknown a string."""
+    return asdict(value) if is_dataclass(value) and not isinstance(value, type) else str(value)
+
+
+def to_json(value: Any) -> bytes:
+    """Compact JSON bytes for records, or any mix of dicts/lists containing them."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
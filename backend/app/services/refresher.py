@@ -0,0 +1,63 @@
+# app/services/refresher.py
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Optional
+from app.services.fpl_adapter import FPLAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Keeps the adapter's hot keys warm. Each key is refetched once
+    `refresh_ahead` (a fraction of its TTL) has elapsed, so the cache entry is
+    replaced before it expires and readers never pay upstream latency.
+    Failed refreshes leave the last good value in place and are retried on
+    the next tick. With `fill_empty` off, keys nothing has fetched yet are
+    left for the first request to fill (STARTUP_MODE=lazy) and only kept
+    warm from then on. Started and stopped by the app lifespan.
+    """
+
+    def __init__(self, adapter: FPLAdapter, interval: float = 5.0, refresh_ahead: float = 0.8, fill_empty: bool = True):
+        self.adapter = adapter
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.fill_empty = fill_empty
+        self._task: Optional[asyncio.Task] = None
+        self.failures = 0
+
+    def _due(self, key: str) -> bool:
+        f = self.adapter.freshness(key)
+        if f is None:
+            return self.fill_empty
+        return f["age"] >= f["ttl"] * self.refresh_ahead
+
+    async def run_once(self):
+        for key in self.adapter.hot_keys():
+            if not self._due(key):
+                continue
+            try:
+                await self.adapter.refresh(key)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Refresh of {key} failed, keeping last good value: {e}")
+
+    async def _loop(self):
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
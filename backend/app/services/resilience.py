@@ -0,0 +1,168 @@
+# app/services/resilience.py
+from __future__ import annotations
+import asyncio
+import time
+from typing import Optional
+
+
+class UpstreamError(Exception):
+    """Non-200 answer from FPL. `status` lets callers map 401/404 etc."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimitExceeded(Exception):
+    """We would have to wait longer than allowed for an outbound token."""
+
+
+class CircuitOpenError(Exception):
+    """The breaker is open: upstream is failing and we fail fast instead of calling it."""
+
+
+def counts_as_failure(exc: BaseException) -> bool:
+    """
+    Only upstream health problems trip the breaker. A 404 for an unknown
+    manager, an expired user cookie (401/403) or rejected login credentials
+    mean FPL answered us, so they count as successes.
+    """
+    if isinstance(exc, ValueError):
+        return False
+    if isinstance(exc, UpstreamError) and exc.status is not None:
+        return exc.status >= 500 or exc.status == 429
+    # connection errors, timeouts, and the fpl library's generic failures
+    return True
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations: each caller takes a token immediately,
+    possibly driving the balance negative, and sleeps until its token would
+    have been refilled. Waiters are therefore served in arrival order without
+    polling. Callers that would wait longer than `max_wait` are rejected.
+    """
+
+    def __init__(self, rate: float, burst: int, max_wait: float = 5.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            self.acquired += 1
+            return
+        wait = -self._tokens / self.rate
+        if wait > self.max_wait:
+            self._tokens += 1  # give the reservation back
+            self.rejected += 1
+            raise RateLimitExceeded(f"FPL outbound rate limit: would wait {wait:.1f}s")
+        self.delayed += 1
+        self.acquired += 1
+        await asyncio.sleep(wait)
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive upstream failures;
+    open -> half_open once `reset_timeout` has passed, letting one trial call
+    through; the trial's outcome closes or re-opens the circuit.
+
+    Every state change starts a new generation. before_call() returns the
+    generation the call was admitted in and the outcome is reported with it,
+    so a call that outlives the state it was admitted in (a slow request
+    started while closed, finishing after the circuit opened or during the
+    next trial) is ignored instead of closing the circuit or clearing the
+    trial flag. Outcomes reported without a generation apply to the current one.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._generation = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self.stale_outcomes = 0
+
+    def _transition(self, state: str):
+        self.state = state
+        self._generation += 1
+        self._trial_in_flight = False
+
+    def _current(self, generation: Optional[int]) -> bool:
+        if generation is None or generation == self._generation:
+            return True
+        self.stale_outcomes += 1
+        return False
+
+    def before_call(self) -> int:
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("FPL upstream circuit is open")
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError("FPL upstream circuit is half-open; trial call in flight")
+            self._trial_in_flight = True
+        return self._generation
+
+    def record_success(self, generation: Optional[int] = None):
+        if not self._current(generation):
+            return
+        self.consecutive_failures = 0
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self, generation: Optional[int] = None):
+        if not self._current(generation):
+            return
+        self._trial_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self._transition("open")
+            self._opened_at = time.monotonic()
+
+    def release_trial(self, generation: Optional[int] = None):
+        """The admitted call never reached upstream (e.g. rate limited); let another caller try."""
+        if self._current(generation):
+            self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "stale_outcomes": self.stale_outcomes,
+        }
@@ -0,0 +1,208 @@
+# app/services/scoring.py
+from __future__ import annotations
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.auth.models import User
+from app.db.leagues.models import LeagueStanding, league_members
+from app.services.fpl_adapter import FPLAdapter
+from app.services.prefetch import load_picks
+from app.services.records import Pick, Picks
+
+logger = logging.getLogger(__name__)
+
+SQUAD_SIZE = 15
+STARTERS = 11
+
+
+def live_points_vector(live: dict) -> np.ndarray:
+    """event/{id}/live -> int32 vector where vec[element_id] = that player's gameweek points."""
+    elements = live.get("elements", [])
+    ids = np.fromiter((e["id"] for e in elements), dtype=np.int32, count=len(elements))
+    pts = np.fromiter((e.get("stats", {}).get("total_points", 0) for e in elements), dtype=np.int32, count=len(elements))
+    vec = np.zeros(int(ids.max()) + 1 if len(ids) else 1, dtype=np.int32)
+    vec[ids] = pts
+    return vec
+
+
+def _multiplier(pick: Pick, chip: Optional[str]) -> int:
+    """FPL usually sends `multiplier`; derive it when it is missing."""
+    if pick.multiplier is not None:
+        return int(pick.multiplier)
+    if pick.position > STARTERS:
+        return 1 if chip == "bboost" else 0  # bench only counts under Bench Boost
+    if pick.is_captain:
+        return 3 if chip == "3xc" else 2
+    return 1
+
+
+class PicksMatrix:
+    """
+    Members x squad-slot matrices built from Picks records (or raw payloads,
+    e.g. from the database): `elements` holds
+    element ids (0 = empty slot), `multipliers` the captain/bench weights and
+    `hits` each member's transfer cost for the gameweek.
+    """
+
+    def __init__(self, picks_by_member: Mapping[int, Picks | dict]):
+        self.members: List[int] = list(picks_by_member)
+        m = len(self.members)
+        self.elements = np.zeros((m, SQUAD_SIZE), dtype=np.int32)
+        self.multipliers = np.zeros((m, SQUAD_SIZE), dtype=np.int8)
+        self.hits = np.zeros(m, dtype=np.int32)
+        for row, member in enumerate(self.members):
+            picks = Picks.coerce(picks_by_member[member])
+            for slot, pick in enumerate(picks.picks[:SQUAD_SIZE]):
+                self.elements[row, slot] = pick.element
+                self.multipliers[row, slot] = _multiplier(pick, picks.active_chip)
+            if picks.entry_history is not None:
+                self.hits[row] = picks.entry_history.event_transfers_cost or 0
+
+    def score(self, live_vec: np.ndarray) -> np.ndarray:
+        """Gameweek points for every member in one vectorized gather + weighted row sum."""
+        # players missing from the live payload (e.g. new signings) score 0
+        vec = live_vec
+        if self.elements.size and int(self.elements.max()) >= len(vec):
+            vec = np.pad(vec, (0, int(self.elements.max()) + 1 - len(vec)))
+        return (vec[self.elements] * self.multipliers).sum(axis=1, dtype=np.int32) - self.hits
+
+
+def rank(points: Mapping[int, int]) -> List[dict]:
+    """Standard competition ranking (1, 2, 2, 4) by points, ties broken by user id for stable ordering."""
+    ordered = sorted(points.items(), key=lambda kv: (-kv[1], kv[0]))
+    out, prev, prev_rank = [], None, 0
+    for i, (user_id, pts) in enumerate(ordered, start=1):
+        r = prev_rank if pts == prev else i
+        out.append({"user_id": user_id, "points": int(pts), "rank": r})
+        prev, prev_rank = pts, r
+    return out
+
+
+async def load_memberships(db: AsyncSession, league_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[int, int]]:
+    """{league_id: {user_id: fpl_manager_id}} for every member with a linked FPL team."""
+    q = (
+        select(league_members.c.league_id, User.id, User.fpl_manager_id)
+        .join(User, User.id == league_members.c.user_id)
+        .where(User.fpl_manager_id.is_not(None))
+    )
+    if league_ids is not None:
+        q = q.where(league_members.c.league_id.in_(list(league_ids)))
+    out: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for league_id, user_id, manager_id in (await db.execute(q)).all():
+        out[league_id][user_id] = manager_id
+    return out
+
+
+async def score_leagues(
+    db: AsyncSession, adapter: FPLAdapter, event_id: int, league_ids: Optional[Iterable[int]] = None
+) -> Dict[int, List[dict]]:
+    """
+    Gameweek points and ranks for the given leagues (default: all of them).
+    Live data is fetched once; every distinct manager's picks are loaded at
+    most once (from the database for past deadlines, otherwise the adapter)
+    no matter how many leagues they are in; all managers are then scored in
+    a single vectorized pass.
+    """
+    started = time.perf_counter()
+    memberships = await load_memberships(db, league_ids)
+    managers = {m for members in memberships.values() for m in members.values()}
+
+    live_vec = live_points_vector(await adapter.get_event_live(event_id))
+    picks = await load_picks(db, adapter, managers, event_id)
+
+    matrix = PicksMatrix(picks)
+    manager_points = dict(zip(matrix.members, matrix.score(live_vec).tolist()))
+
+    results: Dict[int, List[dict]] = {}
+    for league_id, members in memberships.items():
+        points = {user_id: manager_points[m] for user_id, m in members.items() if m in manager_points}
+        results[league_id] = rank(points)
+    logger.info(
+        f"Scored {len(manager_points)} managers across {len(results)} leagues for GW{event_id} "
+        f"in {time.perf_counter() - started:.2f}s ({len(managers) - len(picks)} picks unavailable)"
+    )
+    return results
+
+
+def _write_gameweek(
+    db: AsyncSession,
+    league_id: int,
+    gameweek: int,
+    current: Mapping[int, LeagueStanding],
+    points: Mapping[int, int],
+    totals: Mapping[int, int],
+) -> int:
+    """Rank one gameweek's totals and add/update only the rows that changed."""
+    written = 0
+    for entry in rank(totals):
+        user_id = entry["user_id"]
+        new = (points[user_id], entry["points"], entry["rank"])
+        row = current.get(user_id)
+        if row is None:
+            db.add(LeagueStanding(
+                league_id=league_id, user_id=user_id, gameweek=gameweek,
+                event_points=new[0], total_points=new[1], rank=new[2],
+            ))
+        elif (row.event_points, row.total_points, row.rank) != new:
+            row.event_points, row.total_points, row.rank = new
+        else:
+            continue
+        written += 1
+    return written
+
+
+async def upsert_standings(db: AsyncSession, league_id: int, gameweek: int, event_points: Mapping[int, int]) -> int:
+    """
+    Incrementally materialize one league's standings for a gameweek. A
+    member's total is the sum of their stored event points for every earlier
+    gameweek plus this one, so a gameweek that was never materialized (a
+    league created mid-season, a late joiner, a gap in publishing) counts as
+    zero instead of restarting the totals. Gameweeks after this one that are
+    already stored are re-totalled and re-ranked from their stored event
+    points, so recalculating GW n carries through to every later gameweek.
+    Only rows whose points or rank actually changed are written. Returns
+    the number of rows written; the caller commits.
+    """
+    earlier = dict((await db.execute(
+        select(LeagueStanding.user_id, func.sum(LeagueStanding.event_points))
+        .where(LeagueStanding.league_id == league_id, LeagueStanding.gameweek < gameweek)
+        .group_by(LeagueStanding.user_id)
+    )).all())
+    rows = (await db.execute(
+        select(LeagueStanding).where(LeagueStanding.league_id == league_id, LeagueStanding.gameweek >= gameweek)
+    )).scalars().all()
+    stored: Dict[int, Dict[int, LeagueStanding]] = defaultdict(dict)
+    for r in rows:
+        stored[r.gameweek][r.user_id] = r
+
+    # members whose picks were unavailable this time keep their stored gameweek points
+    points = {user_id: r.event_points for user_id, r in stored[gameweek].items()}
+    points.update(event_points)
+
+    written = 0
+    running = {user_id: int(total) for user_id, total in earlier.items()}
+    for gw in [gameweek, *sorted(g for g in stored if g > gameweek)]:
+        gw_points = points if gw == gameweek else {user_id: r.event_points for user_id, r in stored[gw].items()}
+        totals = {user_id: running.get(user_id, 0) + pts for user_id, pts in gw_points.items()}
+        written += _write_gameweek(db, league_id, gw, stored[gw], gw_points, totals)
+        running.update(totals)
+    await db.flush()
+    return written
+
+
+async def update_standings(
+    db: AsyncSession, adapter: FPLAdapter, event_id: int, league_ids: Optional[Iterable[int]] = None
+) -> Dict[int, int]:
+    """Score the leagues and write what changed into league_standings. Returns {league_id: rows written}."""
+    scored = await score_leagues(db, adapter, event_id, league_ids)
+    written = {}
+    for league_id, ranked in scored.items():
+        points = {entry["user_id"]: entry["points"] for entry in ranked}
+        written[league_id] = await upsert_standings(db, league_id, event_id, points)
+    await db.commit()
+    logger.info(f"GW{event_id} standings: {sum(written.values())} rows written across {len(written)} leagues")
+    return written
@@ -0,0 +1,51 @@
+# app/services/singleflight.py
+from __future__ import annotations
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict
+from app.services.cache import namespace_of
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller starts the
+    fetch, everyone arriving while it is in flight awaits the same task.
+    The shared task is shielded so one caller disconnecting does not cancel
+    the fetch for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self._waiters[key] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        waiters = self._waiters.pop(key, 0)
+        s = self._stats[namespace_of(key)]
+        s["flights"] += 1
+        s["coalesced"] += waiters
+        s["max_waiters"] = max(s["max_waiters"], waiters)
+        if task.cancelled() or task.exception() is not None:
+            s["failed_flights"] += 1
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "namespaces": {ns: dict(c) for ns, c in self._stats.items()},
+        }
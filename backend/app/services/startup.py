@@ -0,0 +1,88 @@
+# app/services/startup.py
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# eager: warm up before accepting traffic; background: accept traffic at once and warm up
+# alongside it; lazy: no warm-up, the first requests fill the caches
+STARTUP_MODES = ("eager", "background", "lazy")
+
+
+class StartupReport:
+    """
+    How long each startup phase took, for one worker: module imports, wiring
+    the app in the lifespan, and every warm-up task (run concurrently, so the
+    warm-up costs as much as its slowest task rather than their sum). Served
+    under /admin/metrics so slow-to-ready pods can be diagnosed.
+    """
+
+    def __init__(self, mode: str, imports_s: Optional[float] = None):
+        if mode not in STARTUP_MODES:
+            raise ValueError(f"Unknown startup mode {mode}; choose one of {', '.join(STARTUP_MODES)}")
+        self.mode = mode
+        self.phases: Dict[str, float] = {}
+        if imports_s is not None:
+            self.phases["imports"] = imports_s
+        self.warmup: Dict[str, dict] = {}
+        self.warm = False
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    async def _timed(self, name: str, step: Callable[[], Awaitable[Any]]):
+        started = time.perf_counter()
+        try:
+            await step()
+            self.warmup[name] = {"ok": True}
+        except Exception as e:
+            # a cold cache is not fatal; requests fetch whatever warm-up missed
+            self.warmup[name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        self.warmup[name]["ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def warm_up(self, steps: Dict[str, Callable[[], Awaitable[Any]]], timeout: Optional[float] = None):
+        """Run every warm-up step at once, giving up on whatever is still running after `timeout` seconds."""
+        with self.phase("warmup"):
+            tasks = [asyncio.ensure_future(self._timed(name, step)) for name, step in steps.items()]
+            done, pending = await asyncio.wait(tasks, timeout=timeout) if tasks else (set(), set())
+            for task in pending:
+                task.cancel()
+            for name in steps:
+                self.warmup.setdefault(name, {"ok": False, "error": "timed out"})
+        self.warm = True
+
+    async def start(self, steps: Dict[str, Callable[[], Awaitable[Any]]], timeout: Optional[float] = None):
+        """Warm up as the mode says: wait for it (eager), kick it off (background) or skip it (lazy)."""
+        if self.mode == "eager":
+            await self.warm_up(steps, timeout)
+        elif self.mode == "background":
+            self._task = asyncio.create_task(self.warm_up(steps, timeout))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "warm": self.warm,
+            "phases_ms": {k: round(v * 1000, 2) for k, v in self.phases.items()},
+            "warmup": self.warmup,
+        }
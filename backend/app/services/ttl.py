@@ -0,0 +1,98 @@
+# app/services/ttl.py
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from app.services.cache import namespace_of
+
+
+def parse_deadline(raw: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(raw.replace("Z", "+00:00")) if raw else None
+
+
+class DeadlineTTLPolicy:
+    """
+    TTLs driven by the gameweek calendar in bootstrap-static.
+
+    The season is always in one phase: `live` (a deadline has passed and its
+    gameweek is not finished yet; checked on every call, so it switches the
+    moment the deadline passes), `deadline` (within `deadline_window` of the
+    next deadline, or of the daily price change) or `quiet` (everything else).
+    Each phase maps namespaces to TTLs. Keys that belong to a finished
+    gameweek (`live:<event>`, `fixtures:<event>`, `picks:<entry>:<event>`)
+    get `final_ttl` instead, because their data can no longer change.
+    Namespaces a phase does not mention return None, which leaves the TTL to
+    the cache's static policy; so does everything until the first bootstrap
+    has been seen.
+    """
+
+    EVENT_KEYED = {"live": 1, "fixtures": 1, "picks": 2}  # namespace -> index of the event id in the key
+
+    def __init__(
+        self,
+        phases: Dict[str, Dict[str, int]],
+        deadline_window: float = 7200,
+        final_ttl: int = 7 * 86400,
+        price_change_hour_utc: Optional[int] = None,
+    ):
+        self.phases = phases
+        self.deadline_window = timedelta(seconds=deadline_window)
+        self.final_ttl = final_ttl
+        self.price_change_hour_utc = price_change_hour_utc
+        self._deadlines: List[tuple[datetime, int]] = []
+        self._finished: set[int] = set()
+        self._source: Optional[list] = None
+
+    def update(self, events: list):
+        """Re-read the calendar; cheap to call with the same snapshot again."""
+        if events is self._source:
+            return
+        self._source = events
+        self._deadlines = sorted((d, e["id"]) for e in events if (d := parse_deadline(e.get("deadline_time"))) is not None)
+        self._finished = {e["id"] for e in events if e.get("finished") and e.get("data_checked")}
+
+    def live_events(self, now: Optional[datetime] = None) -> List[int]:
+        now = now or datetime.now(timezone.utc)
+        return [event_id for d, event_id in self._deadlines if d <= now and event_id not in self._finished]
+
+    def next_deadline(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        now = now or datetime.now(timezone.utc)
+        return next((d for d, _ in self._deadlines if d > now), None)
+
+    def _near_price_change(self, now: datetime) -> bool:
+        if self.price_change_hour_utc is None:
+            return False
+        change = now.replace(hour=self.price_change_hour_utc, minute=0, second=0, microsecond=0)
+        return any(abs(now - (change + timedelta(days=d))) <= self.deadline_window / 2 for d in (-1, 0, 1))
+
+    def phase(self, now: Optional[datetime] = None) -> Optional[str]:
+        if self._source is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        if self.live_events(now):
+            return "live"
+        upcoming = self.next_deadline(now)
+        if upcoming is not None and upcoming - now <= self.deadline_window:
+            return "deadline"
+        if self._near_price_change(now):
+            return "deadline"
+        return "quiet"
+
+    def ttl_for(self, key: str, now: Optional[datetime] = None) -> Optional[int]:
+        ns = namespace_of(key)
+        idx = self.EVENT_KEYED.get(ns)
+        if idx is not None:
+            parts = key.split(":")
+            if len(parts) > idx and parts[idx].isdigit() and int(parts[idx]) in self._finished:
+                return self.final_ttl
+        phase = self.phase(now)
+        return self.phases.get(phase, {}).get(ns) if phase else None
+
+    def stats(self) -> dict:
+        now = datetime.now(timezone.utc)
+        phase, upcoming = self.phase(now), self.next_deadline(now)
+        return {
+            "phase": phase,
+            "next_deadline": upcoming.isoformat() if upcoming else None,
+            "live_events": self.live_events(now),
+            "ttls": self.phases.get(phase, {}) if phase else {},
+        }
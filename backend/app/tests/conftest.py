@@ -16,6 +16,7 @@ import app.db.payments.models as pay_models
 import app.db.leagues.models as league_models
 
 from app.db.admin.enums import Role
+from app.core.principal import principal_cache
 
 # Use a separate test DB (here SQLite in-memory for speed)
 DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -54,6 +55,8 @@ async def prepare_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
+    # ids are reused once the tables are recreated; don't let a principal outlive its test
+    principal_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
@@ -133,3 +136,32 @@ async def create_league(client, auth_headers):
     assert response.status_code == 201, response.text
     print(response.json())
     return response.json()
+
+# -----------------------------------------------------------------------------
+# Small synthetic bootstrap-static snapshot for FPL service tests
+# -----------------------------------------------------------------------------
+@pytest.fixture
+def bootstrap_data():
+    positions = ["GKP", "DEF", "MID", "FWD"]
+    elements = []
+    for i in range(1, 41):
+        elements.append({
+            "id": i,
+            "web_name": f"Player{i}",
+            "team": (i - 1) % 4 + 1,
+            "element_type": (i - 1) % 4 + 1,
+            "now_cost": 40 + i,
+            "total_points": i * 3 % 97,
+            "event_points": i % 7,
+            "minutes": i * 90,
+            "form": f"{(i % 9) / 1.5:.1f}",
+            "points_per_game": f"{(i % 8) / 2:.1f}",
+            "selected_by_percent": f"{i / 2:.1f}",
+            "status": "a",
+        })
+    return {
+        "elements": elements,
+        "element_types": [{"id": n + 1, "singular_name_short": p} for n, p in enumerate(positions)],
+        "teams": [{"id": t, "name": f"Team {t}", "short_name": f"T{t}"} for t in range(1, 5)],
+        "events": [],
+    }
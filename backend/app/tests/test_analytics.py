@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.db.auth import models
+from app.db.leagues.models import League
+from app.services import analytics
+from app.services.analytics import LeagueAnalyticsCache, league_analytics, league_ownership
+from app.services.fpl_adapter import FPLAdapter
+from app.tests.test_scoring import squad
+
+
+def test_league_ownership_effective_ownership_and_exposure(monkeypatch):
+    monkeypatch.setattr(analytics, "DIFFERENTIAL_SHARE", 0.5)
+    # u1 starts 1..11 (captain 1), u2 starts 2..12 (captain 11); u3's picks are unavailable
+    result = league_ownership({1: 101, 2: 102, 3: 103}, {101: squad(1, captain=1), 102: squad(2, captain=11)})
+    assert (result["members"], result["missing"]) == (2, [3])
+
+    by_element = {e["element"]: e for e in result["elements"]}
+    assert by_element[1] == {"element": 1, "ownership": 50.0, "effective_ownership": 100.0, "captained": 1}
+    assert by_element[11]["effective_ownership"] == 150.0
+    assert (by_element[12]["ownership"], by_element[12]["effective_ownership"]) == (100.0, 50.0)   # benched by u1
+    assert by_element[16]["effective_ownership"] == 0.0
+    assert result["elements"][0]["element"] == 11                                                # highest EO first
+
+    assert result["exposure"] == [
+        {"user_id": 1, "gain": 1.0, "risk": 1.0, "differentials": [1]},
+        {"user_id": 2, "gain": 1.0, "risk": 1.0, "differentials": []},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_league_analytics_cached_until_membership_changes(db_session):
+    users = [models.User(id=i, email=f"a{i}@x.com", username=f"a{i}", fpl_manager_id=100 + i) for i in range(1, 4)]
+    db_session.add_all(users)
+    league = League(name="L", code="l", created_by_id=1)
+    league.members.extend(users[:2])
+    db_session.add(league)
+    await db_session.commit()
+
+    adapter = MagicMock(spec=FPLAdapter)
+    adapter.get_picks_bulk = AsyncMock(side_effect=lambda ids, ev, c: {i: squad(i - 100, captain=i - 100) for i in ids})
+    adapter.deadline_passed = AsyncMock(return_value=True)
+    cache = LeagueAnalyticsCache()
+
+    first = await league_analytics(db_session, adapter, cache, league.id, 5)
+    assert first["members"] == 2
+    assert await league_analytics(db_session, adapter, cache, league.id, 5) is first
+    assert cache.stats()["hits"] == 1
+
+    league.members.append(users[2])
+    await db_session.commit()
+    joined = await league_analytics(db_session, adapter, cache, league.id, 5)
+    assert joined["members"] == 3 and cache.stats()["invalidations"] == 1
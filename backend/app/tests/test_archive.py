@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from aiohttp import ClientSession
+from app.services.archive import ImmutableStore
+from app.services.cache import MemoryLRUCache, TieredCache
+from app.services.fpl_adapter import FPLAdapter
+
+
+@pytest.mark.asyncio
+async def test_archive_survives_restart_for_finished_gameweeks(tmp_path):
+    bootstrap = {"events": [
+        {"id": 1, "finished": True, "data_checked": True},
+        {"id": 2, "finished": False, "data_checked": False, "is_current": True},
+    ]}
+    path = str(tmp_path / "archive.sqlite3")
+
+    def make_adapter():
+        adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()), archive=ImmutableStore(path))
+        adapter.bootstrap_static = AsyncMock(return_value=bootstrap)
+        adapter._get_json = AsyncMock(side_effect=lambda url, auth_cookie=None: {"url": url})
+        return adapter
+
+    first = make_adapter()
+    await first.get_event_live(1)
+    await first.get_event_live(2)
+    assert first._get_json.await_count == 2
+    await first._archive.close()
+
+    # a restart: empty memory cache, same file
+    second = make_adapter()
+    assert (await second.get_event_live(1))["url"].endswith("/event/1/live/")
+    await second.get_event_live(2)
+    assert [c.args[0].split("/")[-3] for c in second._get_json.await_args_list] == ["2"]   # only the current gameweek
+    assert second.metrics()["archive"]["namespaces"]["live"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_fixtures_are_cached_and_archived(tmp_path):
+    bootstrap = {"events": [{"id": 1, "finished": True, "data_checked": True}]}
+    path = str(tmp_path / "archive.sqlite3")
+
+    def make_adapter(archive):
+        adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()), archive=archive)
+        adapter.bootstrap_static = AsyncMock(return_value=bootstrap)
+        adapter._get_json = AsyncMock(return_value=[])   # a blank gameweek has no fixtures
+        return adapter
+
+    for archive in (None, ImmutableStore(path)):
+        adapter = make_adapter(archive)
+        assert await adapter.get_fixtures(1) == []
+        assert await adapter.get_fixtures(1) == []
+        assert adapter._get_json.await_count == 1        # an empty list is a hit, not a miss
+    await archive.close()
+
+    restarted = make_adapter(ImmutableStore(path))
+    assert await restarted.get_fixtures(1) == []
+    assert restarted._get_json.await_count == 0          # served from the archive
+    await restarted._archive.close()
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from app.services.cache import MemoryLRUCache, SQLiteCache, TieredCache, TTLPolicy, approx_size, encode_value
+from app.services.records import Entry
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used_by_count():
+    cache = MemoryLRUCache(max_entries=2, max_bytes=10_000)
+    await cache.set("entry:1", {"id": 1}, ttl_seconds=60)
+    await cache.set("entry:2", {"id": 2}, ttl_seconds=60)
+    assert await cache.get("entry:1") == {"id": 1}  # touch 1 so 2 becomes LRU
+    await cache.set("entry:3", {"id": 3}, ttl_seconds=60)
+
+    assert await cache.get("entry:2") is None
+    assert await cache.get("entry:1") == {"id": 1}
+    assert cache.stats()["namespaces"]["entry"]["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_bounded_by_bytes():
+    cache = MemoryLRUCache(max_entries=100, max_bytes=100)
+    for i in range(10):
+        await cache.set(f"entry:{i}", "x" * 30, ttl_seconds=60)
+    assert cache.stats()["bytes"] <= 100
+    assert len(cache) == 3
+
+    # a value bigger than the whole budget is rejected rather than flushing everything
+    await cache.set("bootstrap:static", "y" * 500, ttl_seconds=60)
+    assert await cache.get("bootstrap:static") is None
+    assert len(cache) == 3
+
+
+def test_approx_size_tracks_the_encoded_size():
+    bootstrap = {
+        "events": [{"id": i, "name": f"Gameweek {i}", "finished": i < 8, "chip_plays": []} for i in range(1, 39)],
+        "elements": [{"id": i, "web_name": f"Player {i}", "now_cost": 55, "form": "4.5"} for i in range(700)],
+    }
+    entry = Entry.from_api({"id": 1, "name": "Team", "player_first_name": "A", "summary_overall_points": 400})
+    for value in (bootstrap, entry, [], {}, "x" * 30):
+        assert approx_size(value) == pytest.approx(len(encode_value(value)), rel=0.25)
+
+
+@pytest.mark.asyncio
+async def test_namespace_ttls_and_expiry():
+    cache = MemoryLRUCache(ttl_policy=TTLPolicy({"bootstrap": 0.05, "entry": 60}))
+    await cache.set("bootstrap:static", {"events": []})
+    await cache.set("entry:1", {"id": 1})
+    await asyncio.sleep(0.1)
+
+    assert await cache.get("bootstrap:static") is None
+    assert await cache.get("entry:1") == {"id": 1}
+    assert cache.stats()["namespaces"]["bootstrap"]["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_promotes_shared_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = TieredCache(MemoryLRUCache(), SQLiteCache(path))
+    await writer.set("entry:7", {"id": 7}, ttl_seconds=60)
+
+    # a second worker has an empty L1 but shares the SQLite file
+    reader = TieredCache(MemoryLRUCache(), SQLiteCache(path))
+    assert await reader.get("entry:7") == {"id": 7}
+    assert len(reader.local) == 1
+
+    await writer.delete("entry:7")
+    assert await TieredCache(MemoryLRUCache(), SQLiteCache(path)).get("entry:7") is None
+    await writer.close(); await reader.close()
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.db.database import engine_options
+from app.db.instrumentation import PoolMonitor, SlowQueryLog, redact
+
+
+def test_engine_options_follow_the_backend():
+    pg = engine_options("postgresql+asyncpg://u:p@db/app")
+    assert pg["pool_size"] == 10 and pg["pool_pre_ping"] and pg["pool_recycle"] == 1800
+    assert pg["connect_args"] == {"prepared_statement_cache_size": 100}
+    assert issubclass(pg["poolclass"], AsyncAdaptedQueuePool)
+    assert "pool_size" not in engine_options("sqlite+aiosqlite:///:memory:")
+    assert "echo" not in pg
+
+
+@pytest.mark.asyncio
+async def test_pool_monitor_counts_waits_and_timeouts(tmp_path):
+    monitor = PoolMonitor()
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=monitor.pool_class(AsyncAdaptedQueuePool), pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    monitor.attach(engine.sync_engine)
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            assert monitor.stats(engine.pool)["checked_out"] == 1
+            with pytest.raises(PoolTimeout):
+                async with engine.connect():
+                    pass
+
+        async def query():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await asyncio.gather(*(query() for _ in range(3)))   # queue behind the single connection
+
+        stats = monitor.stats(engine.pool)
+        assert stats["timeouts"] == 1 and stats["checked_out"] == 0 and stats["peak_checked_out"] == 1
+        assert stats["checkouts"] == 4 and stats["wait_max_ms"] >= 50 and stats["size"] == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log_redacts_parameters(caplog):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    log = SlowQueryLog(threshold_ms=0.0001, sample_rate=1.0)
+    log.attach(engine.sync_engine)
+    SlowQueryLog(threshold_ms=0).attach(engine.sync_engine)   # disabled: attaches nothing
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT :secret,\n  :n"), {"secret": "hunter2", "n": 3})
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM missing"))
+                await conn.execute(text("SELECT 1"))
+        assert "hunter2" not in caplog.text
+        assert "SELECT ?, ? params=('str', 'int')" in caplog.text
+        assert log.slow == log.logged == 2
+    finally:
+        await engine.dispose()
+    assert redact([(1, "a"), (2, "b")], executemany=True) == "2 rows of ('int', 'str')"
@@ -0,0 +1,97 @@
+"""The real adapter over real HTTP, against the bundled fake FPL server."""
+import asyncio
+import aiohttp
+import pytest
+from fakefpl import FakeFPLConfig, serve
+from app.services.cache import MemoryLRUCache, TieredCache
+from app.services.fpl_adapter import FPLAdapter
+from app.services.login import LoginPoolExhausted, LoginSessionPool
+from app.services.resilience import CircuitBreaker
+
+
+async def fake_stats(session: aiohttp.ClientSession, root: str) -> dict:
+    async with session.get(f"{root}/_fake/stats") as resp:
+        return await resp.json()
+
+
+@pytest.mark.asyncio
+async def test_adapter_against_fake_server():
+    async with serve(FakeFPLConfig(players=120, entries=50, current_event=4)) as root:
+        async with aiohttp.ClientSession() as session:
+            adapter = FPLAdapter(session, cache=TieredCache(MemoryLRUCache()), base_url=f"{root}/api")
+
+            store = await adapter.player_store()
+            assert len(store) == 120
+            assert await adapter.current_event_id() == 4
+            assert await adapter.deadline_passed(4) and not await adapter.deadline_passed(5)
+
+            picks = await adapter.get_picks_bulk(range(1, 21), 4)
+            assert len(picks) == 20 and all(len(p.picks) == 15 for p in picks.values())
+            assert len((await adapter.get_event_live(4))["elements"]) == 120
+            entries = await adapter.get_entries([3, 999])
+            assert entries["entries"][3].id == 3 and set(entries["errors"]) == {999}
+
+            # everything again: served from cache, no new upstream requests
+            before = await fake_stats(session, root)
+            await adapter.bootstrap_static()
+            await adapter.get_picks_bulk(range(1, 21), 4)
+            await adapter.get_entry(3)
+            assert await fake_stats(session, root) == before
+            assert before["/api/entry/{entry_id}/event/{event_id}/picks/"] == 20
+            assert before["/api/bootstrap-static/"] == 1
+
+
+@pytest.mark.asyncio
+async def test_login_and_injected_failures_against_fake_server():
+    async with serve(FakeFPLConfig(entries=50)) as root:
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar()) as session:
+            adapter = FPLAdapter(
+                session, cache=TieredCache(MemoryLRUCache()),
+                base_url=f"{root}/api", login_url=f"{root}/accounts/login/",
+            )
+            details = await adapter.login_and_get_details("someone@example.com", "fake")
+            team = await adapter.get_my_team(details["manager_id"], details["cookie"])
+            assert len(team["picks"]) == 15
+            with pytest.raises(ValueError):
+                await adapter.login_and_get_details("someone@example.com", "wrong")
+
+            # FPL starts failing every request: the breaker opens after the threshold
+            async with session.post(f"{root}/_fake/config", json={"error_rate": 1.0}) as resp:
+                assert resp.status == 200
+            adapter._breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+            for entry_id in range(1, 5):
+                with pytest.raises(Exception):
+                    await adapter.get_entry(entry_id)
+            assert (await fake_stats(session, root))["errors_injected"] == 2
+            assert adapter.metrics()["circuit_breaker"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_share_a_bounded_pool():
+    emails = [f"manager{n}@example.com" for n in range(8)]
+    async with serve(FakeFPLConfig(entries=50, latency=0.02)) as root:
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar()) as session:
+            adapter = FPLAdapter(
+                session, cache=TieredCache(MemoryLRUCache()), base_url=f"{root}/api",
+                login_url=f"{root}/accounts/login/", login_pool=LoginSessionPool(size=2),
+            )
+            try:
+                results = await asyncio.gather(*(adapter.login_and_get_details(e, "fake") for e in emails))
+                # each login got the cookie for its own manager, never a neighbour's
+                for email, details in zip(emails, results):
+                    entry_id = sum(map(ord, email)) % 50 + 1
+                    assert details == {"manager_id": entry_id, "cookie": f"fake-{entry_id}"}
+
+                stats = adapter.metrics()["login"]
+                assert stats["created"] == 2 and stats["reused"] == 6
+                assert stats["peak_in_use"] == 2 and stats["waited"] == 6
+                assert stats["stages"]["login"]["ok"] == 8 and stats["stages"]["acquire"]["p95_ms"] > 0
+
+                # no session frees up in time: the login is refused before reaching FPL
+                adapter._logins.acquire_timeout = 0.01
+                async with adapter._logins.session(), adapter._logins.session():
+                    with pytest.raises(LoginPoolExhausted):
+                        await adapter.login_and_get_details(emails[0], "fake")
+                assert adapter.metrics()["login"]["timeouts"] == 1
+            finally:
+                await adapter._logins.close()
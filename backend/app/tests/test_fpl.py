@@ -5,6 +5,8 @@ from unittest.mock import MagicMock, AsyncMock, patch
 from aiohttp import ClientSession, CookieJar
 from yarl import URL
 from app.services.fpl_adapter import FPLAdapter
+from app.services.encoding import EncodedPayload
+from app.services.login import LoginPoolExhausted, LoginSessionPool
 from app.api.deps import get_current_active_fpl_user, get_current_user
 from app.api.deps_fpl import get_fpl_adapter
 from app.main import app
@@ -28,8 +30,11 @@ def mock_fpl_adapter():
     """Mock the FPL Adapter to control external API responses."""
     mock = MagicMock(spec=FPLAdapter)
     mock.bootstrap_static = AsyncMock(return_value={"teams": [{"name": "Arsenal"}]})
+    mock.bootstrap_encoded = AsyncMock(return_value=EncodedPayload.from_data({"teams": [{"name": "Arsenal"}]}))
+    mock.is_stale = MagicMock(return_value=False)
     mock.get_entry = AsyncMock(return_value={"entry": {"name": "Public User"}})
     mock.get_entry_picks = AsyncMock(return_value={"picks": [1, 2, 3]})
+    mock.deadline_passed = AsyncMock(return_value=True)
     mock.get_my_team = AsyncMock(return_value={"team": "My Squad", "bank": 10.0})
     
     # Mock the login success path
@@ -80,33 +85,121 @@ async def authenticated_fpl_headers(create_test_user):
 
 @pytest.mark.asyncio
 async def test_adapter_login_success_internal():
-    """Test FPLAdapter internal logic for cookie extraction and cleanup."""
-    mock_session = MagicMock(spec=ClientSession)
-    mock_session.cookie_jar = CookieJar()
-    
+    """Login runs on a pooled session of its own; the shared session's cookie jar is never touched."""
+    shared_session = MagicMock(spec=ClientSession)
+    shared_session.cookie_jar = CookieJar()
+
+    login_session = MagicMock(spec=ClientSession)
+    login_session.cookie_jar = CookieJar()
+    login_session.closed = False
+
     # Mock the internal calls the adapter makes
     mock_get_resp = AsyncMock()
     mock_get_resp.status = 200
     mock_get_resp.json = AsyncMock(return_value={"player": {"entry": TEST_MANAGER_ID}})
-    mock_session.get.return_value.__aenter__.return_value = mock_get_resp
-
-    with patch("fpl.FPL.login", new=AsyncMock()):
-        adapter = FPLAdapter(mock_session)
-        
-        # Correctly update cookies using yarl.URL instead of hdrs.URL
-        mock_session.cookie_jar.update_cookies(
-            {"pl_profile": TEST_COOKIE_VALUE}, 
+    login_session.get.return_value.__aenter__.return_value = mock_get_resp
+
+    async def fake_login(session, email, password):
+        # the FPL login redirect sets pl_profile on the session doing the login
+        session.cookie_jar.update_cookies(
+            {"pl_profile": TEST_COOKIE_VALUE},
             URL("https://fantasy.premierleague.com")
         )
 
-        result = await adapter.login_and_get_details(TEST_EMAIL, TEST_PASSWORD)
-        
-        assert result["manager_id"] == TEST_MANAGER_ID
-        assert result["cookie"] == TEST_COOKIE_VALUE
-        
-        # Verify the jar was cleared after extraction
-        cookies = mock_session.cookie_jar.filter_cookies(URL("https://fantasy.premierleague.com"))
-        assert not cookies
+    adapter = FPLAdapter(shared_session, login_pool=LoginSessionPool(size=1, factory=lambda: login_session))
+    adapter._login = AsyncMock(side_effect=fake_login)
+
+    result = await adapter.login_and_get_details(TEST_EMAIL, TEST_PASSWORD)
+    again = await adapter.login_and_get_details(TEST_EMAIL, TEST_PASSWORD)
+
+    assert result["manager_id"] == TEST_MANAGER_ID
+    assert result["cookie"] == TEST_COOKIE_VALUE
+    assert again == result
+    # the session went back to the pool with an empty jar and was reused
+    assert not login_session.cookie_jar.filter_cookies(URL("https://fantasy.premierleague.com"))
+    stats = adapter.metrics()["login"]
+    assert stats["created"] == 1 and stats["reused"] == 1 and stats["idle"] == 1
+    assert {"acquire", "login", "me", "cookie", "total"} <= set(stats["stages"])
+    assert stats["stages"]["me"]["ok"] == 2
+    # the shared session never saw the cookie
+    assert not shared_session.cookie_jar.filter_cookies(URL("https://fantasy.premierleague.com"))
+
+
+@pytest.mark.asyncio
+async def test_login_pool_closes_sessions_returned_after_shutdown():
+    def make_session():
+        session = MagicMock(spec=ClientSession)
+        session.cookie_jar = CookieJar()
+        session.closed = False
+        return session
+
+    pool = LoginSessionPool(size=2, factory=make_session)
+    async with pool.session() as busy:
+        async with pool.session() as idle:
+            pass
+        await pool.close()          # shutdown while a login is still running
+        idle.close.assert_awaited_once()
+        busy.close.assert_not_awaited()
+    busy.close.assert_awaited_once()
+    assert pool.stats()["idle"] == 0
+    with pytest.raises(LoginPoolExhausted):
+        async with pool.session():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_adapter_sends_credentials_per_request():
+    """Concurrent users' cookies go in their own request headers, never the shared jar."""
+    import asyncio
+    session = MagicMock(spec=ClientSession)
+    session.cookie_jar = CookieJar()
+    seen = []
+
+    def fake_get(url, headers=None):
+        seen.append((url, headers))
+        resp = AsyncMock()
+        resp.status = 200
+        resp.json = AsyncMock(return_value={"url": url})
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=resp)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return ctx
+    session.get.side_effect = fake_get
+
+    adapter = FPLAdapter(session)
+    await asyncio.gather(
+        adapter.get_entry_picks(1, 5, "cookie-one"),
+        adapter.get_my_team(2, "cookie-two"),
+    )
+
+    assert {h["Cookie"] for _, h in seen} == {"pl_profile=cookie-one", "pl_profile=cookie-two"}
+    assert len(session.cookie_jar) == 0
+
+
+@pytest.mark.asyncio
+async def test_my_team_flights_are_not_shared_across_credentials():
+    import asyncio
+    adapter = FPLAdapter(MagicMock(spec=ClientSession))
+    release = asyncio.Event()
+
+    async def fake_get_json(url, auth_cookie=None):
+        await release.wait()
+        if auth_cookie == "expired":
+            raise Exception("Status 401 Unauthorized")
+        return {"cookie": auth_cookie}
+
+    adapter._get_json = AsyncMock(side_effect=fake_get_json)
+    calls = [
+        asyncio.ensure_future(adapter.get_my_team(7, cookie)) for cookie in ("good", "good", "expired")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    good, again, expired = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert good == again == {"cookie": "good"}
+    assert isinstance(expired, Exception) and "401" in str(expired)
+    assert adapter._get_json.await_count == 2     # same credentials still coalesce
+
 
 @pytest.mark.asyncio
 async def test_fpl_login_new_user_success(client, db_session: AsyncSession, override_get_adapter, mock_fpl_adapter):
@@ -156,6 +249,18 @@ async def test_get_bootstrap_success(client, override_get_adapter, mock_fpl_adap
     assert resp.status_code == status.HTTP_200_OK
     assert "teams" in resp.json()
 
+@pytest.mark.asyncio
+async def test_get_bootstrap_etag_and_compression(client, override_get_adapter, mock_fpl_adapter):
+    """Bootstrap is served pre-encoded, compressed on request, and revalidates with 304."""
+    resp = await client.get("/fpl/bootstrap", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json() == {"teams": [{"name": "Arsenal"}]}
+    etag = resp.headers["etag"]
+
+    resp = await client.get("/fpl/bootstrap", headers={"If-None-Match": etag})
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp.content == b""
+
 @pytest.mark.asyncio
 async def test_get_entry_public_success(client, override_get_adapter, mock_fpl_adapter):
     """Test public endpoint /fpl/entry/{id}."""
@@ -195,4 +300,102 @@ async def test_get_my_picks_success(client, override_get_adapter, authenticated_
     """Test fetching entry picks /fpl/my-picks/{event_id}."""
     resp = await client.get("/fpl/my-picks/10", headers=authenticated_fpl_headers)
     assert resp.status_code == status.HTTP_200_OK
-    assert resp.json()["picks"] == [1, 2, 3]
\ No newline at end of file
+    assert resp.json()["picks"] == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_adapter_coalesces_concurrent_bootstrap_misses():
+    """N concurrent cache misses should produce exactly one upstream call."""
+    import asyncio
+    from app.services.cache import MemoryLRUCache, TieredCache
+
+    async def slow_bootstrap(url, auth_cookie=None):
+        await asyncio.sleep(0.05)
+        return {"events": [], "teams": [{"name": "Arsenal"}]}
+
+    adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()))
+    adapter._get_json = AsyncMock(side_effect=slow_bootstrap)
+
+    results = await asyncio.gather(*(adapter.bootstrap_static() for _ in range(50)))
+
+    assert all(r["teams"][0]["name"] == "Arsenal" for r in results)
+    assert adapter._get_json.await_count == 1
+    flights = adapter.metrics()["singleflight"]["namespaces"]["bootstrap"]
+    assert flights == {"flights": 1, "coalesced": 49, "max_waiters": 49}
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_served_stale_while_upstream_down():
+    """After expiry, readers get the last good value immediately, even if FPL is failing."""
+    import asyncio
+    from app.services.cache import MemoryLRUCache, TieredCache, TTLPolicy
+    from app.services.refresher import BackgroundRefresher
+    from app.services.ttl import DeadlineTTLPolicy
+
+    cache = TieredCache(MemoryLRUCache(ttl_policy=TTLPolicy({"bootstrap": 0.05})))
+    adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=cache)
+    upstream = adapter._get_json = AsyncMock(return_value={"events": [{"id": 1}]})
+    adapter._ttl = DeadlineTTLPolicy({})  # no calendar TTLs: use the cache's 50ms policy
+    refresher = BackgroundRefresher(adapter)
+
+    await refresher.run_once()
+    assert upstream.await_count == 1
+
+    await asyncio.sleep(0.1)
+    upstream.side_effect = Exception("FPL down")
+    assert await adapter.bootstrap_static() == {"events": [{"id": 1}]}
+    assert adapter.is_stale("bootstrap:static")
+
+    await refresher.run_once()
+    assert refresher.failures == 1
+    assert await adapter.bootstrap_static() == {"events": [{"id": 1}]}
+
+    upstream.side_effect = None
+    upstream.return_value = {"events": [{"id": 1}, {"id": 2}]}
+    await refresher.run_once()
+    assert await adapter.bootstrap_static() == {"events": [{"id": 1}, {"id": 2}]}
+    assert not adapter.is_stale("bootstrap:static")
+
+
+@pytest.mark.asyncio
+async def test_adapter_get_entries_bounded_fan_out():
+    """Bulk lookup serves cache hits, fetches misses concurrently under the cap, reports failures."""
+    import asyncio
+    from app.services.cache import MemoryLRUCache, TieredCache
+
+    active = peak = 0
+
+    async def fake_get_entry(entry_id):
+        nonlocal active, peak
+        active += 1; peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if entry_id == 13:
+            raise Exception("FPL Entry fetch failed: 404")
+        return {"id": entry_id}
+
+    adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()))
+    await adapter._cache.set("entry:1", {"id": 1, "cached": True})
+    adapter.get_entry = AsyncMock(side_effect=fake_get_entry)
+
+    result = await adapter.get_entries([1, *range(2, 31), 2], concurrency=4)
+
+    assert result["entries"][1] == {"id": 1, "cached": True}
+    assert len(result["entries"]) == 29 and set(result["errors"]) == {13}
+    assert adapter.get_entry.await_count == 29  # every miss once, cached id and duplicate skipped
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_get_entries_ndjson_stream(client, override_get_adapter, mock_fpl_adapter):
+    """?stream=true returns one NDJSON line per entry."""
+    async def fake_iter(ids):
+        for i in ids:
+            yield i, {"id": i}, None
+    mock_fpl_adapter.iter_entries = fake_iter
+
+    resp = await client.get("/fpl/entries", params={"ids": "3,4", "stream": "true"})
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [l for l in resp.text.splitlines()] == ['{"id":3,"entry":{"id":3}}', '{"id":4,"entry":{"id":4}}']
+
+    assert (await client.get("/fpl/entries", params={"ids": "a,b"})).status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,122 @@
+import pytest
+from fastapi import HTTPException
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from pydantic import ValidationError
+from app.api.routes.admin.jobs import retry_job
+from app.api.routes.admin.leagues import trigger_payouts
+from app.db.admin.schemas import AdminPayoutRequest
+from app.db.auth.models import User
+from app.db.leagues.models import League
+from app.db.admin.enums import JobStatus
+from app.db.jobs import crud
+from app.db.jobs.models import Job
+from app.services.jobs import JobRunner
+from app.tests.conftest import TestingSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_enqueue_deduplicates_active_jobs(db_session):
+    first, created = await crud.enqueue(db_session, "recalculate", {"event_id": 3}, dedup_key="recalculate:all:3")
+    await db_session.commit()
+    assert created
+    again, created = await crud.enqueue(db_session, "recalculate", {"event_id": 3}, dedup_key="recalculate:all:3")
+    assert (again.id, created) == (first.id, False)
+
+    # once the first one has finished, the same work can be queued again
+    await crud.mark_succeeded(db_session, first.id, {"ok": True})
+    later, created = await crud.enqueue(db_session, "recalculate", {"event_id": 3}, dedup_key="recalculate:all:3")
+    await db_session.commit()
+    assert created and later.id != first.id
+
+
+@pytest.mark.asyncio
+async def test_retry_conflicts_with_a_job_queued_after_the_check(db_session, monkeypatch):
+    failed, _ = await crud.enqueue(db_session, "payout", {"league_id": 1}, dedup_key="payout:1")
+    await db_session.commit()
+    await crud.mark_failed(db_session, failed.id, "boom", None)
+
+    # another admin queues the same work between the route's check and its update
+    async def no_active_job(db, dedup_key):
+        async with TestingSessionLocal() as other:
+            other.add(Job(kind="payout", payload={"league_id": 1}, dedup_key=dedup_key, status=JobStatus.queued,
+                          run_after=datetime.now(timezone.utc)))
+            await other.commit()
+
+    monkeypatch.setattr(crud, "get_active_job", no_active_job)
+    with pytest.raises(HTTPException) as exc:
+        await retry_job(failed.id, db_session, None)
+    assert exc.value.status_code == 409
+    await db_session.refresh(failed)
+    assert failed.status == JobStatus.failed
+
+
+@pytest.mark.asyncio
+async def test_payout_route_keeps_its_request_shape(db_session):
+    db_session.add_all([User(id=1, email="a@x.com", username="a", fpl_manager_id=1001), League(name="A", code="a", created_by_id=1)])
+    await db_session.commit()
+    with pytest.raises(ValidationError):
+        AdminPayoutRequest(winner_user_id=1)          # league_id is still required
+
+    job = await trigger_payouts(1, AdminPayoutRequest(league_id=1), db_session, None)
+    assert (job.kind, job.payload) == ("payout", {"league_id": 1, "winner_user_id": None})
+    await crud.mark_failed(db_session, job.id, "tie", None)
+    job = await trigger_payouts(1, AdminPayoutRequest(league_id=1, winner_user_id=1), db_session, None)
+    assert job.payload["winner_user_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_runner_retries_with_backoff_then_fails(db_session):
+    calls = []
+
+    async def flaky(db, payload):
+        calls.append(payload)
+        if len(calls) < 2:
+            raise RuntimeError("upstream down")
+        return {"n": len(calls)}
+
+    async def hopeless(db, payload):
+        raise ValueError("no pot")
+
+    runner = JobRunner(TestingSessionLocal, {"flaky": flaky, "hopeless": hopeless}, backoff_base=0)
+    ok, _ = await crud.enqueue(db_session, "flaky", {"x": 1})
+    bad, _ = await crud.enqueue(db_session, "hopeless", {})
+    other, _ = await crud.enqueue(db_session, "unknown", {})
+    await db_session.commit()
+
+    while await runner.run_once():
+        pass
+    assert len(calls) == 2
+    jobs = {j.id: j for j in await crud.list_jobs(db_session)}
+    for j in jobs.values():
+        await db_session.refresh(j)
+    assert (jobs[ok.id].status, jobs[ok.id].attempts, jobs[ok.id].result) == (JobStatus.succeeded, 2, {"n": 2})
+    # ValueError is permanent: one attempt, no retry
+    assert (jobs[bad.id].status, jobs[bad.id].attempts) == (JobStatus.failed, 1)
+    assert "no pot" in jobs[bad.id].last_error
+    # kinds this runner has no handler for are left alone
+    assert jobs[other.id].status == JobStatus.queued
+    assert runner.counts == {"retried": 1, "succeeded": 1, "failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_stale_running_jobs_are_requeued(db_session):
+    job, _ = await crud.enqueue(db_session, "noop", {})
+    await db_session.commit()
+    claimed = await crud.claim_next(db_session, "dead-worker", ["noop"])
+    assert claimed.id == job.id and claimed.status == JobStatus.running
+    assert await crud.claim_next(db_session, "other", ["noop"]) is None
+
+    await db_session.execute(
+        update(Job).where(Job.id == job.id).values(started_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    )
+    await db_session.commit()
+
+    async def noop(db, payload):
+        return None
+
+    runner = JobRunner(TestingSessionLocal, {"noop": noop}, stale_after=60)
+    assert await runner.run_once()
+    await db_session.refresh(job)
+    assert (job.status, job.attempts) == (JobStatus.succeeded, 2)
+    assert runner.counts["requeued"] == 1
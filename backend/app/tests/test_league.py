@@ -25,3 +25,37 @@ async def test_get_league(client, auth_headers, create_league):
     response = await client.get(f"/leagues/{league_id}", headers=auth_headers)
     assert response.status_code == 200
     assert response.json()["id"] == league_id
+
+@pytest.mark.asyncio
+async def test_standings_keyset_pages_and_me(client, db_session):
+    from app.main import app
+    from app.api.deps import get_current_user
+    from app.db.auth.models import User
+    from app.db.leagues.models import League
+    from app.services.scoring import upsert_standings
+
+    users = [User(id=i, email=f"s{i}@x.com", username=f"s{i}", fpl_manager_id=i) for i in range(1, 8)]
+    league = League(name="Big", code="big", created_by_id=1)
+    db_session.add_all([*users, league])
+    await db_session.commit()
+    await upsert_standings(db_session, league.id, 3, {1: 10, 2: 40, 3: 40, 4: 70, 5: 20, 6: 40, 7: 5})
+    await db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: users[4]
+    try:
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"after": cursor} if cursor else {})}
+            body = (await client.get(f"/leagues/{league.id}/standings", params=params)).json()
+            assert body["gameweek"] == 3
+            assert body["me"] == {"user_id": 5, "username": "s5", "event_points": 20, "total_points": 20, "rank": 5}
+            seen += [(r["user_id"], r["rank"]) for r in body["standings"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [(4, 1), (2, 2), (3, 2), (6, 2), (5, 5), (1, 6), (7, 7)]
+
+        bad = await client.get(f"/leagues/{league.id}/standings", params={"after": "nope"})
+        assert bad.status_code == 400
+    finally:
+        del app.dependency_overrides[get_current_user]
@@ -0,0 +1,133 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.api.routes.leagues import stream_standings
+from app.db.auth import models
+from app.db.jobs import crud as jobs_crud
+from app.db.leagues.crud import latest_standings_gameweek
+from app.db.leagues.models import League
+from app.services.fpl_adapter import FPLAdapter
+from app.services.jobs import JobRunner, league_job_handlers
+from app.services.live import HEARTBEAT, StandingsHub, StandingsPublisher
+from app.tests.conftest import TestingSessionLocal
+from app.tests.test_scoring import LIVE, squad
+
+
+def row(user_id: int, total: int, rank: int) -> dict:
+    return {"user_id": user_id, "username": f"u{user_id}", "event_points": total, "total_points": total, "rank": rank}
+
+
+def decode(message: bytes) -> tuple[str, dict]:
+    lines = dict(line.split(": ", 1) for line in message.decode().strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+async def drain(sub, n: int) -> list:
+    out, it = [], sub.messages(heartbeat=0.01)
+    async for message in it:
+        if message != HEARTBEAT:
+            out.append(message)
+        if len(out) == n:
+            break
+    return out
+
+
+@pytest.mark.asyncio
+async def test_diff_is_encoded_once_and_shared():
+    hub = StandingsHub()
+    hub.publish(1, 5, [row(1, 50, 1), row(2, 40, 2)])
+    a, b = hub.subscribe(1), hub.subscribe(1)
+
+    assert hub.publish(1, 5, [row(1, 50, 1), row(2, 40, 2)]) == 0      # unchanged: nothing sent
+    assert hub.publish(1, 5, [row(1, 50, 2), row(2, 60, 1)]) == 2
+
+    (snap_a, diff_a), (snap_b, diff_b) = await drain(a, 2), await drain(b, 2)
+    assert diff_a is diff_b                                              # same bytes object for every subscriber
+    assert decode(snap_a)[0] == "snapshot"
+    event, data = decode(diff_a)
+    assert event == "diff" and data["version"] == 2
+    assert [r["user_id"] for r in data["changed"]] == [1, 2] and data["removed"] == []
+    assert hub.stats()["messages_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_resynced_within_its_buffer():
+    hub = StandingsHub(max_buffer_bytes=400)
+    hub.publish(1, 5, [row(1, 0, 1)])
+    slow = hub.subscribe(1)
+    for pts in range(1, 30):
+        hub.publish(1, 5, [row(1, pts, 1)])
+        assert slow._buffered <= 400 or len(slow._queue) == 1
+
+    messages = await drain(slow, len(slow._queue))
+    assert slow.resyncs > 0
+    event, data = decode(messages[0])
+    assert event == "snapshot"
+    assert decode(messages[-1])[1]["version"] == 30
+
+    hub.unsubscribe(slow)
+    assert hub.stats()["channels"] == 0
+
+
+@pytest.mark.asyncio
+async def test_publishers_share_one_standings_writer(db_session):
+    users = [models.User(id=i, email=f"u{i}@x.com", username=f"u{i}", fpl_manager_id=1000 + i) for i in range(1, 3)]
+    league = League(name="A", code="a", created_by_id=1)
+    league.members.extend(users)
+    unwatched = League(name="B", code="b", created_by_id=1)
+    unwatched.members.extend(users)
+    db_session.add_all([*users, league, unwatched])
+    await db_session.commit()
+
+    adapter = MagicMock(spec=FPLAdapter)
+    adapter.current_event_id = AsyncMock(return_value=5)
+    adapter.get_event_live = AsyncMock(return_value=LIVE)
+    adapter.get_picks_bulk = AsyncMock(return_value={1001: squad(1, 1), 1002: squad(2, 11)})
+    adapter.deadline_passed = AsyncMock(return_value=False)
+
+    # two workers, each with a viewer of the league, and one job runner between them
+    hubs = [StandingsHub(), StandingsHub()]
+    subs = [hub.subscribe(league.id) for hub in hubs]
+    publishers = [StandingsPublisher(hub, adapter, TestingSessionLocal, interval=0) for hub in hubs]
+    runner = JobRunner(TestingSessionLocal, league_job_handlers(adapter, hubs[0]))
+
+    for publisher in publishers:
+        await publisher.run_once()
+    assert await runner.run_once() and not await runner.run_once()    # queued twice, written once
+    assert adapter.get_event_live.await_count == 1
+    # only the watched league is rescored
+    assert await latest_standings_gameweek(db_session, league.id) == 5
+    assert await latest_standings_gameweek(db_session, unwatched.id) is None
+    jobs = await jobs_crud.list_jobs(db_session, kind="recalculate")
+    assert {(j.dedup_key, tuple(j.payload["league_ids"])) for j in jobs} == {(f"recalculate:{league.id}:5", (league.id,))}
+
+    for publisher in publishers:
+        await publisher.run_once()                                      # reads the stored rows
+    for sub in subs:
+        event, data = decode((await drain(sub, 1))[-1])
+        assert event == "snapshot" and [r["user_id"] for r in data["standings"]] == [2, 1]
+    assert adapter.get_event_live.await_count == 1
+    # only the watched league is rescored
+    assert await latest_standings_gameweek(db_session, league.id) == 5
+    assert await latest_standings_gameweek(db_session, unwatched.id) is None
+    jobs = await jobs_crud.list_jobs(db_session, kind="recalculate")
+    assert {(j.dedup_key, tuple(j.payload["league_ids"])) for j in jobs} == {(f"recalculate:{league.id}:5", (league.id,))}
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_only_while_streaming(db_session):
+    db_session.add_all([models.User(id=1, email="u1@x.com", username="u1", fpl_manager_id=1001), League(name="A", code="a", created_by_id=1)])
+    await db_session.commit()
+    hub = StandingsHub()
+    hub.publish(1, 5, [row(1, 40, 1)])
+
+    # the client went away before the first chunk: nothing to leak
+    await stream_standings(1, db_session, hub, None)
+    assert hub.stats()["subscribers"] == 0
+
+    response = await stream_standings(1, db_session, hub, None)
+    body = response.body_iterator
+    assert decode(await body.__anext__())[0] == "snapshot"
+    assert hub.stats()["subscribers"] == 1
+    await body.aclose()
+    assert hub.stats()["subscribers"] == 0
@@ -0,0 +1,44 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from app.api.deps_fpl import get_fpl_adapter
+from app.main import app
+from app.services.fpl_adapter import FPLAdapter
+from app.services.players import PlayerStore
+
+
+def test_player_store_indexes_and_query(bootstrap_data):
+    store = PlayerStore.from_bootstrap(bootstrap_data)
+    assert len(store) == 40
+    assert store.get(7)["web_name"] == "Player7"
+    assert store.get(999) is None
+    assert {p["team"] for p in store.by_team(2)} == {2}
+
+    mids = store.query(position="MID", max_price=7.0, sort="now_cost", desc=False, limit=3)
+    assert [p["id"] for p in mids] == [3, 7, 11]
+    assert all(p["element_type"] == 3 and p["now_cost"] <= 70 for p in mids)
+
+    expected = sorted(bootstrap_data["elements"], key=lambda e: -e["total_points"])[:5]
+    assert [p["total_points"] for p in store.top("total_points", 5)] == [e["total_points"] for e in expected]
+
+    with pytest.raises(ValueError):
+        store.query(sort="web_name")
+
+
+@pytest.mark.asyncio
+async def test_players_endpoints(client, bootstrap_data):
+    adapter = MagicMock(spec=FPLAdapter)
+    adapter.player_store = AsyncMock(return_value=PlayerStore.from_bootstrap(bootstrap_data))
+    app.dependency_overrides[get_fpl_adapter] = lambda: adapter
+    try:
+        r = await client.get("/fpl/players", params={"team": 1, "sort": "form", "limit": 2})
+        assert r.status_code == 200
+        assert len(r.json()) == 2 and all(p["team"] == 1 for p in r.json())
+
+        r = await client.get("/fpl/players/top", params={"metric": "selected_by_percent", "n": 1})
+        assert r.json()[0]["id"] == 40
+
+        assert (await client.get("/fpl/players/5")).json()["web_name"] == "Player5"
+        assert (await client.get("/fpl/players/500")).status_code == 404
+        assert (await client.get("/fpl/players", params={"sort": "nope"})).status_code == 400
+    finally:
+        del app.dependency_overrides[get_fpl_adapter]
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.db.admin.enums import JobStatus
+from app.db.auth import models
+from app.db.fpl.crud import get_stored_picks, store_picks
+from app.services.fpl_adapter import FPLAdapter
+from app.db.jobs import crud as jobs_crud
+from app.services.jobs import JobRunner
+from app.services.prefetch import PREFETCH_JOB, PicksPrefetcher
+from app.tests.conftest import TestingSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_stores_missing_picks_and_retries_failures(db_session):
+    db_session.add_all([
+        models.User(id=i, email=f"p{i}@x.com", username=f"p{i}", fpl_manager_id=100 + i) for i in range(1, 5)
+    ])
+    await db_session.commit()
+
+    adapter = MagicMock(spec=FPLAdapter)
+    adapter.last_deadline_event_id = AsyncMock(return_value=7)
+    # 104 fails upstream the first time
+    adapter.get_picks_bulk = AsyncMock(side_effect=lambda ids, ev, c: {i: {"picks": [i]} for i in ids if i != 104})
+    prefetcher = PicksPrefetcher(adapter, concurrency=3)
+    # two workers' runners: both schedule the recurring job, one run is queued
+    runners = [
+        JobRunner(TestingSessionLocal, {PREFETCH_JOB: prefetcher.handle}, backoff_base=0, recurring={PREFETCH_JOB: 0})
+        for _ in range(2)
+    ]
+    for runner in runners:
+        await runner.schedule_recurring()
+    assert len(await jobs_crud.list_jobs(db_session, kind=PREFETCH_JOB)) == 1
+
+    async def run_next(runner):
+        assert await runner.run_once()
+        queued = await jobs_crud.list_jobs(db_session, status=JobStatus.queued, kind=PREFETCH_JOB)
+        assert len(queued) == 1                   # whoever ran it queued exactly one next run
+
+    await run_next(runners[0])
+    assert adapter.get_picks_bulk.await_count == 1
+    assert set(adapter.get_picks_bulk.await_args.args[0]) == {101, 102, 103, 104}
+    assert adapter.get_picks_bulk.await_args.args[2] == 3
+
+    adapter.get_picks_bulk.side_effect = lambda ids, ev, c: {i: {"picks": [i]} for i in ids}
+    await run_next(runners[1])
+    assert set(adapter.get_picks_bulk.await_args.args[0]) == {104}     # only what is still missing
+    await run_next(runners[0])
+    assert adapter.get_picks_bulk.await_count == 2                     # nobody missing: no upstream call
+    assert await get_stored_picks(db_session, [101, 104], 7) == {101: {"picks": [101]}, 104: {"picks": [104]}}
+    jobs = await jobs_crud.list_jobs(db_session, kind=PREFETCH_JOB)
+    assert [j.status for j in jobs] == [JobStatus.queued] + [JobStatus.succeeded] * 3
+    assert jobs[1].result == {"event_id": 7, "linked": 4, "fetched": 0, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_store_picks_skips_rows_another_writer_stored(db_session):
+    async with TestingSessionLocal() as other:
+        assert await store_picks(other, 7, {101: {"picks": [1]}, 102: {"picks": [2]}}) == 2
+        await other.commit()
+    # 101 and 102 are already there: only 103 is inserted, and nothing raises
+    assert await store_picks(db_session, 7, {101: {"picks": [9]}, 102: {"picks": [9]}, 103: {"picks": [3]}}) == 1
+    await db_session.commit()
+    stored = await get_stored_picks(db_session, [101, 102, 103], 7)
+    assert stored == {101: {"picks": [1]}, 102: {"picks": [2]}, 103: {"picks": [3]}}
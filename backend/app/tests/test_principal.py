@@ -0,0 +1,78 @@
+import pytest
+from app.api.deps import get_current_user
+from app.api.routes.admin.users import change_role, suspend_user
+from app.core import security
+from app.core.principal import PrincipalCache, principal_cache
+from app.core.rbac import require_role
+from app.db.admin.enums import Role, UserStatus
+from app.db.admin.schemas import AdminChangeRole
+from app.db.auth.models import User
+from app.services.cache import SQLiteCache
+
+
+async def make_user(db, n: int) -> User:
+    user = User(username=f"u{n}", email=f"u{n}@example.com", fpl_manager_id=1000 + n, role=Role.user)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_principal_is_cached_until_an_admin_changes_the_user(db_session):
+    user = await make_user(db_session, 1)
+    token = security.create_access_token({"sub": str(user.id)})
+    before = principal_cache.stats()
+
+    first = await get_current_user(token, db_session)
+    again = await get_current_user(token, db_session)
+    assert again is first and first.role == Role.user and first.fpl_manager_id == 1001
+    stats = principal_cache.stats()
+    assert stats["misses"] - before["misses"] == 1 and stats["hits"] - before["hits"] == 1
+
+    # suspending or promoting applies on the very next request
+    await suspend_user(user.id, True, db_session, None)
+    assert (await get_current_user(token, db_session)).status == UserStatus.suspended
+    await change_role(user.id, AdminChangeRole(role=Role.admin), db_session, None)
+    principal = await get_current_user(token, db_session)
+    assert await require_role(Role.admin)(principal) is principal
+    assert principal_cache.stats()["invalidations"] - before["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_expires_and_evicts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.core.principal.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl=30, max_entries=2)
+    cache.put(1, "a", "p1")
+    cache.put(2, "b", "p2")
+    cache.put(1, "c", "p1'")        # evicts (1, "a"), the least recently used
+    assert await cache.get(1, "a") is None and await cache.get(2, "b") == "p2"
+    now[0] += 31
+    assert await cache.get(2, "b") is None and cache.stats()["entries"] == 1
+    assert cache.stats()["hit_rate"] == 0.333
+
+    disabled = PrincipalCache(ttl=0)
+    disabled.put(1, "a", "p1")
+    assert await disabled.get(1, "a") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers_through_the_shared_tier(tmp_path):
+    shared = SQLiteCache(str(tmp_path / "shared.sqlite3"))
+    workers = [PrincipalCache(ttl=60, versions=shared) for _ in range(2)]
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return f"principal-{len(loads)}"
+
+    assert await workers[0].fetch(1, "tok", load) == "principal-1"
+    assert await workers[1].fetch(1, "tok", load) == "principal-2"
+    assert await workers[1].fetch(1, "tok", load) == "principal-2" and len(loads) == 2
+
+    # an admin change on worker 0 makes worker 1 reload on its next request
+    await workers[0].invalidate(1)
+    assert await workers[1].fetch(1, "tok", load) == "principal-3"
+    assert workers[1].stats()["stale"] == 1
+    assert await workers[1].fetch(1, "tok", load) == "principal-3" and len(loads) == 3
+    await shared.close()
@@ -0,0 +1,53 @@
+import aiohttp
+import pytest
+from fakefpl import FakeFPLConfig, serve
+from app.services.cache import MemoryLRUCache, TieredCache
+from app.services.fpl_adapter import FPLAdapter
+from app.services.players import PlayerStore
+from app.services.projections import ProjectionTable
+
+
+def test_projection_table_fixtures_and_availability(bootstrap_data):
+    bootstrap_data["elements"][0].update(status="i")                                       # team 1
+    bootstrap_data["elements"][1].update(status="d", chance_of_playing_next_round=50)      # team 2
+    store = PlayerStore.from_bootstrap(bootstrap_data)
+    fixtures = {
+        11: [{"team_h": 1, "team_a": 2, "team_h_difficulty": 2, "team_a_difficulty": 4},
+             {"team_h": 3, "team_a": 4, "team_h_difficulty": 3, "team_a_difficulty": 3}],
+        # team 1 plays twice, team 4 blanks
+        12: [{"team_h": 1, "team_a": 3, "team_h_difficulty": 3, "team_a_difficulty": 3},
+             {"team_h": 2, "team_a": 1, "team_h_difficulty": 3, "team_a_difficulty": 3}],
+    }
+    table = ProjectionTable.build(bootstrap_data, store, fixtures, [11, 12])
+    assert table.points.shape == (40, 2)
+
+    injured, doubtful, p3, p4 = (table.get(i) for i in (1, 2, 3, 4))
+    assert injured["expected"]["11"] == 0 and injured["expected"]["12"] > 0
+    assert p4["expected"]["12"] == 0                                                     # blank
+    rate = lambda i: (0.6 * float(f"{(i % 9) / 1.5:.1f}") + 0.4 * (i % 8) / 2)
+    assert doubtful["expected"]["11"] == pytest.approx(rate(2) * 0.5 * (1 + 0.1 * -1 - 0.05), abs=0.01)
+    assert p3["expected"]["11"] == pytest.approx(rate(3) * 1.05, abs=0.01)
+    # double gameweek: two home fixtures' worth for team 1's fit players
+    assert table.get(5)["expected"]["12"] == pytest.approx(rate(5) * (1.05 + 0.95), abs=0.01)
+
+    ranked = table.query(gameweeks=1, position="MID", limit=3)
+    assert [p["total"] for p in ranked] == sorted((p["total"] for p in ranked), reverse=True)
+    assert all(p["element_type"] == 3 and list(p["expected"]) == ["11"] for p in ranked)
+    assert table.captains(1)[0]["expected"]["11"] == max(table.points[:, 0].round(2))
+    with pytest.raises(ValueError):
+        table.query(sort="form")
+
+
+@pytest.mark.asyncio
+async def test_adapter_projections_rebuild_once_per_snapshot():
+    async with serve(FakeFPLConfig(players=700, entries=10, current_event=10)) as root:
+        async with aiohttp.ClientSession() as session:
+            adapter = FPLAdapter(session, cache=TieredCache(MemoryLRUCache()), base_url=f"{root}/api")
+            table = await adapter.projections()
+            assert table.events == [11, 12, 13, 14, 15, 16]
+            assert table.points.shape == (700, 6)
+            assert await adapter.projections() is table
+
+            # a new snapshot (e.g. after the TTL) triggers a rebuild
+            await adapter.refresh("bootstrap:static")
+            assert await adapter.projections() is not table
@@ -0,0 +1,46 @@
+import json
+import sys
+import pytest
+from fakefpl.data import FakeData, FakeFPLConfig
+from app.services.cache import MemoryLRUCache, SQLiteCache, TieredCache
+from app.services.records import Entry, History, Picks, revive, to_json
+from app.services.scoring import PicksMatrix
+
+
+def test_records_keep_the_schema_and_encode_to_json():
+    data = FakeData(FakeFPLConfig(players=60, entries=5, current_event=3))
+    raw = {**data.entry(2), "leagues": {"classic": [{"id": i, "name": f"L{i}"} for i in range(40)]}, "kit": "{...}"}
+    entry = Entry.from_api(raw)
+    assert (entry.id, entry.name, entry.summary_overall_points) == (2, "Team 2", raw["summary_overall_points"])
+    assert not hasattr(entry, "__dict__") and not hasattr(entry, "leagues")
+    assert json.loads(to_json(entry)) == {k: raw.get(k) for k in Entry.__match_args__}
+    assert sys.getsizeof(entry) < sys.getsizeof(raw)
+
+    picks = Picks.from_api(data.picks(2, 3))
+    assert len(picks.picks) == 15 and picks.entry_history.event == 3
+    assert Picks.coerce(json.loads(to_json(picks))) == picks
+    # scoring reads records and raw payloads (e.g. stored in the database) alike
+    matrix = PicksMatrix({1: picks, 2: data.picks(2, 3)})
+    assert (matrix.elements[0] == matrix.elements[1]).all()
+    assert (matrix.multipliers[0] == matrix.multipliers[1]).all()
+
+    history = History.from_api(data.history(2))
+    assert [r.event for r in history.current] == [1, 2, 3] and len(history.past) == 4
+
+    assert revive("entry:2", json.loads(to_json(entry))) == entry
+    assert revive("entry:3", {"not": "an entry"}) == Entry.from_api({})  # unknown fields dropped
+    assert revive("bootstrap:static", {"events": []}) == {"events": []}
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_hits_come_back_as_records(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = TieredCache(MemoryLRUCache(), SQLiteCache(path), revive=revive)
+    entry = Entry.from_api({"id": 7, "name": "Seven"})
+    await writer.set("entry:7", entry, ttl_seconds=60)
+    assert await writer.get("entry:7") is entry
+
+    reader = TieredCache(MemoryLRUCache(), SQLiteCache(path), revive=revive)
+    assert await reader.get("entry:7") == entry
+    assert isinstance(await reader.local.get("entry:7"), Entry)
+    await writer.close(); await reader.close()
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from aiohttp import ClientSession
+from app.services.fpl_adapter import FPLAdapter
+from app.services.cache import MemoryLRUCache, TieredCache
+from app.services.resilience import (
+    CircuitBreaker, CircuitOpenError, RateLimitExceeded, TokenBucket, UpstreamError,
+)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_delays_then_rejects():
+    bucket = TokenBucket(rate=10, burst=2, max_wait=0.15)
+    # reservations are taken in arrival order: 2 from the burst, the 3rd waits
+    # ~0.1s for a refill, the 4th would wait ~0.2s > max_wait and is rejected
+    results = await asyncio.gather(*(bucket.acquire() for _ in range(4)), return_exceptions=True)
+    assert results[:3] == [None, None, None]
+    assert isinstance(results[3], RateLimitExceeded)
+    assert bucket.stats()["delayed"] == 1 and bucket.stats()["rejected"] == 1
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.before_call(); breaker.record_failure()
+    breaker.before_call(); breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.reset_timeout = 60
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.reset_timeout = 0
+    breaker.before_call()  # the half-open trial
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_ignores_outcomes_from_an_earlier_state():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    slow = breaker.before_call()          # admitted while closed, still running
+    breaker.record_failure(breaker.before_call())
+    assert breaker.state == "open"
+    breaker.record_success(slow)          # late success does not close the circuit
+    assert breaker.state == "open"
+
+    trial = breaker.before_call()
+    breaker.record_failure(slow)          # late failure does not end the trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.state == "half_open"
+    breaker.record_success(trial)
+    assert breaker.state == "closed"
+    assert breaker.stats()["stale_outcomes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_adapter_fails_fast_when_upstream_is_down():
+    session = MagicMock(spec=ClientSession)
+    session.get.side_effect = asyncio.TimeoutError()
+    adapter = FPLAdapter(session, cache=TieredCache(MemoryLRUCache()))
+    adapter._breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    for entry_id in range(5):
+        with pytest.raises(Exception):
+            await adapter.get_entry(entry_id)
+
+    # only the first three reached upstream; the rest were rejected by the open breaker
+    assert session.get.call_count == 3
+    assert adapter.metrics()["circuit_breaker"]["state"] == "open"
+    assert adapter.metrics()["circuit_breaker"]["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_breaker():
+    adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()))
+    adapter._breaker = CircuitBreaker(failure_threshold=1)
+
+    async def not_found():
+        raise UpstreamError("FPL request failed: 404", 404)
+
+    with pytest.raises(UpstreamError):
+        await adapter._upstream(not_found)
+    assert adapter._breaker.state == "closed"
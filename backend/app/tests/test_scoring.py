@@ -0,0 +1,112 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.db.auth import models
+from app.db.leagues.crud import get_standings
+from app.db.leagues.models import League
+from app.services.fpl_adapter import FPLAdapter
+from app.services.scoring import PicksMatrix, live_points_vector, rank, score_leagues, upsert_standings
+
+LIVE = {"elements": [{"id": i, "stats": {"total_points": i}} for i in range(1, 21)]}
+
+
+def squad(first: int, captain: int, chip: str | None = None, hits: int = 0, with_multipliers: bool = True) -> dict:
+    picks = []
+    for pos, element in enumerate(range(first, first + 15), start=1):
+        pick = {"element": element, "position": pos, "is_captain": element == captain}
+        if with_multipliers:
+            pick["multiplier"] = 0 if pos > 11 else (2 if element == captain else 1)
+        picks.append(pick)
+    return {"picks": picks, "active_chip": chip, "entry_history": {"event_transfers_cost": hits}}
+
+
+def test_picks_matrix_applies_captain_bench_and_hits():
+    live = live_points_vector(LIVE)
+    matrix = PicksMatrix({
+        10: squad(1, captain=11),                                           # starters 1..11 = 66, +11 captain
+        20: squad(1, captain=11, hits=4),
+        30: squad(1, captain=11, chip="3xc", with_multipliers=False),       # triple captain: +22
+        40: squad(1, captain=11, chip="bboost", with_multipliers=False),    # bench 12..15 count: +54
+        50: squad(10, captain=24, with_multipliers=False),                  # 21..24 are not in live data
+    })
+    assert matrix.score(live).tolist() == [77, 73, 88, 131, 165]
+
+
+def test_rank_handles_ties():
+    assert [r["rank"] for r in rank({1: 50, 2: 70, 3: 50, 4: 10})] == [1, 2, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_score_leagues_fetches_each_manager_once(db_session):
+    users = [
+        models.User(id=i, email=f"u{i}@x.com", username=f"u{i}", fpl_manager_id=1000 + i)
+        for i in range(1, 4)
+    ]
+    db_session.add_all(users)
+    a = League(name="A", code="a", created_by_id=1); a.members.extend(users[:2])
+    b = League(name="B", code="b", created_by_id=1); b.members.extend(users[1:])
+    db_session.add_all([a, b])
+    await db_session.commit()
+
+    adapter = MagicMock(spec=FPLAdapter)
+    adapter.get_event_live = AsyncMock(return_value=LIVE)
+    adapter.get_picks_bulk = AsyncMock(return_value={1001: squad(1, 1), 1002: squad(2, 11), 1003: squad(1, 11)})
+    adapter.deadline_passed = AsyncMock(return_value=True)
+
+    results = await score_leagues(db_session, adapter, event_id=5)
+
+    adapter.get_event_live.assert_awaited_once_with(5)
+    assert set(adapter.get_picks_bulk.await_args.args[0]) == {1001, 1002, 1003}
+    assert results[a.id] == [{"user_id": 2, "points": 88, "rank": 1}, {"user_id": 1, "points": 67, "rank": 2}]
+    assert [r["user_id"] for r in results[b.id]] == [2, 3]
+
+    # past-deadline picks were stored: rescoring never asks upstream for them again
+    adapter.get_picks_bulk.reset_mock()
+    assert await score_leagues(db_session, adapter, event_id=5) == results
+    adapter.get_picks_bulk.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upsert_standings_only_writes_changes(db_session):
+    users = [models.User(id=i, email=f"u{i}@x.com", username=f"u{i}", fpl_manager_id=1000 + i) for i in range(1, 4)]
+    league = League(name="A", code="a", created_by_id=1)
+    db_session.add_all([*users, league])
+    await db_session.commit()
+
+    assert await upsert_standings(db_session, league.id, 1, {1: 50, 2: 60, 3: 40}) == 3
+    assert await upsert_standings(db_session, league.id, 2, {1: 70, 2: 50, 3: 30}) == 3
+    await db_session.commit()
+
+    # unchanged live points -> nothing written
+    assert await upsert_standings(db_session, league.id, 2, {1: 70, 2: 50, 3: 30}) == 0
+    # a late change for one member rewrites only that member's row when ranks hold
+    assert await upsert_standings(db_session, league.id, 2, {3: 40}) == 1
+    await db_session.commit()
+
+    rows = await get_standings(db_session, league.id, gameweek=2)
+    assert [(s.user_id, s.total_points, s.rank, name) for s, name in rows] == [
+        (1, 120, 1, "u1"), (2, 110, 2, "u2"), (3, 80, 3, "u3"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upsert_standings_sums_gaps_and_cascades_recalculations(db_session):
+    users = [models.User(id=i, email=f"u{i}@x.com", username=f"u{i}", fpl_manager_id=1000 + i) for i in range(1, 3)]
+    league = League(name="A", code="a", created_by_id=1)
+    db_session.add_all([*users, league])
+    await db_session.commit()
+
+    # GW2 was never materialized; GW3 still builds on GW1 instead of starting from zero
+    await upsert_standings(db_session, league.id, 1, {1: 50, 2: 60})
+    await upsert_standings(db_session, league.id, 3, {1: 30, 2: 10})
+    await upsert_standings(db_session, league.id, 4, {1: 5, 2: 5})
+    await db_session.commit()
+    rows = await get_standings(db_session, league.id, gameweek=4)
+    assert [(s.user_id, s.total_points, s.rank) for s, _ in rows] == [(1, 85, 1), (2, 75, 2)]
+
+    # a correction to GW1 is carried into the stored GW3 and GW4 totals and ranks
+    # (one GW1 row, both rows of GW3 and GW4)
+    assert await upsert_standings(db_session, league.id, 1, {1: 50, 2: 90}) == 5
+    await db_session.commit()
+    for gameweek, expected in ((3, [(2, 100, 1), (1, 80, 2)]), (4, [(2, 105, 1), (1, 85, 2)])):
+        rows = await get_standings(db_session, league.id, gameweek=gameweek)
+        assert [(s.user_id, s.total_points, s.rank) for s, _ in rows] == expected
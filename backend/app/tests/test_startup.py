@@ -0,0 +1,104 @@
+import asyncio
+import subprocess
+import sys
+import time
+import pytest
+from app.services.startup import StartupReport
+
+
+def steps(calls: list, fail: str | None = None, delay: float = 0.05):
+    def step(name):
+        async def run():
+            calls.append(name)
+            await asyncio.sleep(delay)
+            if name == fail:
+                raise RuntimeError("FPL down")
+        return run
+    return {name: step(name) for name in ("bootstrap", "projections", "database")}
+
+
+@pytest.mark.asyncio
+async def test_eager_startup_warms_concurrently_and_records_failures():
+    calls = []
+    report = StartupReport("eager", imports_s=0.25)
+    started = time.perf_counter()
+    await report.start(steps(calls, fail="projections"))
+    # three 50 ms steps side by side, not one after another
+    assert time.perf_counter() - started < 0.12
+    stats = report.stats()
+    assert stats["warm"] and stats["phases_ms"]["imports"] == 250.0
+    assert stats["warmup"]["bootstrap"]["ok"] and stats["warmup"]["database"]["ok"]
+    assert stats["warmup"]["projections"] == {"ok": False, "error": "RuntimeError: FPL down", "ms": pytest.approx(50, abs=40)}
+
+
+@pytest.mark.asyncio
+async def test_background_and_lazy_startup_do_not_block():
+    calls = []
+    background = StartupReport("background")
+    await background.start(steps(calls))
+    assert not background.warm and calls == []    # serving already; warm-up has not run yet
+    await asyncio.sleep(0.1)
+    assert background.warm and len(calls) == 3
+
+    lazy = StartupReport("lazy")
+    await lazy.start(steps(calls))
+    await asyncio.sleep(0.1)
+    assert not lazy.warm and len(calls) == 3
+
+    slow = StartupReport("eager")
+    await slow.start(steps([], delay=1.0), timeout=0.05)
+    assert slow.warmup["bootstrap"] == {"ok": False, "error": "timed out"}
+
+    with pytest.raises(ValueError):
+        StartupReport("sometimes")
+
+
+def test_importing_app_does_not_load_provider_sdks():
+    code = "import sys, app.main; print(sorted({'stripe', 'passlib.context'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+@pytest.mark.asyncio
+async def test_lazy_refresher_leaves_unfilled_keys_to_the_first_request():
+    from unittest.mock import AsyncMock, MagicMock
+    from aiohttp import ClientSession
+    from app.services.cache import MemoryLRUCache, TieredCache
+    from app.services.fpl_adapter import FPLAdapter
+    from app.services.refresher import BackgroundRefresher
+
+    adapter = FPLAdapter(MagicMock(spec=ClientSession), cache=TieredCache(MemoryLRUCache()))
+    upstream = adapter._get_json = AsyncMock(return_value={"events": [{"id": 1}]})
+    refresher = BackgroundRefresher(adapter, fill_empty=False)
+
+    await refresher.run_once()
+    assert upstream.await_count == 0          # nothing downloaded at startup
+    await adapter.bootstrap_static()
+    assert upstream.await_count == 1
+    adapter._last_good["bootstrap:static"] = (0.0, adapter._last_good["bootstrap:static"][1])  # make it due
+    await refresher.run_once()
+    assert upstream.await_count == 2          # kept warm once a request has filled it
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode, fetches", [("lazy", False), ("background", True)])
+async def test_lifespan_goes_upstream_only_when_not_lazy(db_session, monkeypatch, mode, fetches):
+    from unittest.mock import AsyncMock
+    from app import main
+    from app.core.config import settings
+    from app.services.fpl_adapter import FPLAdapter
+    from app.tests.conftest import TestingSessionLocal
+
+    for name, value in {
+        "STARTUP_MODE": mode, "FPL_ARCHIVE_PATH": "", "FPL_REFRESH_INTERVAL": 0.02,
+        "LIVE_PUSH_INTERVAL": 0.5, "FPL_PREFETCH_INTERVAL": 0.5, "JOB_POLL_INTERVAL": 0.02,
+        "JOB_CONCURRENCY": 1,   # the in-memory test database is a single shared connection
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(main, "AsyncSessionLocal", TestingSessionLocal)
+    upstream = AsyncMock(return_value={"events": [], "elements": [], "teams": []})
+    monkeypatch.setattr(FPLAdapter, "_get_json", upstream)
+
+    async with main.lifespan(main.app):
+        await asyncio.sleep(0.2)     # refresher, publisher and job runner all get to tick
+    assert (upstream.await_count > 0) == fetches
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta, timezone
+from app.services.ttl import DeadlineTTLPolicy
+
+
+def test_deadline_ttl_policy_phases():
+    now = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+    iso = lambda d: d.isoformat().replace("+00:00", "Z")
+    phases = {"quiet": {"bootstrap": 1800}, "deadline": {"bootstrap": 60}, "live": {"bootstrap": 120}}
+    policy = DeadlineTTLPolicy(phases, deadline_window=3600, final_ttl=999)
+    assert policy.ttl_for("bootstrap:static", now) is None          # no calendar yet: static policy applies
+
+    events = [
+        {"id": 8, "deadline_time": iso(now - timedelta(days=7)), "finished": True, "data_checked": True},
+        {"id": 9, "deadline_time": iso(now + timedelta(minutes=30)), "finished": False},
+    ]
+    policy.update(events)
+    assert policy.phase(now) == "deadline"
+    assert policy.phase(now - timedelta(days=2)) == "quiet"
+    assert policy.phase(now + timedelta(hours=1)) == "live"           # no refetch needed to notice the deadline
+    assert policy.ttl_for("bootstrap:static", now) == 60
+    assert policy.ttl_for("live:8", now) == policy.ttl_for("picks:123:8", now) == 999
+    assert policy.ttl_for("live:9", now) is None                      # phase does not name it: static policy
@@ -0,0 +1,68 @@
+"""
+FPL adapter throughput against the local fake FPL server (no real FPL traffic).
+
+    cd backend && python -m benchmarks.adapter_bench [--clients 200] [--entries 2000] [--latency 0.08] [--error-rate 0.0] [--rate 50]
+
+Each simulated client looks up a random batch of managers through
+get_entries(); we report wall time, adapter-side latency percentiles and how
+many requests actually reached "upstream". The outbound rate limit is the
+configured one unless --rate overrides it.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import aiohttp
+
+from fakefpl import FakeFPLConfig, serve
+from app.services.cache import MemoryLRUCache, TieredCache
+from app.services.fpl_adapter import FPLAdapter
+from app.services.resilience import TokenBucket
+
+
+async def run(clients: int, entries: int, batch: int, latency: float, error_rate: float, rate: float | None):
+    config = FakeFPLConfig(entries=entries, latency=latency, jitter=latency / 2, error_rate=error_rate)
+    async with serve(config) as root, aiohttp.ClientSession() as session:
+        adapter = FPLAdapter(session, cache=TieredCache(MemoryLRUCache()), base_url=f"{root}/api")
+        if rate is not None:
+            adapter._limiter = TokenBucket(rate=rate, burst=int(rate), max_wait=30)
+        timings = []
+
+        async def client(n: int):
+            rng = random.Random(n)
+            started = time.perf_counter()
+            await adapter.get_entries(rng.sample(range(1, entries + 1), batch))
+            timings.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(n) for n in range(clients)))
+        wall = time.perf_counter() - started
+
+        async with session.get(f"{root}/_fake/stats") as resp:
+            upstream = await resp.json()
+        timings.sort()
+        print(f"{clients} clients x {batch} ids over {entries} managers, {latency * 1000:.0f}ms upstream latency")
+        print(f"  wall {wall:.2f}s   p50 {statistics.median(timings) * 1000:.0f}ms   "
+              f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:.0f}ms")
+        print(f"  upstream requests: {sum(v for k, v in upstream.items() if k.startswith('/api'))}   "
+              f"injected errors: {upstream.get('errors_injected', 0)}")
+        print(f"  rate limiter: {adapter.metrics()['rate_limiter']}")
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--clients", type=int, default=200)
+    p.add_argument("--entries", type=int, default=2000)
+    p.add_argument("--batch", type=int, default=20)
+    p.add_argument("--latency", type=float, default=0.08)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--rate", type=float, default=None, help="outbound requests/s (default: FPL_RATE_LIMIT_PER_SEC)")
+    args = p.parse_args()
+    asyncio.run(run(args.clients, args.entries, args.batch, args.latency, args.error_rate, args.rate))
+
+
+if __name__ == "__main__":
+    main()
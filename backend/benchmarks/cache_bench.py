@@ -0,0 +1,87 @@
+"""
+Cache get/set throughput under 10k concurrent tasks.
+
+    cd backend && python -m benchmarks.cache_bench [--tasks 10000] [--ops 20]
+
+Compares the old single-global-lock cache (the SimpleTTLCache that used to
+live in fpl_adapter) against MemoryLRUCache (lock-free) and TieredCache
+(lock-free reads, sharded write locks).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from app.services.cache import MemoryLRUCache, TieredCache
+
+
+class GlobalLockCache:
+    """Reference copy of the previous SimpleTTLCache: one asyncio.Lock for everything."""
+
+    def __init__(self):
+        self._store: Dict[str, tuple[datetime, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str):
+        async with self._lock:
+            v = self._store.get(key)
+            if not v: return None
+            exp, data = v
+            if datetime.now(timezone.utc) > exp:
+                del self._store[key]
+                return None
+            return data
+
+    async def set(self, key: str, data: Any, ttl_seconds: int = 60):
+        async with self._lock:
+            self._store[key] = (datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds), data)
+
+
+async def run(cache, tasks: int, ops: int, keys: int) -> tuple[float, float]:
+    value = {"id": 1, "name": "x" * 64}
+    for i in range(keys):
+        await cache.set(f"entry:{i}", value, ttl_seconds=600)
+
+    async def reader(n: int):
+        for j in range(ops):
+            await cache.get(f"entry:{(n + j) % keys}")
+            # yield like a real request handler would between cache calls
+            await asyncio.sleep(0)
+
+    async def writer(n: int):
+        for j in range(ops):
+            await cache.set(f"entry:{(n + j) % keys}", value, ttl_seconds=600)
+            await asyncio.sleep(0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(reader(n) for n in range(tasks)))
+    t1 = time.perf_counter()
+    await asyncio.gather(*(writer(n) for n in range(tasks)))
+    t2 = time.perf_counter()
+    total = tasks * ops
+    return total / (t1 - t0), total / (t2 - t1)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--ops", type=int, default=20, help="operations per task")
+    parser.add_argument("--keys", type=int, default=2_000)
+    args = parser.parse_args()
+
+    caches = {
+        "global-lock (old)": GlobalLockCache(),
+        "MemoryLRUCache": MemoryLRUCache(max_entries=args.keys * 2),
+        "TieredCache (L1 only)": TieredCache(MemoryLRUCache(max_entries=args.keys * 2)),
+    }
+    print(f"{args.tasks} concurrent tasks x {args.ops} ops, {args.keys} keys")
+    print(f"{'cache':<24}{'get ops/s':>14}{'set ops/s':>14}")
+    for name, cache in caches.items():
+        gets, sets = await run(cache, args.tasks, args.ops, args.keys)
+        print(f"{name:<24}{gets:>14,.0f}{sets:>14,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+"""A local stand-in for the FPL API, for offline development, tests and load runs."""
+from fakefpl.data import FakeData, FakeFPLConfig
+from fakefpl.server import create_app, serve
+
+__all__ = ["FakeData", "FakeFPLConfig", "create_app", "serve"]
@@ -0,0 +1,38 @@
+"""
+Run the fake FPL server:
+
+    cd backend && python -m fakefpl --port 8001 --latency 0.08 --jitter 0.04 --error-rate 0.02
+
+then start the app against it:
+
+    FPL_API_BASE_URL=http://localhost:8001/api FPL_LOGIN_URL=http://localhost:8001/accounts/login/ uvicorn app.main:app
+"""
+from __future__ import annotations
+import argparse
+from aiohttp import web
+from fakefpl.data import FakeFPLConfig
+from fakefpl.server import create_app
+
+
+def main():
+    defaults = FakeFPLConfig()
+    p = argparse.ArgumentParser(prog="python -m fakefpl", description="Local stand-in for the FPL API")
+    p.add_argument("--host", default="localhost")
+    p.add_argument("--port", type=int, default=8001)
+    p.add_argument("--fixtures", dest="fixtures_dir", default=None, help="directory of recorded payloads (see fakefpl.record)")
+    p.add_argument("--seed", type=int, default=defaults.seed)
+    p.add_argument("--players", type=int, default=defaults.players)
+    p.add_argument("--entries", type=int, default=defaults.entries)
+    p.add_argument("--current-event", type=int, default=defaults.current_event)
+    p.add_argument("--pad-bytes", type=int, default=defaults.pad_bytes, help="extra bytes per player in bootstrap-static")
+    p.add_argument("--latency", type=float, default=defaults.latency, help="seconds added to every response")
+    p.add_argument("--jitter", type=float, default=defaults.jitter)
+    p.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    p.add_argument("--error-status", type=int, default=defaults.error_status)
+    args = vars(p.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    web.run_app(create_app(FakeFPLConfig(**args)), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
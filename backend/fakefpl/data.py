@@ -0,0 +1,270 @@
+"""
+Payloads for the fake FPL server.
+
+Everything is generated deterministically from a seed, in the same shape FPL
+serves, and sized by the config (number of players, managers, padding per
+player). Any file found in `fixtures_dir` replaces the generated payload for
+that path, so responses recorded from the real API with `python -m
+fakefpl.record` are served instead:
+
+    bootstrap-static.json
+    entry/<entry_id>.json
+    picks/<entry_id>-<event_id>.json
+    history/<entry_id>.json
+    live/<event_id>.json
+    fixtures/<event_id>.json
+"""
+from __future__ import annotations
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+POSITIONS = [(1, "GKP", "Goalkeeper", 2), (2, "DEF", "Defender", 5), (3, "MID", "Midfielder", 5), (4, "FWD", "Forward", 3)]
+TEAMS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Burnley", "Chelsea", "Crystal Palace",
+    "Everton", "Fulham", "Leeds", "Liverpool", "Man City", "Man Utd", "Newcastle", "Nott'm Forest",
+    "Sunderland", "Spurs", "West Ham", "Wolves",
+]
+
+
+@dataclass
+class FakeFPLConfig:
+    seed: int = 1
+    players: int = 700
+    entries: int = 10_000
+    current_event: int = 10
+    events: int = 38
+    pad_bytes: int = 0                   # extra bytes per player in bootstrap-static (payload size knob)
+    latency: float = 0.0                 # seconds added to every response
+    jitter: float = 0.0                  # +/- uniform jitter on top of latency
+    error_rate: float = 0.0              # fraction of requests answered with error_status
+    error_status: int = 503
+    password: str = "fake"               # accepted by /accounts/login/ for any email
+    fixtures_dir: Optional[str] = None
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def update(self, **changes: Any):
+        for k, v in changes.items():
+            if not hasattr(self, k) or k == "now":
+                raise ValueError(f"Unknown fake FPL setting: {k}")
+            setattr(self, k, type(getattr(self, k))(v) if getattr(self, k) is not None else v)
+
+
+def _iso(d: datetime) -> str:
+    return d.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FakeData:
+    def __init__(self, config: FakeFPLConfig):
+        self.config = config
+        self._recorded = Path(config.fixtures_dir) if config.fixtures_dir else None
+        self._bootstrap = self._load("bootstrap-static.json") or self._make_bootstrap()
+        self.elements: List[dict] = self._bootstrap["elements"]
+        self._live: Dict[int, dict] = {}
+        self._by_position: Dict[int, List[int]] = {}
+        for e in self.elements:
+            self._by_position.setdefault(e["element_type"], []).append(e["id"])
+
+    def _load(self, rel: str) -> Optional[Any]:
+        if self._recorded is None:
+            return None
+        path = self._recorded / rel
+        return json.loads(path.read_text()) if path.exists() else None
+
+    def _rng(self, *parts: int) -> random.Random:
+        return random.Random(hash((self.config.seed, *parts)))
+
+    # --- bootstrap-static ---
+    def _deadline(self, event_id: int) -> datetime:
+        # the current gameweek's deadline passed a day ago; one gameweek a week
+        return self.config.now - timedelta(days=1) + timedelta(days=7 * (event_id - self.config.current_event))
+
+    def _make_events(self) -> List[dict]:
+        cur = self.config.current_event
+        return [
+            {
+                "id": i,
+                "name": f"Gameweek {i}",
+                "deadline_time": _iso(self._deadline(i)),
+                "finished": i < cur,
+                "data_checked": i < cur,
+                "is_previous": i == cur - 1,
+                "is_current": i == cur,
+                "is_next": i == cur + 1,
+            }
+            for i in range(1, self.config.events + 1)
+        ]
+
+    def _make_bootstrap(self) -> dict:
+        rng = self._rng(0)
+        teams = [
+            {"id": i, "name": name, "short_name": name[:3].upper(), "strength": rng.randint(2, 5)}
+            for i, name in enumerate(TEAMS, start=1)
+        ]
+        element_types = [
+            {"id": pid, "singular_name_short": short, "singular_name": name, "squad_select": count}
+            for pid, short, name, count in POSITIONS
+        ]
+        elements = []
+        position_ids = [pid for pid, *_ in POSITIONS]
+        for i in range(1, self.config.players + 1):
+            # the first four cover every position; after that roughly FPL's squad mix
+            element_type = position_ids[i - 1] if i <= 4 else [1, 2, 2, 3, 3, 4][i % 6]
+            minutes = rng.randint(0, 90 * (self.config.current_event - 1))
+            total = rng.randint(0, max(1, minutes // 30))
+            games = max(1, minutes // 90)
+            el = {
+                "id": i,
+                "web_name": f"Player{i}",
+                "team": (i - 1) % len(teams) + 1,
+                "element_type": element_type,
+                "now_cost": rng.randint(40, 140),
+                "total_points": total,
+                "event_points": rng.randint(0, 12),
+                "minutes": minutes,
+                "form": f"{rng.uniform(0, 8):.1f}",
+                "points_per_game": f"{total / games:.1f}",
+                "selected_by_percent": f"{rng.uniform(0, 60):.1f}",
+                "status": "a" if rng.random() > 0.1 else "i",
+                "news": "",
+            }
+            if self.config.pad_bytes:
+                el["news"] = "x" * self.config.pad_bytes
+            elements.append(el)
+        return {"events": self._make_events(), "teams": teams, "element_types": element_types, "elements": elements}
+
+    def bootstrap(self) -> dict:
+        return self._bootstrap
+
+    # --- managers ---
+    def has_entry(self, entry_id: int) -> bool:
+        return 1 <= entry_id <= self.config.entries or self._load(f"entry/{entry_id}.json") is not None
+
+    def entry(self, entry_id: int) -> dict:
+        recorded = self._load(f"entry/{entry_id}.json")
+        if recorded is not None:
+            return recorded
+        rng = self._rng(1, entry_id)
+        return {
+            "id": entry_id,
+            "name": f"Team {entry_id}",
+            "player_first_name": "Fake",
+            "player_last_name": f"Manager{entry_id}",
+            "started_event": 1,
+            "favourite_team": rng.randint(1, len(TEAMS)),
+            "summary_overall_points": rng.randint(200, 700),
+            "summary_overall_rank": rng.randint(1, 10_000_000),
+            "summary_event_points": rng.randint(10, 110),
+            "current_event": self.config.current_event,
+        }
+
+    def picks(self, entry_id: int, event_id: int) -> dict:
+        recorded = self._load(f"picks/{entry_id}-{event_id}.json")
+        if recorded is not None:
+            return recorded
+        rng = self._rng(2, entry_id, event_id)
+        squad = []
+        for pid, _, _, count in POSITIONS:
+            squad += rng.sample(self._by_position.get(pid, []), min(count, len(self._by_position.get(pid, []))))
+        # 1 GKP + 10 outfield start; the second keeper and 3 outfielders are benched
+        gk, outfield = squad[:2], squad[2:]
+        rng.shuffle(outfield)
+        order = [gk[0], *outfield[:10], gk[1], *outfield[10:]] if len(gk) == 2 else squad
+        captain, vice = rng.sample(order[:11], 2) if len(order) >= 11 else (order[0], order[0])
+        picks = [
+            {
+                "element": element,
+                "position": pos,
+                "multiplier": 0 if pos > 11 else (2 if element == captain else 1),
+                "is_captain": element == captain,
+                "is_vice_captain": element == vice,
+            }
+            for pos, element in enumerate(order, start=1)
+        ]
+        return {
+            "active_chip": None,
+            "automatic_subs": [],
+            "entry_history": {
+                "event": event_id,
+                "points": rng.randint(10, 110),
+                "total_points": rng.randint(200, 700),
+                "event_transfers": rng.randint(0, 2),
+                "event_transfers_cost": rng.choice([0, 0, 0, 4]),
+                "bank": rng.randint(0, 30),
+                "value": rng.randint(990, 1050),
+            },
+            "picks": picks,
+        }
+
+    def history(self, entry_id: int) -> dict:
+        recorded = self._load(f"history/{entry_id}.json")
+        if recorded is not None:
+            return recorded
+        total, current = 0, []
+        for event_id in range(1, self.config.current_event + 1):
+            summary = self.picks(entry_id, event_id)["entry_history"]
+            total += summary["points"] - summary["event_transfers_cost"]
+            current.append({**summary, "total_points": total, "rank": None, "overall_rank": None, "points_on_bench": 0})
+        rng = self._rng(5, entry_id)
+        past = [
+            {"season_name": f"{y}/{(y + 1) % 100:02d}", "total_points": rng.randint(1500, 2600), "rank": rng.randint(1, 10_000_000)}
+            for y in range(2021, 2025)
+        ]
+        return {"current": current, "past": past, "chips": []}
+
+    # --- gameweek data ---
+    def live(self, event_id: int) -> dict:
+        if event_id not in self._live:
+            self._live[event_id] = self._load(f"live/{event_id}.json") or self._make_live(event_id)
+        return self._live[event_id]
+
+    def _make_live(self, event_id: int) -> dict:
+        rng = self._rng(3, event_id)
+        elements = []
+        for e in self.elements:
+            minutes = rng.choice([0, 0, 90, 90, 90, 60, 25])
+            points = 0 if minutes == 0 else rng.choice([1, 2, 2, 2, 3, 5, 6, 8, 12])
+            elements.append({
+                "id": e["id"],
+                "stats": {"minutes": minutes, "total_points": points, "bonus": rng.choice([0, 0, 0, 1, 2, 3])},
+                "explain": [],
+            })
+        return {"elements": elements}
+
+    def fixtures(self, event_id: int) -> List[dict]:
+        recorded = self._load(f"fixtures/{event_id}.json")
+        if recorded is not None:
+            return recorded
+        rng = self._rng(4, event_id)
+        teams = list(range(1, len(TEAMS) + 1))
+        rng.shuffle(teams)
+        finished = event_id < self.config.current_event
+        kickoff = self._deadline(event_id) + timedelta(hours=2)
+        return [
+            {
+                "id": (event_id - 1) * 10 + n + 1,
+                "event": event_id,
+                "team_h": teams[2 * n],
+                "team_a": teams[2 * n + 1],
+                "team_h_difficulty": rng.randint(2, 5),
+                "team_a_difficulty": rng.randint(2, 5),
+                "kickoff_time": _iso(kickoff + timedelta(hours=3 * (n // 3))),
+                "started": event_id <= self.config.current_event,
+                "finished": finished,
+                "team_h_score": rng.randint(0, 4) if event_id <= self.config.current_event else None,
+                "team_a_score": rng.randint(0, 4) if event_id <= self.config.current_event else None,
+            }
+            for n in range(len(teams) // 2)
+        ]
+
+    def my_team(self, entry_id: int) -> dict:
+        current = self.picks(entry_id, self.config.current_event)
+        costs = {e["id"]: e["now_cost"] for e in self.elements}
+        return {
+            "picks": [{**p, "selling_price": costs.get(p["element"], 0)} for p in current["picks"]],
+            "chips": [],
+            "transfers": {"bank": current["entry_history"]["bank"], "limit": 1, "made": 0},
+        }
@@ -0,0 +1,53 @@
+"""
+Record real FPL responses into a fixtures directory the fake server serves:
+
+    cd backend && python -m fakefpl.record fixtures/ --entries 1 2 3 --events 1 2
+
+Only public endpoints are recorded; keep request volumes small.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import aiohttp
+
+BASE = "https://fantasy.premierleague.com/api"
+
+
+async def record(out: Path, entries: list[int], events: list[int], base: str = BASE):
+    targets = {"bootstrap-static.json": f"{base}/bootstrap-static/"}
+    for event_id in events:
+        targets[f"live/{event_id}.json"] = f"{base}/event/{event_id}/live/"
+        targets[f"fixtures/{event_id}.json"] = f"{base}/fixtures/?event={event_id}"
+        for entry_id in entries:
+            targets[f"picks/{entry_id}-{event_id}.json"] = f"{base}/entry/{entry_id}/event/{event_id}/picks/"
+    for entry_id in entries:
+        targets[f"entry/{entry_id}.json"] = f"{base}/entry/{entry_id}/"
+        targets[f"history/{entry_id}.json"] = f"{base}/entry/{entry_id}/history/"
+
+    async with aiohttp.ClientSession() as session:
+        for rel, url in targets.items():
+            async with session.get(url) as resp:
+                if resp.status != 200:
+                    print(f"skip {rel}: {resp.status}")
+                    continue
+                path = out / rel
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(await resp.json(), separators=(",", ":")))
+                print(f"wrote {rel}")
+            await asyncio.sleep(0.2)  # be polite
+
+
+def main():
+    p = argparse.ArgumentParser(prog="python -m fakefpl.record")
+    p.add_argument("out", type=Path)
+    p.add_argument("--entries", type=int, nargs="*", default=[])
+    p.add_argument("--events", type=int, nargs="*", default=[])
+    p.add_argument("--base", default=BASE)
+    args = p.parse_args()
+    asyncio.run(record(args.out, args.entries, args.events, args.base))
+
+
+if __name__ == "__main__":
+    main()
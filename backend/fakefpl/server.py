@@ -0,0 +1,182 @@
+"""
+aiohttp app that stands in for fantasy.premierleague.com.
+
+Serves the API paths the adapter uses under /api, plus the login form post,
+with the latency and error behaviour described by FakeFPLConfig. Two extra
+endpoints help tests and load runs:
+
+    GET  /_fake/stats    request counts per route, errors injected
+    POST /_fake/config   change latency/error settings on the fly (JSON body)
+"""
+from __future__ import annotations
+import asyncio
+import json
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Optional
+from aiohttp import web
+from fakefpl.data import FakeData, FakeFPLConfig
+
+CONFIG_KEY = web.AppKey("config", FakeFPLConfig)
+DATA_KEY = web.AppKey("data", FakeData)
+STATS_KEY = web.AppKey("stats", Counter)
+
+COOKIE = "pl_profile"
+
+
+def _entry_from_cookie(request: web.Request) -> Optional[int]:
+    value = request.cookies.get(COOKIE, "")
+    return int(value.removeprefix("fake-")) if value.startswith("fake-") and value[5:].isdigit() else None
+
+
+@web.middleware
+async def faults(request: web.Request, handler):
+    """Latency, injected errors and per-route counters for every FPL path."""
+    if request.path.startswith("/_fake/"):
+        return await handler(request)
+    config, stats = request.app[CONFIG_KEY], request.app[STATS_KEY]
+    route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+    stats[route] += 1
+    delay = config.latency + random.uniform(-config.jitter, config.jitter)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    if config.error_rate and random.random() < config.error_rate:
+        stats["errors_injected"] += 1
+        return web.json_response({"detail": "injected failure"}, status=config.error_status)
+    return await handler(request)
+
+
+def _int(request: web.Request, name: str) -> int:
+    try:
+        return int(request.match_info[name])
+    except ValueError:
+        raise web.HTTPNotFound()
+
+
+async def bootstrap_static(request: web.Request):
+    return web.json_response(request.app[DATA_KEY].bootstrap())
+
+
+async def entry(request: web.Request):
+    data, entry_id = request.app[DATA_KEY], _int(request, "entry_id")
+    if not data.has_entry(entry_id):
+        raise web.HTTPNotFound()
+    return web.json_response(data.entry(entry_id))
+
+
+async def picks(request: web.Request):
+    data, entry_id, event_id = request.app[DATA_KEY], _int(request, "entry_id"), _int(request, "event_id")
+    # like FPL: no picks for unknown managers or gameweeks whose deadline has not passed
+    if not data.has_entry(entry_id) or not 1 <= event_id <= request.app[CONFIG_KEY].current_event:
+        raise web.HTTPNotFound()
+    return web.json_response(data.picks(entry_id, event_id))
+
+
+async def history(request: web.Request):
+    data, entry_id = request.app[DATA_KEY], _int(request, "entry_id")
+    if not data.has_entry(entry_id):
+        raise web.HTTPNotFound()
+    return web.json_response(data.history(entry_id))
+
+
+async def event_live(request: web.Request):
+    event_id = _int(request, "event_id")
+    if not 1 <= event_id <= request.app[CONFIG_KEY].events:
+        raise web.HTTPNotFound()
+    if event_id > request.app[CONFIG_KEY].current_event:
+        return web.json_response({"elements": []})
+    return web.json_response(request.app[DATA_KEY].live(event_id))
+
+
+async def fixtures(request: web.Request):
+    config = request.app[CONFIG_KEY]
+    event = request.query.get("event")
+    events = [int(event)] if event and event.isdigit() else range(1, config.events + 1)
+    return web.json_response([f for e in events for f in request.app[DATA_KEY].fixtures(e)])
+
+
+async def me(request: web.Request):
+    entry_id = _entry_from_cookie(request)
+    if entry_id is None:
+        raise web.HTTPForbidden()
+    return web.json_response({"player": {"entry": entry_id, "first_name": "Fake", "last_name": f"Manager{entry_id}"}})
+
+
+async def my_team(request: web.Request):
+    entry_id = _int(request, "entry_id")
+    if _entry_from_cookie(request) != entry_id:
+        raise web.HTTPForbidden()
+    return web.json_response(request.app[DATA_KEY].my_team(entry_id))
+
+
+async def login(request: web.Request):
+    """FPL answers the form post with a redirect; failures carry state=fail in the query."""
+    form = await request.post()
+    config = request.app[CONFIG_KEY]
+    if form.get("password") != config.password:
+        raise web.HTTPFound("/a/login?state=fail&reason=credentials")
+    # every email maps to a stable manager id
+    entry_id = sum(map(ord, str(form.get("login", "")))) % config.entries + 1
+    resp = web.HTTPFound("/a/login?state=success")
+    resp.set_cookie(COOKIE, f"fake-{entry_id}", path="/")
+    raise resp
+
+
+async def login_landing(request: web.Request):
+    return web.Response(text="ok")
+
+
+async def fake_stats(request: web.Request):
+    return web.json_response(dict(request.app[STATS_KEY]))
+
+
+async def fake_config(request: web.Request):
+    config = request.app[CONFIG_KEY]
+    try:
+        config.update(**(await request.json()))
+    except (ValueError, TypeError) as e:
+        return web.json_response({"detail": str(e)}, status=400)
+    if request.query.get("reset_stats"):
+        request.app[STATS_KEY].clear()
+    return web.json_response(vars(config), dumps=partial(json.dumps, default=str))
+
+
+def create_app(config: Optional[FakeFPLConfig] = None) -> web.Application:
+    config = config or FakeFPLConfig()
+    app = web.Application(middlewares=[faults])
+    app[CONFIG_KEY] = config
+    app[DATA_KEY] = FakeData(config)
+    app[STATS_KEY] = Counter()
+    app.router.add_get("/api/bootstrap-static/", bootstrap_static)
+    app.router.add_get("/api/entry/{entry_id}/", entry)
+    app.router.add_get("/api/entry/{entry_id}/event/{event_id}/picks/", picks)
+    app.router.add_get("/api/entry/{entry_id}/history/", history)
+    app.router.add_get("/api/event/{event_id}/live/", event_live)
+    app.router.add_get("/api/fixtures/", fixtures)
+    app.router.add_get("/api/me/", me)
+    app.router.add_get("/api/my-team/{entry_id}/", my_team)
+    app.router.add_post("/accounts/login/", login)
+    app.router.add_get("/a/login", login_landing)
+    app.router.add_get("/_fake/stats", fake_stats)
+    app.router.add_post("/_fake/config", fake_config)
+    return app
+
+
+@asynccontextmanager
+async def serve(config: Optional[FakeFPLConfig] = None, port: int = 0) -> AsyncIterator[str]:
+    """
+    Run the fake server in the current event loop and yield its site root
+    (e.g. http://localhost:41234). Point the adapter at `<root>/api` and the
+    login form at `<root>/accounts/login/`. The root names `localhost` rather
+    than an IP so aiohttp's cookie jar will store the login cookie.
+    """
+    runner = web.AppRunner(create_app(config))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    bound = runner.addresses[0][1]
+    try:
+        yield f"http://localhost:{bound}"
+    finally:
+        await runner.cleanup()
@@ -30,6 +30,8 @@ config.set_main_option("sqlalchemy.url", settings.SYNC_DATABASE_URL)
 
 # Import your models here so Alembic can detect them
 from app.db.auth import models
+from app.db.fpl import models as fpl_models
+from app.db.jobs import models as job_models
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
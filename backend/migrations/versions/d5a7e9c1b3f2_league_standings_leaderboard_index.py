@@ -0,0 +1,33 @@
+"""League standings leaderboard index
+
+Revision ID: d5a7e9c1b3f2
+Revises: c3d81f2a6b47
+Create Date: 2026-10-18 11:40:03.817266
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7e9c1b3f2'
+down_revision: Union[str, Sequence[str], None] = 'c3d81f2a6b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_league_standings_league_gw_rank', table_name='league_standings')
+    op.create_index(
+        'ix_league_standings_leaderboard', 'league_standings',
+        ['league_id', 'gameweek', sa.text('total_points DESC'), 'user_id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_league_standings_leaderboard', table_name='league_standings')
+    op.create_index('ix_league_standings_league_gw_rank', 'league_standings', ['league_id', 'gameweek', 'rank'], unique=False)